@@ -0,0 +1,61 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# flake8: noqa
+# fmt: off
+
+"""partition message tables
+
+Revision ID: b7dbec4a7f21
+Revises: e26a1ff54061
+Create Date: 2026-10-18 10:12:37.402215
+
+"""
+from datetime import datetime, timedelta
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b7dbec4a7f21"
+down_revision = "e26a1ff54061"
+branch_labels = None
+depends_on = None
+
+# Tables without foreign keys, MySQL cannot partition the others (rsm,
+# rsm_participants and rsi_event), their retention falls back to batched deletes.
+PARTITIONED_TABLES = ["cgw", "rsi_cwm", "rsi_clc", "rsi_dnp", "rsi_sds", "osw", "ssw", "rdw"]
+
+
+def upgrade():
+    if op.get_bind().dialect.name != "mysql":
+        return
+    # Existing rows all go to the first partition, the retention periodic task
+    # adds the following daily partitions ahead of time.
+    tomorrow = datetime.utcnow().date() + timedelta(days=1)
+    for table in PARTITIONED_TABLES:
+        # The partitioning column has to be part of the primary key
+        op.execute(f"ALTER TABLE {table} DROP PRIMARY KEY, ADD PRIMARY KEY (id, create_time)")
+        op.execute(
+            f"ALTER TABLE {table} PARTITION BY RANGE (TO_DAYS(create_time)) ("
+            f"PARTITION p{tomorrow:%Y%m%d} VALUES LESS THAN (TO_DAYS('{tomorrow:%Y-%m-%d}')), "
+            f"PARTITION pmax VALUES LESS THAN MAXVALUE)"
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "mysql":
+        return
+    for table in PARTITIONED_TABLES:
+        op.execute(f"ALTER TABLE {table} REMOVE PARTITIONING")
+        op.execute(f"ALTER TABLE {table} DROP PRIMARY KEY, ADD PRIMARY KEY (id)")
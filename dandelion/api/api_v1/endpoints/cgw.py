@@ -45,6 +45,13 @@ Get all CGW.
 )
 def get_all(
     cgw_level: Optional[int] = Query(None, alias="cgwLevel", description="CWG Level"),
+    cursor: Optional[int] = Query(
+        None,
+        alias="cursor",
+        ge=0,
+        description="Page by the id of the last item of the previous page (0 for the first "
+        "page) instead of pageNum. The total is not counted in this mode",
+    ),
     page_num: int = Query(1, alias="pageNum", ge=1, description="Page number"),
     page_size: int = Query(10, alias="pageSize", ge=-1, description="Page size"),
     db: Session = Depends(deps.get_db),
@@ -52,6 +59,10 @@ def get_all(
 ) -> schemas.CGWs:
     skip = page_size * (page_num - 1)
     total, data = crud.cgw.get_multi_with_total(
-        db, skip=skip, limit=page_size, cgw_level=cgw_level
+        db, skip=skip, limit=page_size, cursor=cursor, cgw_level=cgw_level
+    )
+    return schemas.CGWs(
+        total=total,
+        nextCursor=data[-1].id if data and len(data) == page_size else None,
+        data=[cgw.to_all_dict() for cgw in data],
     )
-    return schemas.CGWs(total=total, data=[cgw.to_all_dict() for cgw in data])
@@ -14,22 +14,37 @@
 
 from __future__ import annotations
 
+import threading
+import time
 from logging import LoggerAdapter
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, Body, Depends, Query, status
 from oslo_log import log
 from redis import Redis
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from dandelion import crud, models, schemas
 from dandelion.api import deps
 from dandelion.api.deps import OpenV2XHTTPException as HTTPException
+from dandelion.db import session
 from dandelion.util import Optional as Optional_util
 
 router = APIRouter()
 LOG: LoggerAdapter = log.getLogger(__name__)
 
+ROUTE_INFO_PREFIX = "ROUTE_INFO_"
+ROUTE_INFO_TTL = 60
+
+# The online rate is polled by every dashboard, it is served from a per
+# process cache for a few seconds.
+ONLINE_RATE_CACHE_SECONDS = 5
+ONLINE_RATE_CACHE_SIZE = 1024
+# (intersection code, rsu id) => (expire time, online rate)
+_ONLINE_RATE_CACHE: Dict[Tuple[Any, Any], Tuple[float, schemas.OnlineRate]] = {}
+_ONLINE_RATE_CACHE_LOCK = threading.Lock()
+
 
 @router.get(
     "/online_rate",
@@ -48,66 +63,54 @@ Get online rate of all devices.
         status.HTTP_404_NOT_FOUND: {"model": schemas.ErrorMessage, "description": "Not Found"},
     },
 )
-def online_rate(
+async def online_rate(
     intersection_code: Optional[str] = Query(
         None, alias="intersectionCode", description="intersection code"
     ),
     rsu_id: Optional[int] = Query(None, alias="rsuId", description="Rsu id"),
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+    db: session.AsyncDB = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_user_async),
+) -> schemas.OnlineRate:
+    key = (intersection_code, rsu_id)
+    cached = _ONLINE_RATE_CACHE.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+    online_rate_ = await db.run_sync(
+        _online_rate, intersection_code=intersection_code, rsu_id=rsu_id
+    )
+    with _ONLINE_RATE_CACHE_LOCK:
+        if len(_ONLINE_RATE_CACHE) >= ONLINE_RATE_CACHE_SIZE:
+            _ONLINE_RATE_CACHE.clear()
+        _ONLINE_RATE_CACHE[key] = (time.monotonic() + ONLINE_RATE_CACHE_SECONDS, online_rate_)
+    return online_rate_
+
+
+def _online_rate(
+    db: Session, *, intersection_code: Optional[str], rsu_id: Optional[int]
 ) -> schemas.OnlineRate:
+    rsu_counts = crud.rsu.count_by(
+        db, models.RSU.online_status, is_default=False, intersection_code=intersection_code
+    )
     rsu_online_rate = {
-        "online": crud.rsu.get_multi_with_total(
-            db, online_status=True, intersection_code=intersection_code, is_default=False
-        )[0],
-        "offline": crud.rsu.get_multi_with_total(
-            db, online_status=False, intersection_code=intersection_code, is_default=False
-        )[0],
-        "notRegister": crud.rsu_tmp.get_multi_with_total(db, intersection_code=intersection_code)[
-            0
-        ],
-    }
-    # temporarily unavailable data
-    camera_online_rate = {
-        "online": crud.camera.get_multi_with_total(
-            db, intersection_code=intersection_code, rsu_id=rsu_id, is_default=False
-        )[0],
-        "offline": 0,
-        "notRegister": 0,
-    }
-    # temporarily unavailable data
-    radar_online_rate = {
-        "online": crud.radar.get_multi_with_total(
-            db, intersection_code=intersection_code, rsu_id=rsu_id, is_default=False
-        )[0],
-        "offline": 0,
-        "notRegister": 0,
-    }
-    lidar_online_rate = {
-        "online": crud.lidar.get_multi_with_total(
-            db, intersection_code=intersection_code, rsu_id=rsu_id, is_default=False
-        )[0],
-        "offline": 0,
-        "notRegister": 0,
+        "online": rsu_counts.get(True, 0),
+        "offline": rsu_counts.get(False, 0),
+        "notRegister": crud.rsu_tmp.count(db, intersection_code=intersection_code),
     }
-    spat_online_rate = {
-        "online": crud.spat.get_multi_with_total(
-            db, intersection_code=intersection_code, rsu_id=rsu_id, is_default=False
-        )[0],
-        "offline": 0,
-        "notRegister": 0,
-    }
-    return schemas.OnlineRate(
-        **{
-            "data": {
-                "rsu": rsu_online_rate,
-                "camera": camera_online_rate,
-                "radar": radar_online_rate,
-                "lidar": lidar_online_rate,
-                "spat": spat_online_rate,
-            }
-        }
-    )
+    # Devices other than RSUs do not report their status yet, all of them
+    # are counted as online.
+    devices: List[Tuple[str, Any, Any]] = [
+        ("camera", crud.camera, models.Camera),
+        ("radar", crud.radar, models.Radar),
+        ("lidar", crud.lidar, models.Lidar),
+        ("spat", crud.spat, models.Spat),
+    ]
+    device_online_rate = {}
+    for name, crud_, model in devices:
+        counts = crud_.count_by(
+            db, model.is_default, intersection_code=intersection_code, rsu_id=rsu_id
+        )
+        device_online_rate[name] = {"online": counts.get(False, 0), "offline": 0, "notRegister": 0}
+    return schemas.OnlineRate(**{"data": {"rsu": rsu_online_rate, **device_online_rate}})
 
 
 @router.get(
@@ -127,43 +130,39 @@ Get traffic situation.
         status.HTTP_404_NOT_FOUND: {"model": schemas.ErrorMessage, "description": "Not Found"},
     },
 )
-def route_info(
+async def route_info(
     intersection_code: str = Query(..., alias="intersectionCode", description="Intersection Code"),
     *,
-    db: Session = Depends(deps.get_db),
+    db: session.AsyncDB = Depends(deps.get_async_db),
     redis_conn: Redis = Depends(deps.get_redis_conn),
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: models.User = Depends(deps.get_current_user_async),
 ) -> schemas.RouteInfo:
-    intersection_in_db = crud.intersection.get_by_code(db=db, code=intersection_code)
-    if not intersection_in_db:
+    rsu_esns = await db.run_sync(_intersection_rsu_esns, intersection_code)
+    if rsu_esns is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Intersection [code: {intersection_code}] not found",
         )
+    route_infos = await run_in_threadpool(_get_route_infos, redis_conn, rsu_esns)
     vehicle_total, average_speed, pedestrian_total, congestion, rsu_num = 0, 0, 0, "free flow", 0
-    for rsu in intersection_in_db.rsus:
-        key = f"ROUTE_INFO_{rsu.rsu_esn}"
-        if not redis_conn.exists(key):
+    for route_info_ in route_infos:
+        if not route_info_:
             continue
         vehicle_total += (
-            Optional_util.none(redis_conn.hget(key, "vehicleTotal"))
-            .map(lambda v: int(v))
-            .orElse(0)
+            Optional_util.none(route_info_.get(b"vehicleTotal")).map(lambda v: int(v)).orElse(0)
         )
         average_speed += (
-            Optional_util.none(redis_conn.hget(key, "averageSpeed"))
+            Optional_util.none(route_info_.get(b"averageSpeed"))
             .map(lambda v: float(v))
             .map(lambda v: round(v, 1))
             .orElse(0)
         )
         pedestrian_total += (
-            Optional_util.none(redis_conn.hget(key, "pedestrianTotal"))
-            .map(lambda v: int(v))
-            .orElse(0)
+            Optional_util.none(route_info_.get(b"pedestrianTotal")).map(lambda v: int(v)).orElse(0)
         )
         if congestion != "congestion":
             congestion = (
-                Optional_util.none(redis_conn.hget(key, "congestion"))
+                Optional_util.none(route_info_.get(b"congestion"))
                 .map(lambda v: str(v, encoding="utf-8"))
                 .orElse("free flow")
             )
@@ -177,6 +176,20 @@ def route_info(
     )
 
 
+def _intersection_rsu_esns(db: Session, intersection_code: str) -> Optional[List[str]]:
+    intersection_in_db = crud.intersection.get_by_code(db=db, code=intersection_code)
+    if not intersection_in_db:
+        return None
+    return [rsu.rsu_esn for rsu in intersection_in_db.rsus]
+
+
+def _get_route_infos(redis_conn: Redis, rsu_esns: List[str]) -> List[Dict[bytes, bytes]]:
+    with redis_conn.pipeline(transaction=False) as pipe:
+        for rsu_esn in rsu_esns:
+            pipe.hgetall(f"{ROUTE_INFO_PREFIX}{rsu_esn}")
+        return pipe.execute()
+
+
 @router.post(
     "/route_info_push",
     response_model=schemas.RouteInfo,
@@ -193,20 +206,52 @@ def route_info_push(
     *,
     redis_conn: Redis = Depends(deps.get_redis_conn),
 ) -> schemas.RouteInfo:
-    rsu_esn = route_info_in.rsu_esn
-    key = f"ROUTE_INFO_{rsu_esn}"
-    if route_info_in.vehicle_total:
-        redis_conn.hset(key, "vehicleTotal", route_info_in.vehicle_total)
-    if route_info_in.average_speed:
-        redis_conn.hset(key, "averageSpeed", route_info_in.average_speed)
-    if route_info_in.pedestrian_total:
-        redis_conn.hset(key, "pedestrianTotal", route_info_in.pedestrian_total)
-    if route_info_in.congestion:
-        redis_conn.hset(key, "congestion", route_info_in.congestion)
-    redis_conn.expire(name=key, time=60)
+    with redis_conn.pipeline(transaction=False) as pipe:
+        _push_route_info(pipe, route_info_in)
+        pipe.execute()
     return schemas.RouteInfo(
         vehicleTotal=route_info_in.vehicle_total,
         averageSpeed=route_info_in.average_speed,
         pedestrianTotal=route_info_in.pedestrian_total,
         congestion=route_info_in.congestion,
     )
+
+
+@router.post(
+    "/route_info_push_batch",
+    response_model=schemas.RouteInfoBatch,
+    status_code=status.HTTP_201_CREATED,
+    description="""
+Push traffic situation of many RSUs at once.
+""",
+    responses={
+        status.HTTP_201_CREATED: {"model": schemas.RouteInfoBatch, "description": "OK"},
+    },
+)
+def route_info_push_batch(
+    route_info_in: schemas.RouteInfoBatchCreate = Body(..., description="Route Info"),
+    *,
+    redis_conn: Redis = Depends(deps.get_redis_conn),
+) -> schemas.RouteInfoBatch:
+    with redis_conn.pipeline(transaction=False) as pipe:
+        for route_info_ in route_info_in.data:
+            _push_route_info(pipe, route_info_)
+        pipe.execute()
+    return schemas.RouteInfoBatch(total=len(route_info_in.data))
+
+
+def _push_route_info(pipe: Any, route_info_in: schemas.RouteInfoCreate) -> None:
+    key = f"{ROUTE_INFO_PREFIX}{route_info_in.rsu_esn}"
+    mapping = {
+        field: value
+        for field, value in [
+            ("vehicleTotal", route_info_in.vehicle_total),
+            ("averageSpeed", route_info_in.average_speed),
+            ("pedestrianTotal", route_info_in.pedestrian_total),
+            ("congestion", route_info_in.congestion),
+        ]
+        if value
+    }
+    if mapping:
+        pipe.hset(key, mapping=mapping)
+    pipe.expire(name=key, time=ROUTE_INFO_TTL)
@@ -29,6 +29,7 @@ from sqlalchemy.orm import Session
 from dandelion import constants, crud, models, schemas
 from dandelion.api import deps
 from dandelion.api.deps import OpenV2XHTTPException as HTTPException, error_handle
+from dandelion.db import session
 from dandelion.mqtt.service.intersection.intersection_to_cerebrum import intersection_publish
 
 router = APIRouter()
@@ -178,7 +179,7 @@ Get all Intersection.
         status.HTTP_404_NOT_FOUND: {"model": schemas.ErrorMessage, "description": "Not Found"},
     },
 )
-def get_all(
+async def get_all(
     name: Optional[str] = Query(
         None,
         alias="name",
@@ -192,21 +193,25 @@ def get_all(
     ),
     page_num: int = Query(1, alias="pageNum", ge=1, description="Page number"),
     page_size: int = Query(10, alias="pageSize", ge=-1, description="Page size"),
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+    db: session.AsyncDB = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_user_async),
 ) -> schemas.Intersections:
     skip = page_size * (page_num - 1)
-    total, data = crud.intersection.get_multi_with_total(
-        db,
-        skip=skip,
-        limit=page_size,
-        name=name,
-        area_code=area_code,
-        is_default=is_default,
-    )
-    return schemas.Intersections(
-        total=total, data=[intersection.to_dict() for intersection in data]
-    )
+
+    def _get_all(db_: Session) -> schemas.Intersections:
+        total, data = crud.intersection.get_multi_with_total(
+            db_,
+            skip=skip,
+            limit=page_size,
+            name=name,
+            area_code=area_code,
+            is_default=is_default,
+        )
+        return schemas.Intersections(
+            total=total, data=[intersection.to_dict() for intersection in data]
+        )
+
+    return await db.run_sync(_get_all)
 
 
 @router.put(
@@ -14,6 +14,8 @@
 
 from __future__ import annotations
 
+from typing import Optional
+
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
 
@@ -42,11 +44,22 @@ Get all RDW.
     },
 )
 def get_all(
+    cursor: Optional[int] = Query(
+        None,
+        alias="cursor",
+        ge=0,
+        description="Page by the id of the last item of the previous page (0 for the first "
+        "page) instead of pageNum. The total is not counted in this mode",
+    ),
     page_num: int = Query(1, alias="pageNum", ge=1, description="Page number"),
     page_size: int = Query(10, alias="pageSize", ge=-1, description="Page size"),
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
 ) -> schemas.RDWs:
     skip = page_size * (page_num - 1)
-    total, data = crud.rdw.get_multi_with_total(db, skip=skip, limit=page_size)
-    return schemas.RDWs(total=total, data=[rdw.to_all_dict() for rdw in data])
+    total, data = crud.rdw.get_multi_with_total(db, skip=skip, limit=page_size, cursor=cursor)
+    return schemas.RDWs(
+        total=total,
+        nextCursor=data[-1].id if data and len(data) == page_size else None,
+        data=[rdw.to_all_dict() for rdw in data],
+    )
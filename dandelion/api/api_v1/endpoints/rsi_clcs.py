@@ -47,6 +47,13 @@ Get all RSI CLCs.
 def get_all(
     sort_dir: Sort = Query(Sort.desc, alias="sortDir", description="Sort by ID(asc/desc)"),
     info: Optional[int] = Query(None, alias="info", description="UseCase type"),
+    cursor: Optional[int] = Query(
+        None,
+        alias="cursor",
+        ge=0,
+        description="Page by the id of the last item of the previous page (0 for the first "
+        "page) instead of pageNum. The total is not counted in this mode",
+    ),
     page_num: int = Query(1, alias="pageNum", ge=1, description="Page number"),
     page_size: int = Query(10, alias="pageSize", ge=-1, description="Page size"),
     db: Session = Depends(deps.get_db),
@@ -57,7 +64,12 @@ def get_all(
         db,
         skip=skip,
         limit=page_size,
+        cursor=cursor,
         sort=sort_dir,
         info=info,
     )
-    return schemas.RSICLCs(total=total, data=[clc.to_all_dict() for clc in data])
+    return schemas.RSICLCs(
+        total=total,
+        nextCursor=data[-1].id if data and len(data) == page_size else None,
+        data=[clc.to_all_dict() for clc in data],
+    )
@@ -50,6 +50,13 @@ def get_all(
         None, alias="collisionType", description="Collision Type"
     ),
     sort_dir: Sort = Query(Sort.desc, alias="sortDir", description="Sort by ID(asc/desc)"),
+    cursor: Optional[int] = Query(
+        None,
+        alias="cursor",
+        ge=0,
+        description="Page by the id of the last item of the previous page (0 for the first "
+        "page) instead of pageNum. The total is not counted in this mode",
+    ),
     page_num: int = Query(1, alias="pageNum", ge=1, description="Page number"),
     page_size: int = Query(10, alias="pageSize", ge=-1, description="Page size"),
     db: Session = Depends(deps.get_db),
@@ -60,8 +67,13 @@ def get_all(
         db,
         skip=skip,
         limit=page_size,
+        cursor=cursor,
         sort=sort_dir,
         event_type=event_type,
         collision_type=collision_type,
     )
-    return schemas.RSICWMs(total=total, data=[cwm.to_all_dict() for cwm in data])
+    return schemas.RSICWMs(
+        total=total,
+        nextCursor=data[-1].id if data and len(data) == page_size else None,
+        data=[cwm.to_all_dict() for cwm in data],
+    )
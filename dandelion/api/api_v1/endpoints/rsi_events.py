@@ -24,6 +24,7 @@ from sqlalchemy.orm import Session
 from dandelion import crud, models, schemas
 from dandelion.api import deps
 from dandelion.api.deps import OpenV2XHTTPException as HTTPException
+from dandelion.db import session
 from dandelion.schemas.utils import Sort
 
 router = APIRouter()
@@ -79,24 +80,40 @@ Get all RSI Events.
         status.HTTP_404_NOT_FOUND: {"model": schemas.ErrorMessage, "description": "Not Found"},
     },
 )
-def get_all(
+async def get_all(
     event_type: Optional[int] = Query(None, alias="eventType", description="Filter by eventType"),
     intersection_code: Optional[str] = Query(
         None, alias="intersectionCode", description="Filter by intersectionCode"
     ),
     sort_dir: Sort = Query(Sort.desc, alias="sortDir", description="Sort by ID(asc/desc)"),
+    cursor: Optional[int] = Query(
+        None,
+        alias="cursor",
+        ge=0,
+        description="Page by the id of the last item of the previous page (0 for the first "
+        "page) instead of pageNum. The total is not counted in this mode",
+    ),
     page_num: int = Query(1, alias="pageNum", ge=1, description="Page number"),
     page_size: int = Query(10, alias="pageSize", ge=-1, description="Page size"),
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+    db: session.AsyncDB = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_user_async),
 ) -> schemas.RSIEvents:
     skip = page_size * (page_num - 1)
-    total, data = crud.rsi_event.get_multi_with_total(
-        db,
-        skip=skip,
-        limit=page_size,
-        sort=sort_dir,
-        event_type=event_type,
-        intersection_code=intersection_code,
-    )
-    return schemas.RSIEvents(total=total, data=[rsi_event.to_all_dict() for rsi_event in data])
+
+    def _get_all(db_: Session) -> schemas.RSIEvents:
+        total, data = crud.rsi_event.get_multi_with_total(
+            db_,
+            skip=skip,
+            limit=page_size,
+            cursor=cursor,
+            sort=sort_dir,
+            event_type=event_type,
+            intersection_code=intersection_code,
+        )
+        return schemas.RSIEvents(
+            total=total,
+            nextCursor=data[-1].id if data and len(data) == page_size else None,
+            data=[rsi_event.to_all_dict() for rsi_event in data],
+        )
+
+    return await db.run_sync(_get_all)
@@ -49,6 +49,13 @@ def get_all(
         None, alias="equipmentType", description="Equipment Type"
     ),
     sort_dir: Sort = Query(Sort.desc, alias="sortDir", description="Sort by ID(asc/desc)"),
+    cursor: Optional[int] = Query(
+        None,
+        alias="cursor",
+        ge=0,
+        description="Page by the id of the last item of the previous page (0 for the first "
+        "page) instead of pageNum. The total is not counted in this mode",
+    ),
     page_num: int = Query(1, alias="pageNum", ge=1, description="Page number"),
     page_size: int = Query(10, alias="pageSize", ge=-1, description="Page size"),
     db: Session = Depends(deps.get_db),
@@ -59,7 +66,12 @@ def get_all(
         db,
         skip=skip,
         limit=page_size,
+        cursor=cursor,
         sort=sort_dir,
         equipment_type=equipment_type,
     )
-    return schemas.RSISDSs(total=total, data=[sds.to_all_dict() for sds in data])
+    return schemas.RSISDSs(
+        total=total,
+        nextCursor=data[-1].id if data and len(data) == page_size else None,
+        data=[sds.to_all_dict() for sds in data],
+    )
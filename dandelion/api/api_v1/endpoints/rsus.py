@@ -18,19 +18,18 @@ import json
 from logging import LoggerAdapter
 from typing import List, Optional
 
-import requests
 from fastapi import APIRouter, Depends, Query, Response, status
 from oslo_log import log
 from redis import Redis
 from sqlalchemy import exc as sql_exc
 from sqlalchemy.orm import Session, exc as orm_exc
 
-from dandelion import constants, crud, models, schemas
+from dandelion import crud, models, schemas
 from dandelion.api import deps
 from dandelion.api.deps import OpenV2XHTTPException as HTTPException, error_handle
-from dandelion.mqtt import cloud_server as mqtt_cloud_server
+from dandelion.db import rsu_running, session
+from dandelion.mqtt import outbox as mqtt_outbox
 from dandelion.mqtt.service.intersection.intersection_to_cerebrum import intersection_publish
-from dandelion.mqtt.topic import v2x_edge
 from dandelion.util import Optional as Optional_util
 
 router = APIRouter()
@@ -74,28 +73,10 @@ def create(
     del rsu_in.tmp_id
     try:
         rsu_in_db = crud.rsu.create_rsu(db, obj_in=rsu_in, rsu_tmp_in_db=rsu_tmp)
-        if mqtt_cloud_server.MQTT_CLIENT is not None:
-            mqtt_cloud_server.get_mqtt_client().publish(
-                topic=v2x_edge.V2X_EDGE_RSU_ADD_UP,
-                payload=json.dumps(
-                    dict(
-                        id=mqtt_cloud_server.EDGE_ID,
-                        rsu=dict(
-                            edge_rsu_id=rsu_in_db.id,
-                            name=rsu_in.rsu_name,
-                            esn=rsu_in.rsu_esn,
-                            intersectionCode=rsu_in.intersection_code,
-                            location=Optional_util.none(rsu_tmp)
-                            .map(lambda v: v.location)
-                            .orElse({}),
-                        ),
-                    )
-                ),
-                qos=0,
-            )
     except (sql_exc.IntegrityError, sql_exc.DataError) as ex:
         raise error_handle(ex, "rsu_esn", rsu_in.rsu_esn)
     intersection_publish({"type": "create"})
+    mqtt_outbox.wake()
     return rsu_in_db.to_all_dict()
 
 
@@ -117,7 +98,7 @@ Get all RSUs.
         status.HTTP_404_NOT_FOUND: {"model": schemas.ErrorMessage, "description": "Not Found"},
     },
 )
-def get_all(
+async def get_all(
     rsu_name: Optional[str] = Query(
         None, alias="rsuName", description="Filter by rsuName. Fuzzy prefix query is supported"
     ),
@@ -137,23 +118,27 @@ def get_all(
     ),
     page_num: int = Query(1, alias="pageNum", ge=1, description="Page number"),
     page_size: int = Query(10, alias="pageSize", ge=-1, description="Page size"),
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+    db: session.AsyncDB = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_user_async),
 ) -> schemas.RSUs:
     skip = page_size * (page_num - 1)
-    total, data = crud.rsu.get_multi_with_total(
-        db,
-        skip=skip,
-        limit=page_size,
-        rsu_name=rsu_name,
-        rsu_esn=rsu_esn,
-        intersection_code=intersection_code,
-        online_status=online_status,
-        rsu_status=rsu_status,
-        enabled=enabled,
-        is_default=is_default,
-    )
-    return schemas.RSUs(total=total, data=[rsu.to_all_dict() for rsu in data])
+
+    def _get_all(db_: Session) -> schemas.RSUs:
+        total, data = crud.rsu.get_multi_with_total(
+            db_,
+            skip=skip,
+            limit=page_size,
+            rsu_name=rsu_name,
+            rsu_esn=rsu_esn,
+            intersection_code=intersection_code,
+            online_status=online_status,
+            rsu_status=rsu_status,
+            enabled=enabled,
+            is_default=is_default,
+        )
+        return schemas.RSUs(total=total, data=[rsu.to_all_dict() for rsu in data])
+
+    return await db.run_sync(_get_all)
 
 
 @router.get(
@@ -231,7 +216,6 @@ def update(
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
 ) -> schemas.RSU:
-    rsu_tmp: Optional[models.RSUTMP] = None
     rsu_in_db = crud.rsu.get(db, id=rsu_id)
     if not rsu_in_db:
         raise HTTPException(
@@ -243,29 +227,10 @@ def update(
         )
     try:
         new_rsu_in_db = crud.rsu.update_with_location(db, db_obj=rsu_in_db, obj_in=rsu_in)
-        if mqtt_cloud_server.MQTT_CLIENT is not None:
-            system_config_db = crud.system_config.get(db, id=1)
-            host = system_config_db.mqtt_config.get("host") if system_config_db else None
-            token = deps.get_token(host)
-            update_url = (
-                f"http://"
-                f"{host}:28300"
-                f"{constants.API_V1_STR}/edge_node_rsus/"
-                f"{mqtt_cloud_server.EDGE_ID}/"
-            )
-            data = dict(
-                edgeRsuID=rsu_in_db.id,
-                name=rsu_in.rsu_name,
-                esn=rsu_in.rsu_esn,
-                intersectionCode=rsu_in.intersection_code,
-                location=Optional_util.none(rsu_tmp).map(lambda v: v.location).orElse({}),
-            )
-            requests.put(url=update_url, json=data, headers={"Authorization": token})
-            # if res.status_code != status.HTTP_200_OK:
-            #     raise HTTPException(status_code=res.status_code, detail=res.text)
     except (sql_exc.DataError, sql_exc.IntegrityError) as ex:
         raise error_handle(ex, "rsu_esn", rsu_in.rsu_esn)
     intersection_publish({"type": "update"})
+    mqtt_outbox.wake()
     return new_rsu_in_db.to_all_dict()
 
 
@@ -306,15 +271,9 @@ def delete(
         crud.rsu_query_result_data.remove_by_result_id(db, result_id=result.id)
         crud.rsu_query_result.remove(db, id=result.id)
     crud.mng.remove_by_rsu_id(db, rsu_id=rsu_id)
-    rsu = crud.rsu.get(db, id=rsu_id)
     crud.rsu.remove(db, id=rsu_id)
-    if rsu is not None and mqtt_cloud_server.MQTT_CLIENT is not None:
-        mqtt_cloud_server.get_mqtt_client().publish(
-            topic=v2x_edge.V2X_EDGE_RSU_DELETE_UP,
-            payload=json.dumps(dict(id=mqtt_cloud_server.EDGE_ID, rsuEsn=rsu.rsu_esn)),
-            qos=0,
-        )
     intersection_publish({"type": "delete"})
+    mqtt_outbox.wake()
     return Response(content=None, status_code=status.HTTP_204_NO_CONTENT)
 
 
@@ -369,6 +328,18 @@ Get a RSU Running Info.
 )
 def get_running(
     rsu_id: int,
+    tier: schemas.RunningTier = Query(
+        schemas.RunningTier.raw,
+        alias="tier",
+        description="Sample tier: raw (every 10 minutes), hourly or daily averages",
+    ),
+    count: int = Query(7, alias="count", ge=1, le=1000, description="Number of samples"),
+    start_time: Optional[int] = Query(
+        None, alias="startTime", description="Only samples at or after this unix time"
+    ),
+    end_time: Optional[int] = Query(
+        None, alias="endTime", description="Only samples at or before this unix time"
+    ),
     *,
     db: Session = Depends(deps.get_db),
     redis_conn: Redis = Depends(deps.get_redis_conn),
@@ -379,41 +350,34 @@ def get_running(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=f"RSU [id: {rsu_id}] not found"
         )
-    rsu_running = schemas.RSURunning()
-    rsu_running.cpu = []
-    for cpu in redis_conn.zrevrange(f"RSU_RUNNING_CPU_{rsu.rsu_esn}", start=0, end=6):
-        data = json.loads(cpu)
-        cpu_ = schemas.RunningCPU()
-        cpu_.time = data.get("time")
-        cpu_.uti = data.get("uti", 0)
-        cpu_.load = data.get("load", 0)
-        rsu_running.cpu.append(cpu_)
-
-    rsu_running.mem = []
-    for mem in redis_conn.zrevrange(f"RSU_RUNNING_MEM_{rsu.rsu_esn}", start=0, end=6):
-        data = json.loads(mem)
-        mem_ = schemas.RunningMEM()
-        mem_.time = data.get("time")
-        mem_.total = data.get("total", 0)
-        mem_.used = data.get("used", 0)
-        rsu_running.mem.append(mem_)
-
-    rsu_running.disk = []
-    for disk in redis_conn.zrevrange(f"RSU_RUNNING_DISK_{rsu.rsu_esn}", start=0, end=6):
-        data = json.loads(disk)
-        disk_ = schemas.RunningDisk()
-        disk_.time = data.get("time")
-        disk_.rx_byte = data.get("rxByte", 0)
-        disk_.wx_byte = data.get("wxByte", 0)
-        rsu_running.disk.append(disk_)
-
-    rsu_running.net = []
-    for net in redis_conn.zrevrange(f"RSU_RUNNING_NET_{rsu.rsu_esn}", start=0, end=6):
-        data = json.loads(net)
-        net_ = schemas.RunningNet()
-        net_.time = data.get("time")
-        net_.read = data.get("read", 0)
-        net_.write = data.get("write", 0)
-        rsu_running.net.append(net_)
-
-    return rsu_running
+    if start_time is None and end_time is None:
+        samples = rsu_running.read_recent(redis_conn, rsu.rsu_esn, tier=tier.value, count=count)
+    else:
+        samples = rsu_running.read_range(
+            redis_conn, rsu.rsu_esn, tier=tier.value, start=start_time, end=end_time
+        )
+        samples = {metric: data[:count] for metric, data in samples.items()}
+    rsu_running_ = schemas.RSURunning()
+    rsu_running_.cpu = [
+        schemas.RunningCPU(time=data.get("time"), uti=data.get("uti", 0), load=data.get("load", 0))
+        for data in samples["cpu"]
+    ]
+    rsu_running_.mem = [
+        schemas.RunningMEM(
+            time=data.get("time"), total=data.get("total", 0), used=data.get("used", 0)
+        )
+        for data in samples["mem"]
+    ]
+    rsu_running_.disk = [
+        schemas.RunningDisk(
+            time=data.get("time"), rxByte=data.get("read", 0), wxByte=data.get("write", 0)
+        )
+        for data in samples["disk"]
+    ]
+    rsu_running_.net = [
+        schemas.RunningNet(
+            time=data.get("time"), read=data.get("rxByte", 0), write=data.get("wxByte", 0)
+        )
+        for data in samples["net"]
+    ]
+    return rsu_running_
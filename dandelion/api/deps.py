@@ -16,8 +16,9 @@ from __future__ import annotations
 
 import os
 import re
+import threading
 from logging import LoggerAdapter
-from typing import Any, Dict, Generator, Optional
+from typing import Any, AsyncGenerator, Dict, Generator, Optional
 
 import requests
 import sqlalchemy.exc
@@ -28,16 +29,21 @@ from oslo_config import cfg
 from oslo_log import log
 from pydantic import ValidationError
 from redis import Redis
+from requests.adapters import HTTPAdapter
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from dandelion import conf, constants, crud, models, schemas
-from dandelion.db import redis_pool, session
+from dandelion import conf, constants, crud, schemas
+from dandelion.db import redis_pool, session, token_cache
 
 LOG: LoggerAdapter = log.getLogger(__name__)
 CONF: cfg = conf.CONF
 
 reusable_oauth2 = OAuth2PasswordBearer(tokenUrl=f"{constants.API_V1_STR}/login/access-token")
 
+CHECK_TOKEN_SESSION: Optional[requests.Session] = None
+_CHECK_TOKEN_SESSION_LOCK = threading.Lock()
+
 
 class OpenV2XHTTPException(HTTPException):
     def __init__(
@@ -62,6 +68,14 @@ def get_db() -> Generator:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[session.AsyncDB, None]:
+    db = session.async_session()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
 def get_redis_conn() -> Redis:
     return redis_pool.REDIS_CONN
 
@@ -82,29 +96,67 @@ def check_token(db, token):
     return user
 
 
+def get_check_token_session() -> requests.Session:
+    """Keep-alive HTTP session to the center, shared by the remote token checks."""
+    global CHECK_TOKEN_SESSION
+    if CHECK_TOKEN_SESSION is None:
+        with _CHECK_TOKEN_SESSION_LOCK:
+            if CHECK_TOKEN_SESSION is None:
+                adapter = HTTPAdapter(pool_maxsize=CONF.token.check_token_pool_size)
+                http_session = requests.Session()
+                http_session.mount("http://", adapter)
+                http_session.mount("https://", adapter)
+                CHECK_TOKEN_SESSION = http_session
+    return CHECK_TOKEN_SESSION
+
+
+def _check_remote_token(token: str, err: OpenV2XHTTPException) -> schemas.User:
+    """Tokens issued by the center are checked by the center, `err` is raised if it refuses."""
+    try:
+        res = get_check_token_session().get(
+            url=f"http://{os.getenv('OPENV2X_EXTERNAL_IP')}:28300/api/v1/login/check_token",
+            headers={"token": token},
+            timeout=CONF.token.check_token_timeout,
+        )
+    except requests.RequestException as ex:
+        LOG.error(f"Failed to check token with the center: {ex}")
+        raise err
+    if res.status_code != status.HTTP_200_OK:
+        raise err
+    return schemas.User(**res.json())
+
+
 def get_current_user(
     db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
-) -> models.User:
+) -> schemas.User:
+    cache = token_cache.get_cache()
+    user = cache.get(token)
+    if user is not None:
+        return user
     try:
-        return check_token(db=db, token=token)
+        user = schemas.User.from_orm(check_token(db=db, token=token))
     except OpenV2XHTTPException as e:
-        error = e
-    res = requests.get(
-        url=f"http://{os.getenv('OPENV2X_EXTERNAL_IP')}:28300/api/v1/login/check_token",
-        headers={"token": token},
-    )
-    if res.status_code != status.HTTP_200_OK:
-        raise error
-    return res.json()
+        user = _check_remote_token(token, e)
+    cache.set(token, user)
+    return user
 
 
-def get_token(host: str) -> str:
-    login_url = f"http://{host}:28300/api/v1/login"
-    login_res = requests.post(
-        url=login_url, json={"username": CONF.user.username, "password": CONF.user.password}
-    )
-    res = login_res.json()
-    return f"{res.get('token_type')} {res.get('access_token')}"
+async def get_current_user_async(
+    db: session.AsyncDB = Depends(get_async_db), token: str = Depends(reusable_oauth2)
+) -> schemas.User:
+    cache = token_cache.get_cache()
+    cached = cache.get(token)
+    if cached is not None:
+        return cached
+    user: schemas.User
+    try:
+        user = await db.run_sync(
+            lambda db_: schemas.User.from_orm(check_token(db=db_, token=token))
+        )
+    except OpenV2XHTTPException as e:
+        user = await run_in_threadpool(_check_remote_token, token, e)
+    cache.set(token, user)
+    return user
 
 
 def error_handle(err: sqlalchemy.exc.DatabaseError, field: str, field_data: Optional[str]):
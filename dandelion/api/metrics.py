@@ -0,0 +1,217 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import os
+from logging import LoggerAdapter
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from oslo_log import log
+
+from dandelion import metrics, scheduler
+from dandelion.api import route_stats
+from dandelion.db import redis_pool, retention, rsu_identity, session, token_cache, write_behind
+from dandelion.mqtt import dispatcher, outbox, topic_stats
+
+LOG: LoggerAdapter = log.getLogger(__name__)
+
+router = APIRouter()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _collect_http(page: metrics.Exposition) -> None:
+    routes = route_stats.get_routes()
+    page.metric(
+        "dandelion_http_request_duration_seconds", "histogram", "HTTP request latency by route."
+    )
+    for route, stats in routes.items():
+        page.histogram("dandelion_http_request_duration_seconds", stats.latency, {"route": route})
+    page.metric("dandelion_http_db_queries_total", "counter", "SQL queries issued by route.")
+    for route, stats in routes.items():
+        page.sample("dandelion_http_db_queries_total", stats.queries, {"route": route})
+    page.metric(
+        "dandelion_http_db_query_seconds_total", "counter", "Seconds spent in SQL by route."
+    )
+    for route, stats in routes.items():
+        page.sample("dandelion_http_db_query_seconds_total", stats.db_duration, {"route": route})
+    page.metric(
+        "dandelion_http_db_queries_max", "gauge", "Most SQL queries issued by one request."
+    )
+    for route, stats in routes.items():
+        page.sample("dandelion_http_db_queries_max", stats.max_queries, {"route": route})
+
+
+def _collect_mqtt(page: metrics.Exposition) -> None:
+    topics = topic_stats.get_topics()
+    page.metric("dandelion_mqtt_messages_total", "counter", "MQTT messages received by topic.")
+    for topic, stats in topics.items():
+        page.sample("dandelion_mqtt_messages_total", stats.messages, {"topic": topic})
+    page.metric(
+        "dandelion_mqtt_decode_failures_total", "counter", "MQTT payloads that failed to decode."
+    )
+    for topic, stats in topics.items():
+        page.sample(
+            "dandelion_mqtt_decode_failures_total", stats.decode_failures, {"topic": topic}
+        )
+    page.metric(
+        "dandelion_mqtt_handler_failures_total", "counter", "MQTT handlers that raised an error."
+    )
+    for topic, stats in topics.items():
+        page.sample(
+            "dandelion_mqtt_handler_failures_total", stats.handler_failures, {"topic": topic}
+        )
+    page.metric(
+        "dandelion_mqtt_handler_duration_seconds", "histogram", "MQTT handler latency by topic."
+    )
+    for topic, stats in topics.items():
+        page.histogram("dandelion_mqtt_handler_duration_seconds", stats.latency, {"topic": topic})
+
+    dispatchers = dispatcher.get_stats()
+    page.metric("dandelion_mqtt_dispatch_queue_depth", "gauge", "Messages waiting for a worker.")
+    for family in dispatchers:
+        page.sample(
+            "dandelion_mqtt_dispatch_queue_depth",
+            sum(family["queueDepth"]),
+            {"family": family["family"]},
+        )
+    for name, key, help_ in [
+        ("processed", "processed", "Messages handled by dispatch workers."),
+        ("blocked", "blocked", "Messages that waited for room in a full queue."),
+        ("dropped", "dropped", "Messages dropped because the queue stayed full."),
+    ]:
+        page.metric(f"dandelion_mqtt_dispatch_{name}_total", "counter", help_)
+        for family in dispatchers:
+            page.sample(
+                f"dandelion_mqtt_dispatch_{name}_total", family[key], {"family": family["family"]}
+            )
+
+    drainer = outbox.get_stats()
+    if drainer is not None:
+        for name, key, help_ in [
+            ("drained", "drained", "Edge outbox rows published to the center."),
+            ("publishes", "published", "Batched publishes of edge outbox rows."),
+            ("failures", "failed", "Edge outbox drains that failed."),
+        ]:
+            page.metric(f"dandelion_edge_outbox_{name}_total", "counter", help_)
+            page.sample(f"dandelion_edge_outbox_{name}_total", drainer[key])
+
+
+def _collect_db(page: metrics.Exposition) -> None:
+    pool = session.get_pool_status()
+    for name, key, help_ in [
+        ("checked_out", "checkedOut", "Connections in use."),
+        ("max_checked_out", "maxCheckedOut", "Most connections in use at once."),
+        ("size", "size", "Connections the pool keeps open."),
+        ("overflow", "overflow", "Connections opened beyond the pool size."),
+    ]:
+        if key in pool:
+            page.metric(f"dandelion_db_pool_{name}", "gauge", help_)
+            page.sample(f"dandelion_db_pool_{name}", pool[key])
+    page.metric("dandelion_db_pool_connects_total", "counter", "Connections opened by the pool.")
+    page.sample("dandelion_db_pool_connects_total", pool["connects"])
+
+    buffers = write_behind.get_stats()
+    page.metric("dandelion_write_behind_queue_depth", "gauge", "Rows waiting to be flushed.")
+    for buffer in buffers:
+        page.sample(
+            "dandelion_write_behind_queue_depth", buffer["queueDepth"], {"name": buffer["name"]}
+        )
+    for name, key in [("flushed", "flushed"), ("dropped", "dropped"), ("failed", "failed")]:
+        page.metric(f"dandelion_write_behind_{name}_total", "counter", f"Rows {name}.")
+        for buffer in buffers:
+            page.sample(
+                f"dandelion_write_behind_{name}_total", buffer[key], {"name": buffer["name"]}
+            )
+
+    cache = rsu_identity.get_stats()
+    page.metric("dandelion_rsu_identity_cache_hits_total", "counter", "RSU identity cache hits.")
+    page.sample("dandelion_rsu_identity_cache_hits_total", cache["hits"])
+    page.metric(
+        "dandelion_rsu_identity_cache_misses_total", "counter", "RSU identity cache misses."
+    )
+    page.sample("dandelion_rsu_identity_cache_misses_total", cache["misses"])
+
+    tokens = token_cache.get_stats()
+    page.metric("dandelion_token_cache_hits_total", "counter", "Validated token cache hits.")
+    page.sample("dandelion_token_cache_hits_total", tokens["hits"])
+    page.metric("dandelion_token_cache_misses_total", "counter", "Validated token cache misses.")
+    page.sample("dandelion_token_cache_misses_total", tokens["misses"])
+
+    tables = retention.get_stats()
+    page.metric(
+        "dandelion_retention_deleted_rows_total", "counter", "Rows purged by the retention job."
+    )
+    for table, stats in tables.items():
+        page.sample(
+            "dandelion_retention_deleted_rows_total",
+            stats.get("totalDeletedRows", 0),
+            {"table": table},
+        )
+
+
+def _collect_redis(page: metrics.Exposition) -> None:
+    page.metric(
+        "dandelion_redis_command_duration_seconds", "histogram", "Redis latency by command."
+    )
+    for command, histogram in redis_pool.get_command_latency().items():
+        page.histogram("dandelion_redis_command_duration_seconds", histogram, {"command": command})
+
+
+def _collect_jobs(page: metrics.Exposition) -> None:
+    stats = scheduler.get_stats()
+    if stats["leader"] is not None:
+        page.metric("dandelion_scheduler_leader", "gauge", "1 if this process runs the jobs.")
+        page.sample("dandelion_scheduler_leader", stats["leader"]["leader"])
+    jobs = stats["jobs"]
+    for name, key, kind, help_ in [
+        ("runs_total", "runs", "counter", "Job runs."),
+        ("failures_total", "failures", "counter", "Job runs that raised an error."),
+        ("skipped_total", "skipped", "counter", "Job runs skipped on a follower."),
+        ("duration_seconds", "lastSeconds", "gauge", "Duration of the last run."),
+        ("seconds_total", "totalSeconds", "counter", "Seconds spent running the job."),
+        ("last_success_timestamp_seconds", "lastSuccess", "gauge", "End of the last good run."),
+    ]:
+        page.metric(f"dandelion_job_{name}", kind, help_)
+        for job, job_stats in jobs.items():
+            page.sample(f"dandelion_job_{name}", job_stats[key], {"job": job})
+
+
+def collect() -> str:
+    page = metrics.Exposition({"pid": os.getpid()})
+    for collector in [_collect_http, _collect_mqtt, _collect_db, _collect_redis, _collect_jobs]:
+        try:
+            collector(page)
+        except Exception as ex:
+            LOG.error(f"Metrics collector {collector.__name__} failed: {ex}")
+    return page.render()
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    include_in_schema=False,
+)
+def get_metrics() -> PlainTextResponse:
+    """
+    Metrics in the Prometheus text exposition format.
+
+    The counters are kept per process and every sample carries the `pid` label
+    of the worker that answered, sum them by the other labels across workers,
+    e.g. `sum without (pid) (rate(dandelion_mqtt_messages_total[5m]))`. A
+    restarted worker starts over from zero under a new pid.
+    """
+    return PlainTextResponse(collect(), media_type=CONTENT_TYPE)
@@ -0,0 +1,99 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import random
+import re
+import time
+import uuid
+from logging import LoggerAdapter
+from typing import Optional
+
+from oslo_config import cfg
+from oslo_log import log
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from dandelion.api import route_stats
+from dandelion.db import session as db_session
+
+CONF: cfg = cfg.CONF
+LOG: LoggerAdapter = log.getLogger(__name__)
+
+REQUEST_ID_HEADER = "OpenV2X-Request-ID"
+# Incoming request ids are echoed back and logged, anything else is replaced
+_REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+class RequestMiddleware(object):
+    def __init__(self, app: ASGIApp) -> None:
+        """
+        Times the requests, propagates their request id and writes the access
+        log. A plain ASGI middleware, the response is passed through as it is
+        sent so streaming responses are not buffered.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        request_id = request_id_of(scope)
+        scope.setdefault("state", {})["request_id"] = request_id
+        status_code = 500
+
+        with db_session.track_queries() as query_stats:
+
+            async def send_wrapper(message: Message) -> None:
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    process_time = time.perf_counter() - start
+                    message["headers"] = list(message.get("headers", []))
+                    headers = MutableHeaders(scope=message)
+                    headers["X-Process-Time"] = str(process_time)
+                    headers["Server-Timing"] = route_stats.server_timing(process_time, query_stats)
+                    headers[REQUEST_ID_HEADER] = request_id
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                duration = time.perf_counter() - start
+                route_stats.record(scope, duration, query_stats)
+                access_log(scope, status_code, duration, request_id)
+
+
+def request_id_of(scope: Scope) -> str:
+    request_id: Optional[str] = Headers(scope=scope).get(REQUEST_ID_HEADER)
+    if request_id is not None and _REQUEST_ID_PATTERN.match(request_id):
+        return request_id
+    return uuid.uuid4().hex
+
+
+def access_log(scope: Scope, status_code: int, duration: float, request_id: str) -> None:
+    if (
+        status_code < 500
+        and duration < CONF.access_log.slow_request
+        and random.random() >= CONF.access_log.sample_rate
+    ):
+        return
+    client = scope.get("client")
+    LOG.info(
+        f"{client[0] if client else '-'} \"{scope['method']} {scope['path']}\" {status_code} "
+        f"{duration * 1000:.1f}ms, request id: {request_id}"
+    )
@@ -0,0 +1,108 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from starlette.types import Scope
+
+from dandelion import metrics
+from dandelion.db.session import QueryStats
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RouteStats(object):
+    def __init__(self) -> None:
+        self.requests = 0
+        self.duration = 0.0
+        self.max_duration = 0.0
+        self.queries = 0
+        self.max_queries = 0
+        self.db_duration = 0.0
+        self.latency = metrics.Histogram()
+
+    def record(self, duration: float, query_stats: QueryStats) -> None:
+        self.requests += 1
+        self.duration += duration
+        self.max_duration = max(self.max_duration, duration)
+        self.queries += query_stats.count
+        self.max_queries = max(self.max_queries, query_stats.count)
+        self.db_duration += query_stats.duration
+        self.latency.observe(duration)
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(
+            requests=self.requests,
+            duration=self.duration,
+            maxDuration=self.max_duration,
+            queries=self.queries,
+            maxQueries=self.max_queries,
+            avgQueries=self.queries / self.requests if self.requests else 0.0,
+            dbDuration=self.db_duration,
+        )
+
+
+ROUTES: Dict[str, RouteStats] = {}
+_ROUTES_LOCK = threading.Lock()
+_ROUTE_PATHS: Dict[Callable, str] = {}
+
+
+def route_name(scope: Scope) -> str:
+    """
+    Method and path template of the route that handled the request, path
+    parameters are not expanded to keep the number of routes bounded.
+    """
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return UNMATCHED_ROUTE
+    path: Optional[str] = _ROUTE_PATHS.get(endpoint)
+    if path is None:
+        for route in scope["app"].routes:
+            if getattr(route, "endpoint", None) is endpoint:
+                path = route.path
+                break
+        else:
+            return UNMATCHED_ROUTE
+        _ROUTE_PATHS[endpoint] = path
+    return f"{scope['method']} {path}"
+
+
+def record(scope: Scope, duration: float, query_stats: QueryStats) -> None:
+    name = route_name(scope)
+    with _ROUTES_LOCK:
+        route = ROUTES.get(name)
+        if route is None:
+            route = ROUTES[name] = RouteStats()
+        route.record(duration, query_stats)
+
+
+def server_timing(duration: float, query_stats: QueryStats) -> str:
+    """Server-Timing header value, durations are in milliseconds."""
+    return (
+        f'db;dur={query_stats.duration * 1000:.2f};desc="{query_stats.count} queries", '
+        f"app;dur={duration * 1000:.2f}"
+    )
+
+
+def get_routes() -> Dict[str, RouteStats]:
+    with _ROUTES_LOCK:
+        return dict(ROUTES)
+
+
+def get_stats() -> Dict[str, Any]:
+    with _ROUTES_LOCK:
+        return {name: route.stats() for name, route in ROUTES.items()}
@@ -16,7 +16,23 @@ from __future__ import annotations
 
 from oslo_config import cfg
 
-from dandelion.conf import cors, database, iam, mode, mqtt, redis, token, user
+from dandelion.conf import (
+    access_log,
+    cors,
+    database,
+    iam,
+    ingest,
+    mode,
+    mqtt,
+    outbox,
+    redis,
+    retention,
+    role,
+    rsu_running,
+    scheduler,
+    token,
+    user,
+)
 
 CONF: cfg = cfg.CONF
 
@@ -29,3 +45,10 @@ token.register_opts(CONF)
 mode.register_opts(CONF)
 user.register_opts(CONF)
 iam.register_opts(CONF)
+ingest.register_opts(CONF)
+rsu_running.register_opts(CONF)
+scheduler.register_opts(CONF)
+role.register_opts(CONF)
+retention.register_opts(CONF)
+outbox.register_opts(CONF)
+access_log.register_opts(CONF)
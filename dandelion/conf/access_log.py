@@ -0,0 +1,56 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+from oslo_config import cfg
+
+access_log_group = cfg.OptGroup(
+    name="access_log",
+    title="Access Log Options",
+    help="""
+Options of the access log written for the API requests.
+""",
+)
+
+access_log_opts = [
+    cfg.FloatOpt(
+        "sample_rate",
+        default=0.01,
+        min=0,
+        max=1,
+        help="""
+Fraction of the successful requests written to the access log. Failed and slow
+requests are always written.
+""",
+    ),
+    cfg.FloatOpt(
+        "slow_request",
+        default=1.0,
+        min=0,
+        help="""
+Seconds after which a request is slow and always written to the access log.
+""",
+    ),
+]
+
+
+def register_opts(conf):
+    conf.register_group(access_log_group)
+    conf.register_opts(access_log_opts, group=access_log_group)
+
+
+def list_opts():
+    return {access_log_group: access_log_opts}
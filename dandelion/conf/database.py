@@ -45,6 +45,15 @@ Setting a value of 0 indicates no limit.
         default=1000,
         help="""
 If set, use this value for max_overflow with sqlalchemy.
+""",
+    ),
+    cfg.BoolOpt(
+        "enable_async",
+        default=False,
+        help="""
+Serve the read endpoints from an async engine using the async driver of the
+database, aiomysql for mysql+pymysql and aiosqlite for sqlite. They run in the
+threadpool when disabled or when the driver is not installed.
 """,
     ),
 ]
@@ -0,0 +1,172 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+from oslo_config import cfg
+
+ingest_group = cfg.OptGroup(
+    name="ingest",
+    title="Ingest Options",
+    help="""
+MQTT ingestion related options.
+""",
+)
+
+ingest_opts = [
+    cfg.StrOpt(
+        "dispatch_mode",
+        default="thread",
+        choices=["inline", "thread"],
+        help="""
+How MQTT messages are handed to topic handlers.
+Possible values:
+inline - Handle messages on the MQTT network thread
+thread - Queue messages to per topic family worker threads
+""",
+    ),
+    cfg.DictOpt(
+        "dispatch_workers",
+        default={"heartbeat": "2", "rsu": "4", "algorithm": "4", "edge": "1"},
+        help="""
+Number of worker threads of each topic family. Messages of one RSU are
+always handled by the same worker of a family, so they keep their order.
+Topic families: heartbeat, rsu, algorithm, edge.
+""",
+    ),
+    cfg.IntOpt(
+        "dispatch_queue_size",
+        default=1000,
+        min=1,
+        help="""
+Maximum number of messages waiting for each dispatch worker.
+""",
+    ),
+    cfg.FloatOpt(
+        "dispatch_block_timeout",
+        default=1.0,
+        min=0,
+        help="""
+Seconds the MQTT network thread waits for room in a full dispatch queue
+before the message is dropped.
+""",
+    ),
+    cfg.IntOpt(
+        "heartbeat_cache_ttl",
+        default=60,
+        min=0,
+        help="""
+Seconds a known RSU heartbeat only refreshes the online flag in redis before
+its online status in database is checked again.
+""",
+    ),
+    cfg.StrOpt(
+        "rsu_cache_backend",
+        default="memory",
+        choices=["memory", "redis"],
+        help="""
+Where the rsu_esn => RSU identity cache used by MQTT handlers is kept.
+Possible values:
+memory - LRU cache in each process
+redis - Shared by all processes, so invalidations reach every worker
+""",
+    ),
+    cfg.IntOpt(
+        "rsu_cache_size",
+        default=10000,
+        min=1,
+        help="""
+Maximum number of RSUs kept by the memory RSU identity cache.
+""",
+    ),
+    cfg.IntOpt(
+        "rsu_cache_ttl",
+        default=300,
+        min=1,
+        help="""
+Seconds an RSU identity is cached.
+""",
+    ),
+    cfg.IntOpt(
+        "rsu_cache_negative_ttl",
+        default=5,
+        min=0,
+        help="""
+Seconds the absence of an RSU is cached. Registering an RSU only invalidates
+the cache of the process it was registered in, so this bounds how long the
+other processes ignore a newly registered RSU. 0 disables negative caching.
+""",
+    ),
+    cfg.BoolOpt(
+        "rsu_offline_notify",
+        default=False,
+        help="""
+Mark RSUs offline as soon as their online flag expires in redis, instead of
+waiting for the next online status sweep. Requires redis keyspace
+notifications for expired keys (notify-keyspace-events containing "Ex").
+""",
+    ),
+    cfg.IntOpt(
+        "rsu_offline_batch_size",
+        default=1000,
+        min=1,
+        help="""
+Number of RSUs checked with one redis MGET and updated with one SQL UPDATE by
+the online status sweep.
+""",
+    ),
+    cfg.BoolOpt(
+        "rsm_write_behind",
+        default=True,
+        help="""
+Buffer RSM frames in memory and write them to database in batches.
+If disabled, every RSM frame is written in its own transaction.
+""",
+    ),
+    cfg.IntOpt(
+        "rsm_batch_size",
+        default=200,
+        min=1,
+        help="""
+Maximum number of RSM frames written to database in one batch.
+""",
+    ),
+    cfg.FloatOpt(
+        "rsm_flush_interval",
+        default=1.0,
+        min=0.01,
+        help="""
+Maximum seconds a buffered RSM frame waits before it is written to database.
+""",
+    ),
+    cfg.IntOpt(
+        "rsm_queue_size",
+        default=10000,
+        min=1,
+        help="""
+Maximum number of RSM frames kept in memory. Frames received when the buffer
+is full are dropped.
+""",
+    ),
+]
+
+
+def register_opts(conf):
+    conf.register_group(ingest_group)
+    conf.register_opts(ingest_opts, group=ingest_group)
+
+
+def list_opts():
+    return {ingest_group: ingest_opts}
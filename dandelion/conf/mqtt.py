@@ -48,6 +48,18 @@ Username of MQTT server.
         "password",
         help="""
 Password for username of MQTT server.
+""",
+    ),
+    cfg.StrOpt(
+        "shared_subscription_group",
+        help="""
+Subscribe to RSU and edge topics through the shared subscription group
+$share/<group>/<topic>, so the broker delivers each message to only one of
+the processes (e.g. gunicorn workers) in the group instead of to all of them.
+Requires a broker supporting shared subscriptions (MQTT 5, or EMQX with
+MQTT 3.1.1). Use a broker strategy that keeps a topic on one subscriber
+(e.g. EMQX hash_topic) to keep the messages of each RSU in order.
+Default: not set, every process receives every message.
 """,
     ),
 ]
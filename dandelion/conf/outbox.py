@@ -0,0 +1,73 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+from oslo_config import cfg
+
+outbox_group = cfg.OptGroup(
+    name="outbox",
+    title="Outbox Options",
+    help="""
+Options of the outbox the RSU changes of an edge node are reported to the
+center from.
+""",
+)
+
+outbox_opts = [
+    cfg.IntOpt(
+        "batch_size",
+        default=500,
+        min=1,
+        help="""
+Maximum number of pending changes published per drain.
+""",
+    ),
+    cfg.FloatOpt(
+        "poll_interval",
+        default=1.0,
+        min=0.1,
+        help="""
+Seconds between two looks at the outbox when nothing woke the drainer up.
+""",
+    ),
+    cfg.FloatOpt(
+        "debounce",
+        default=1.0,
+        min=0,
+        help="""
+Seconds changes are collected for after the first one before being published
+together.
+""",
+    ),
+    cfg.FloatOpt(
+        "publish_timeout",
+        default=5.0,
+        min=0,
+        help="""
+Seconds to wait for the center broker to acknowledge a publish. Unacknowledged
+changes stay in the outbox and are published again.
+""",
+    ),
+]
+
+
+def register_opts(conf):
+    conf.register_group(outbox_group)
+    conf.register_opts(outbox_opts, group=outbox_group)
+
+
+def list_opts():
+    return {outbox_group: outbox_opts}
@@ -0,0 +1,80 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from oslo_config import cfg
+
+retention_group = cfg.OptGroup(
+    name="retention",
+    title="Retention Options",
+    help="""
+Retention of the high-volume message tables (rsm, rsm_participants, rsi_event,
+cgw, rsi_cwm, rsi_clc, rsi_dnp, rsi_sds, osw, ssw and rdw).
+""",
+)
+
+retention_opts = [
+    cfg.IntOpt(
+        "default_retention_days",
+        default=0,
+        min=0,
+        help="""
+Days rows are kept in the message tables not listed in table_retention_days.
+0 keeps rows forever.
+""",
+    ),
+    cfg.DictOpt(
+        "table_retention_days",
+        default={},
+        help="""
+Days rows are kept per table, for example rsm:7,rsm_participants:7,rsi_event:90.
+0 keeps rows of the table forever.
+""",
+    ),
+    cfg.IntOpt(
+        "delete_batch_size",
+        default=5000,
+        min=1,
+        help="""
+Number of rows removed per transaction from tables that are not partitioned.
+""",
+    ),
+    cfg.FloatOpt(
+        "delete_batch_interval",
+        default=0.1,
+        min=0,
+        help="""
+Seconds to pause between two delete batches, leaves room for the ingest writes.
+""",
+    ),
+    cfg.IntOpt(
+        "partition_days_ahead",
+        default=3,
+        min=1,
+        help="""
+Number of daily partitions created ahead of time for MySQL tables partitioned
+by create_time.
+""",
+    ),
+]
+
+
+def register_opts(conf):
+    conf.register_group(retention_group)
+    conf.register_opts(retention_opts, group=retention_group)
+
+
+def list_opts():
+    return {retention_group: retention_opts}
@@ -0,0 +1,52 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from oslo_config import cfg
+
+role_group = cfg.OptGroup(
+    name="role",
+    title="Role Options",
+    help="""
+Process role related options.
+""",
+)
+
+role_opts = [
+    cfg.StrOpt(
+        "role",
+        default="all",
+        choices=["all", "api", "ingest", "scheduler"],
+        help="""
+Which background work this process runs besides serving the API. Default: all
+Possible values:
+all - Consume the MQTT topics and run the periodic tasks
+api - Neither, MQTT is only connected for publishing
+ingest - Only consume the MQTT topics
+scheduler - Only run the periodic tasks
+The dandelion-ingest command consumes the MQTT topics without serving the API.
+Can be set per process through the OS_ROLE__ROLE environment variable.
+""",
+    ),
+]
+
+
+def register_opts(conf):
+    conf.register_group(role_group)
+    conf.register_opts(role_opts, group=role_group)
+
+
+def list_opts():
+    return {role_group: role_opts}
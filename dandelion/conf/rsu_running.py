@@ -0,0 +1,71 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+from oslo_config import cfg
+
+rsu_running_group = cfg.OptGroup(
+    name="rsu_running",
+    title="RSU Running Info Options",
+    help="""
+RSU running info history related options.
+""",
+)
+
+rsu_running_opts = [
+    cfg.IntOpt(
+        "raw_retention",
+        default=1000,
+        min=1,
+        help="""
+Number of raw samples kept for each RSU and metric. A sample is taken every
+10 minutes.
+""",
+    ),
+    cfg.IntOpt(
+        "hourly_retention",
+        default=168,
+        min=1,
+        help="""
+Number of hourly averages kept for each RSU and metric.
+""",
+    ),
+    cfg.IntOpt(
+        "daily_retention",
+        default=90,
+        min=1,
+        help="""
+Number of daily averages kept for each RSU and metric.
+""",
+    ),
+    cfg.IntOpt(
+        "rollup_batch_size",
+        default=500,
+        min=1,
+        help="""
+Number of RSUs read and written with one redis pipeline by the rollup.
+""",
+    ),
+]
+
+
+def register_opts(conf):
+    conf.register_group(rsu_running_group)
+    conf.register_opts(rsu_running_opts, group=rsu_running_group)
+
+
+def list_opts():
+    return {rsu_running_group: rsu_running_opts}
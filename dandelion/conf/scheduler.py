@@ -0,0 +1,65 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+from oslo_config import cfg
+
+scheduler_group = cfg.OptGroup(
+    name="scheduler",
+    title="Scheduler Options",
+    help="""
+Periodic task scheduling related options.
+""",
+)
+
+scheduler_opts = [
+    cfg.BoolOpt(
+        "leader_election",
+        default=True,
+        help="""
+Elect one process of all workers and replicas sharing the redis server to run
+the cluster wide periodic tasks (RSU online status, RSU running info, Edge
+cleanup and heartbeat). If disabled, every process runs every task.
+""",
+    ),
+    cfg.IntOpt(
+        "lease_ttl",
+        default=15,
+        min=2,
+        help="""
+Seconds the leader lease is valid without being renewed. A new leader takes
+over at most this long after the leader stopped.
+""",
+    ),
+    cfg.IntOpt(
+        "renew_interval",
+        default=5,
+        min=1,
+        help="""
+Seconds between attempts to renew or acquire the leader lease. Must be less
+than lease_ttl.
+""",
+    ),
+]
+
+
+def register_opts(conf):
+    conf.register_group(scheduler_group)
+    conf.register_opts(scheduler_opts, group=scheduler_group)
+
+
+def list_opts():
+    return {scheduler_group: scheduler_opts}
@@ -37,6 +37,40 @@ Token expire seonds. Default: 604800(7 days).
         default="CP7l45i1SEk7jues8DAcO3MnWe-NMKITz3XrMxHBZhY",
         help="""
 Secret key of token.
+""",
+    ),
+    cfg.IntOpt(
+        "validation_cache_ttl",
+        default=60,
+        min=0,
+        help="""
+Seconds a validated token is cached for, never beyond the token expiry.
+Changes of a user drop its cached tokens in the process making the change,
+other processes pick them up within this time. 0 disables the cache.
+""",
+    ),
+    cfg.IntOpt(
+        "validation_cache_size",
+        default=10000,
+        min=1,
+        help="""
+Maximum number of validated tokens cached per process.
+""",
+    ),
+    cfg.FloatOpt(
+        "check_token_timeout",
+        default=5.0,
+        min=0,
+        help="""
+Seconds to wait for the center to check a token not issued by this node.
+""",
+    ),
+    cfg.IntOpt(
+        "check_token_pool_size",
+        default=10,
+        min=1,
+        help="""
+Number of keep-alive connections to the center kept for checking tokens.
 """,
     ),
 ]
@@ -24,6 +24,7 @@ from .crud_city import city
 from .crud_country import country
 from .crud_edge_node import edge_node
 from .crud_edge_node_rsu import edge_node_rsu
+from .crud_edge_outbox import edge_outbox
 from .crud_intersection import intersection
 from .crud_lidar import lidar
 from .crud_mng import mng
@@ -80,6 +81,7 @@ __all__ = [
     "rsi_sds",
     "edge_node",
     "edge_node_rsu",
+    "edge_outbox",
     "rsu_query_result_data",
     "spat",
     "intersection",
@@ -15,13 +15,15 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import Any, Dict, Generic, List, Optional, Tuple, Type, TypeVar, Union
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import desc, func, insert
+from sqlalchemy.orm import Query, Session
 
 from dandelion.db.base_class import Base
+from dandelion.schemas.utils import Sort
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -54,6 +56,15 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.refresh(db_obj)
         return db_obj
 
+    def create_many(self, db: Session, *, objs_in: List[CreateSchemaType]) -> int:
+        """Insert all rows with one executemany and one commit, without
+        loading them back."""
+        if not objs_in:
+            return 0
+        db.execute(insert(self.model), [jsonable_encoder(obj_in) for obj_in in objs_in])
+        db.commit()
+        return len(objs_in)
+
     def update(
         self, db: Session, *, db_obj: ModelType, obj_in: Union[UpdateSchemaType, Dict[str, Any]]
     ) -> ModelType:
@@ -77,6 +88,52 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.commit()
         return obj
 
+    def paginate(
+        self,
+        query_: Query,
+        *,
+        skip: int = 0,
+        limit: int = 10,
+        sort: Sort = Sort.desc,
+        cursor: Optional[int] = None,
+    ) -> Tuple[Optional[int], List[ModelType]]:
+        """
+        Order `query_` by id and return the total and the rows of one page.
+
+        Without `cursor` the page is selected with `skip` and `limit`. With
+        `cursor` (the id of the last row of the previous page, 0 for the first
+        page) it is selected with a keyset condition on id, which costs the
+        same on every page, and the total is not counted.
+        """
+        total = None
+        if cursor is None:
+            total = query_.count()
+        elif cursor:
+            query_ = query_.filter(
+                self.model.id > cursor if sort == Sort.asc else self.model.id < cursor
+            )
+        if sort == Sort.asc:
+            query_ = query_.order_by(self.model.id)
+        else:
+            query_ = query_.order_by(desc(self.model.id))
+        if limit != -1:
+            if cursor is None:
+                query_ = query_.offset(skip)
+            query_ = query_.limit(limit)
+        return total, query_.all()
+
+    def count_by(self, db: Session, column: Any, **filters: Any) -> Dict[Any, int]:
+        """
+        Number of rows for each value of `column`, counted with one GROUP BY
+        query. Rows are filtered on `filters` (attribute name => value),
+        filters with a None value are ignored.
+        """
+        query_ = db.query(column, func.count(self.model.id))
+        for name, value in filters.items():
+            if value is not None:
+                query_ = query_.filter(getattr(self.model, name) == value)
+        return {value: count for value, count in query_.group_by(column).all()}
+
     @staticmethod
     def fuzz_filter(query, model, field):
         return (
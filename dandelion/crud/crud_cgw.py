@@ -17,11 +17,13 @@ from __future__ import annotations
 from typing import List, Optional, Tuple
 
 from fastapi.encoders import jsonable_encoder
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from dandelion.crud.base import CRUDBase
 from dandelion.models import CGW
 from dandelion.schemas import CGWCreate, CGWUpdate
+from dandelion.schemas.utils import Sort
 
 
 class CRUDCGW(CRUDBase[CGW, CGWCreate, CGWUpdate]):
@@ -33,22 +35,28 @@ class CRUDCGW(CRUDBase[CGW, CGWCreate, CGWUpdate]):
         db.refresh(db_obj)
         return db_obj
 
+    def create_many(self, db: Session, *, objs_in: List[CGWCreate]) -> int:
+        if not objs_in:
+            return 0
+        db.execute(
+            insert(self.model), [jsonable_encoder(obj_in, by_alias=False) for obj_in in objs_in]
+        )
+        db.commit()
+        return len(objs_in)
+
     def get_multi_with_total(
         self,
         db: Session,
         *,
         skip: int = 0,
         limit: int = 10,
+        cursor: Optional[int] = None,
         cgw_level: Optional[int] = None,
-    ) -> Tuple[int, List[CGW]]:
+    ) -> Tuple[Optional[int], List[CGW]]:
         query_ = db.query(self.model)
         if cgw_level is not None:
             query_ = query_.filter(self.model.cgw_level == cgw_level)
-        total = query_.count()
-        if limit != -1:
-            query_ = query_.offset(skip).limit(limit)
-        data = query_.all()
-        return total, data
+        return self.paginate(query_, skip=skip, limit=limit, sort=Sort.asc, cursor=cursor)
 
 
 cgw = CRUDCGW(CGW)
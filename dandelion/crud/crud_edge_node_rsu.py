@@ -14,10 +14,10 @@
 
 from __future__ import annotations
 
-from typing import List, Tuple
+from typing import Any, Dict, Iterable, List, Tuple
 
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy import delete
+from sqlalchemy import delete, insert
 from sqlalchemy.orm import Session
 
 from dandelion.crud.base import CRUDBase
@@ -76,6 +76,53 @@ class CRUDEdgeNodeRSU(CRUDBase[EdgeNodeRSU, EdgeNodeRSUCreate, EdgeNodeRSUUpdate
         )
         db.commit()
 
+    def sync(
+        self,
+        db: Session,
+        *,
+        edge_node_id: int,
+        rsus: List[Dict[str, Any]],
+        removed_esns: Iterable[str] = (),
+        replace: bool = False,
+    ) -> Dict[str, int]:
+        """
+        Apply the RSUs reported by an edge node, keyed by `edge_rsu_id`, writing only
+        what differs with one bulk statement per kind of change and a single commit.
+        With `replace` the reported RSUs are the whole inventory and the others go.
+        """
+        existing = {
+            row.edge_rsu_id: row
+            for row in db.query(self.model).filter(self.model.edge_node_id == edge_node_id)
+        }
+        incoming = {rsu["edge_rsu_id"]: rsu for rsu in rsus}
+        removed_esns = set(removed_esns)
+        removed_ids = [
+            row.id
+            for edge_rsu_id, row in existing.items()
+            if edge_rsu_id not in incoming and (replace or row.esn in removed_esns)
+        ]
+        added: List[Dict[str, Any]] = []
+        changed: List[Dict[str, Any]] = []
+        for edge_rsu_id, rsu in incoming.items():
+            row = existing.get(edge_rsu_id)
+            if row is None:
+                added.append(dict(rsu, edge_node_id=edge_node_id))
+            elif any(getattr(row, key) != value for key, value in rsu.items()):
+                changed.append(dict(rsu, id=row.id))
+
+        if removed_ids:
+            db.execute(
+                delete(self.model)
+                .where(self.model.id.in_(removed_ids))
+                .execution_options(synchronize_session=False)
+            )
+        if changed:
+            db.bulk_update_mappings(self.model, changed)
+        if added:
+            db.execute(insert(self.model), added)
+        db.commit()
+        return dict(added=len(added), changed=len(changed), removed=len(removed_ids))
+
     def create(self, db: Session, *, obj_in: EdgeNodeRSUCreate):
         obj_in_data = jsonable_encoder(obj_in, by_alias=False)
         db_obj = self.model(**obj_in_data)
@@ -0,0 +1,82 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+from typing import List, Optional
+
+from oslo_config import cfg
+from pydantic import BaseModel
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from dandelion.crud.base import CRUDBase
+from dandelion.models import EdgeOutbox
+
+CONF: cfg = cfg.CONF
+
+UPSERT = "upsert"
+DELETE = "delete"
+SYNC = "sync"
+
+
+class CRUDEdgeOutbox(CRUDBase[EdgeOutbox, BaseModel, BaseModel]):
+    @staticmethod
+    def enabled() -> bool:
+        return CONF.mode.mode in ["edge", "coexist"]
+
+    def stage(
+        self,
+        db: Session,
+        *,
+        kind: str,
+        rsu_id: Optional[int] = None,
+        rsu_esn: Optional[str] = None,
+    ) -> None:
+        """
+        Add a pending notification to the current transaction without committing,
+        replacing the one of the same RSU (or the pending full sync) not yet published.
+        """
+        if not self.enabled():
+            return
+        stmt = delete(self.model)
+        if rsu_id is None:
+            stmt = stmt.where(self.model.kind == kind, self.model.rsu_id.is_(None))
+        else:
+            stmt = stmt.where(self.model.rsu_id == rsu_id)
+        db.execute(stmt.execution_options(synchronize_session=False))
+        db.add(self.model(kind=kind, rsu_id=rsu_id, rsu_esn=rsu_esn))
+
+    def get_pending(self, db: Session, *, limit: int) -> List[EdgeOutbox]:
+        """
+        Oldest pending rows. They are not locked, the caller ends the transaction
+        before publishing and removes them by id, rows staged meanwhile for the
+        same RSU replace them under a new id and are published next time.
+        """
+        return db.query(self.model).order_by(self.model.id).limit(limit).all()
+
+    def count(self, db: Session) -> int:
+        return db.query(self.model).count()
+
+    def remove_by_ids(self, db: Session, *, ids: List[int]) -> None:
+        db.execute(
+            delete(self.model)
+            .where(self.model.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+
+edge_outbox = CRUDEdgeOutbox(EdgeOutbox)
@@ -14,17 +14,27 @@
 
 from __future__ import annotations
 
-from typing import List, Optional, Tuple
+from typing import Any, List, Optional, Tuple
 
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Load, Session
 
 from dandelion.crud.base import CRUDBase
-from dandelion.models import Intersection
+from dandelion.models import Area, City, Intersection, Province
 from dandelion.schemas import IntersectionCreate, IntersectionUpdate
 
 
+def load_area(loader: Any) -> Any:
+    """Eager load the area, city, province and country walked by Intersection.to_area."""
+    return (
+        loader.selectinload(Intersection.area)
+        .selectinload(Area.city)
+        .selectinload(City.province)
+        .selectinload(Province.country)
+    )
+
+
 class CRUDIntersection(CRUDBase[Intersection, IntersectionCreate, IntersectionUpdate]):
     """"""
 
@@ -54,6 +64,7 @@ class CRUDIntersection(CRUDBase[Intersection, IntersectionCreate, IntersectionUp
         if area_code is not None:
             query_ = query_.filter(self.model.area_code == area_code)
         total = query_.count()
+        query_ = query_.options(load_area(Load(self.model)))
         if limit != -1:
             query_ = query_.offset(skip).limit(limit)
         data = query_.all()
@@ -17,9 +17,10 @@ from __future__ import annotations
 from typing import List, Optional, Tuple
 
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from dandelion.crud.base import CRUDBase
+from dandelion.crud.crud_intersection import load_area
 from dandelion.models import Lidar
 from dandelion.schemas import LidarCreate, LidarUpdate
 
@@ -59,6 +60,9 @@ class CRUDLidar(CRUDBase[Lidar, LidarCreate, LidarUpdate]):
         if intersection_code is not None:
             query_ = query_.filter(self.model.intersection_code == intersection_code)
         total = query_.count()
+        query_ = query_.options(
+            joinedload(self.model.rsu), load_area(selectinload(self.model.intersection))
+        )
         if limit != -1:
             query_ = query_.offset(skip).limit(limit)
         data = query_.all()
@@ -14,14 +14,16 @@
 
 from __future__ import annotations
 
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from fastapi.encoders import jsonable_encoder
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from dandelion.crud.base import CRUDBase
 from dandelion.models import RDW
 from dandelion.schemas import RDWCreate, RDWUpdate
+from dandelion.schemas.utils import Sort
 
 
 class CRUDRDW(CRUDBase[RDW, RDWCreate, RDWUpdate]):
@@ -33,19 +35,25 @@ class CRUDRDW(CRUDBase[RDW, RDWCreate, RDWUpdate]):
         db.refresh(db_obj)
         return db_obj
 
+    def create_many(self, db: Session, *, objs_in: List[RDWCreate]) -> int:
+        if not objs_in:
+            return 0
+        db.execute(
+            insert(self.model), [jsonable_encoder(obj_in, by_alias=False) for obj_in in objs_in]
+        )
+        db.commit()
+        return len(objs_in)
+
     def get_multi_with_total(
         self,
         db: Session,
         *,
         skip: int = 0,
         limit: int = 10,
-    ) -> Tuple[int, List[RDW]]:
+        cursor: Optional[int] = None,
+    ) -> Tuple[Optional[int], List[RDW]]:
         query_ = db.query(self.model)
-        total = query_.count()
-        if limit != -1:
-            query_ = query_.offset(skip).limit(limit)
-        data = query_.all()
-        return total, data
+        return self.paginate(query_, skip=skip, limit=limit, sort=Sort.asc, cursor=cursor)
 
 
 rdw = CRUDRDW(RDW)
@@ -17,7 +17,7 @@ from __future__ import annotations
 from typing import List, Optional, Tuple
 
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy import desc
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from dandelion.crud.base import CRUDBase
@@ -35,30 +35,32 @@ class CRUDRSICWM(CRUDBase[RSICWM, RSICWMCreate, RSICWMCreate]):
         db.refresh(db_obj)
         return db_obj
 
+    def create_many(self, db: Session, *, objs_in: List[RSICWMCreate]) -> int:
+        if not objs_in:
+            return 0
+        db.execute(
+            insert(self.model), [jsonable_encoder(obj_in, by_alias=False) for obj_in in objs_in]
+        )
+        db.commit()
+        return len(objs_in)
+
     def get_multi_with_total(
         self,
         db: Session,
         *,
         skip: int = 0,
         limit: int = 10,
+        cursor: Optional[int] = None,
         sort: Sort = Sort.desc,
         event_type: Optional[int] = 0,
         collision_type: Optional[int],
-    ) -> Tuple[int, List[RSICWM]]:
+    ) -> Tuple[Optional[int], List[RSICWM]]:
         query_ = db.query(self.model)
         if event_type is not None:
             query_ = query_.filter(self.model.event_type == event_type)
         if collision_type is not None:
             query_ = query_.filter(self.model.collision_type == collision_type)
-        total = query_.count()
-        if sort == Sort.asc:
-            query_ = query_.order_by(self.model.id)
-        else:
-            query_ = query_.order_by(desc(self.model.id))
-        if limit != -1:
-            query_ = query_.offset(skip).limit(limit)
-        data = query_.all()
-        return total, data
+        return self.paginate(query_, skip=skip, limit=limit, sort=sort, cursor=cursor)
 
 
 rsi_cwm = CRUDRSICWM(RSICWM)
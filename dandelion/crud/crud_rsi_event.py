@@ -17,10 +17,10 @@ from __future__ import annotations
 from typing import List, Optional, Tuple
 
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy import desc
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from dandelion.crud.base import CRUDBase
+from dandelion.crud.crud_intersection import load_area
 from dandelion.models import RSU, RSIEvent
 from dandelion.schemas import RSIEventCreate, RSIEventUpdate
 from dandelion.schemas.utils import Sort
@@ -44,11 +44,12 @@ class CRUDRSIEvent(CRUDBase[RSIEvent, RSIEventCreate, RSIEventUpdate]):
         *,
         skip: int = 0,
         limit: int = 10,
+        cursor: Optional[int] = None,
         sort: Sort = Sort.desc,
         event_type: Optional[int] = None,
         intersection_code: Optional[str] = None,
         address: Optional[str] = None,
-    ) -> Tuple[int, List[RSIEvent]]:
+    ) -> Tuple[Optional[int], List[RSIEvent]]:
         query_ = db.query(self.model)
         if event_type is not None:
             query_ = query_.filter(self.model.event_type == event_type)
@@ -56,15 +57,10 @@ class CRUDRSIEvent(CRUDBase[RSIEvent, RSIEventCreate, RSIEventUpdate]):
             query_ = query_.filter(self.model.intersection_code == intersection_code)
         if address is not None:
             query_ = query_.filter(self.model.address.like(f"%{address}%"))
-        total = query_.count()
-        if sort == Sort.asc:
-            query_ = query_.order_by(self.model.id)
-        else:
-            query_ = query_.order_by(desc(self.model.id))
-        if limit != -1:
-            query_ = query_.offset(skip).limit(limit)
-        data = query_.all()
-        return total, data
+        query_ = query_.options(
+            joinedload(self.model.rsu), load_area(selectinload(self.model.intersection))
+        )
+        return self.paginate(query_, skip=skip, limit=limit, sort=sort, cursor=cursor)
 
 
 rsi_event = CRUDRSIEvent(RSIEvent)
@@ -17,7 +17,7 @@ from __future__ import annotations
 from typing import List, Optional, Tuple
 
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy import desc
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from dandelion.crud.base import CRUDBase
@@ -35,27 +35,29 @@ class CRUDRSISDS(CRUDBase[RSISDS, RSISDSCreate, RSISDSCreate]):
         db.refresh(db_obj)
         return db_obj
 
+    def create_many(self, db: Session, *, objs_in: List[RSISDSCreate]) -> int:
+        if not objs_in:
+            return 0
+        db.execute(
+            insert(self.model), [jsonable_encoder(obj_in, by_alias=False) for obj_in in objs_in]
+        )
+        db.commit()
+        return len(objs_in)
+
     def get_multi_with_total(
         self,
         db: Session,
         *,
         skip: int = 0,
         limit: int = 10,
+        cursor: Optional[int] = None,
         sort: Sort = Sort.desc,
         equipment_type: Optional[int] = None,
-    ) -> Tuple[int, List[RSISDS]]:
+    ) -> Tuple[Optional[int], List[RSISDS]]:
         query_ = db.query(self.model)
         if equipment_type is not None:
             query_ = query_.filter(self.model.equipment_type == equipment_type)
-        total = query_.count()
-        if sort == Sort.asc:
-            query_ = query_.order_by(self.model.id)
-        else:
-            query_ = query_.order_by(desc(self.model.id))
-        if limit != -1:
-            query_ = query_.offset(skip).limit(limit)
-        data = query_.all()
-        return total, data
+        return self.paginate(query_, skip=skip, limit=limit, sort=sort, cursor=cursor)
 
 
 rsi_sds = CRUDRSISDS(RSISDS)
@@ -14,9 +14,10 @@
 
 from __future__ import annotations
 
-from typing import List
+from typing import Any, Dict, List
 
 from fastapi.encoders import jsonable_encoder
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from dandelion.crud.base import CRUDBase
@@ -38,5 +39,26 @@ class CRUDRSM(CRUDBase[RSM, RSMCreate, RSMUpdate]):
         db.refresh(db_obj)
         return db_obj
 
+    def create_rsm_bulk(self, db: Session, *, rsms: List[Dict[str, Any]]) -> int:
+        """
+        Create many RSMs with their participants in one transaction.
+
+        Each item of `rsms` is a dict with `ref_pos` and a `participants` list of
+        column dicts. RSM rows are flushed together to obtain their ids, then all
+        participants are written with a single executemany INSERT. Returns the
+        number of participants created.
+        """
+        db_objs = [self.model(ref_pos=rsm_.get("ref_pos")) for rsm_ in rsms]
+        db.add_all(db_objs)
+        db.flush()
+        participants: List[Dict[str, Any]] = []
+        for db_obj, rsm_ in zip(db_objs, rsms):
+            for participant in rsm_.get("participants", []):
+                participants.append(dict(participant, rsm_id=db_obj.id))
+        if participants:
+            db.execute(insert(Participants), participants)
+        db.commit()
+        return len(participants)
+
 
 rsm = CRUDRSM(RSM)
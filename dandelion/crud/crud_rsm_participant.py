@@ -16,7 +16,6 @@ from __future__ import annotations
 
 from typing import List, Optional, Tuple
 
-from sqlalchemy import desc
 from sqlalchemy.orm import Session
 
 from dandelion.crud.base import CRUDBase
@@ -34,21 +33,14 @@ class CRUDRSMParticipant(CRUDBase[Participants, RSMParticipantCreate, RSMPartici
         *,
         skip: int = 0,
         limit: int = 10,
+        cursor: Optional[int] = None,
         sort: Sort = Sort.desc,
         ptc_type: Optional[str] = None,
-    ) -> Tuple[int, List[Participants]]:
+    ) -> Tuple[Optional[int], List[Participants]]:
         query_ = db.query(self.model)
         if ptc_type is not None:
             query_ = query_.filter(self.model.ptc_type == ptc_type)
-        total = query_.count()
-        if sort == Sort.asc:
-            query_ = query_.order_by(self.model.id)
-        else:
-            query_ = query_.order_by(desc(self.model.id))
-        if limit != -1:
-            query_ = query_.offset(skip).limit(limit)
-        data = query_.all()
-        return total, data
+        return self.paginate(query_, skip=skip, limit=limit, sort=sort, cursor=cursor)
 
 
 rsm_participant = CRUDRSMParticipant(Participants)
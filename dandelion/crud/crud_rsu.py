@@ -18,10 +18,14 @@ from datetime import datetime
 from typing import List, Optional, Tuple
 
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, selectinload
 
+from dandelion.crud import crud_edge_outbox
 from dandelion.crud.base import CRUDBase
+from dandelion.crud.crud_edge_outbox import edge_outbox
+from dandelion.crud.crud_intersection import load_area
 from dandelion.crud.utils import get_mng_default
+from dandelion.db import rsu_identity
 from dandelion.models import RSU, RSUTMP
 from dandelion.schemas import (
     RSUCreate,
@@ -52,6 +56,7 @@ class CRUDRSU(CRUDBase[RSU, RSUCreate, RSUUpdate]):
     def update_with_version(
         self, db: Session, *, db_obj: RSU, obj_in: RSUUpdateWithVersion
     ) -> RSU:
+        rsu_esn = db_obj.rsu_esn
         obj_data = jsonable_encoder(db_obj, by_alias=False)
         update_data = obj_in.dict(exclude_unset=True)
         for field in obj_data:
@@ -59,13 +64,16 @@ class CRUDRSU(CRUDBase[RSU, RSUCreate, RSUUpdate]):
                 setattr(db_obj, field, update_data[field])
         db_obj.update_time = datetime.utcnow()
         db.add(db_obj)
+        edge_outbox.stage(db, kind=crud_edge_outbox.UPSERT, rsu_id=db_obj.id)
         db.commit()
         db.refresh(db_obj)
+        rsu_identity.invalidate(rsu_esn, db_obj.rsu_esn)
         return db_obj
 
     def update_with_base_info(
         self, db: Session, *, db_obj: RSU, obj_in: RSUUpdateWithBaseInfo
     ) -> RSU:
+        rsu_esn = db_obj.rsu_esn
         obj_data = jsonable_encoder(db_obj, by_alias=False)
         update_data = obj_in.dict(exclude_unset=True)
         for field in obj_data:
@@ -75,9 +83,11 @@ class CRUDRSU(CRUDBase[RSU, RSUCreate, RSUUpdate]):
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        rsu_identity.invalidate(rsu_esn, db_obj.rsu_esn)
         return db_obj
 
     def update_with_location(self, db: Session, *, db_obj: RSU, obj_in: RSUUpdate) -> RSU:
+        rsu_esn = db_obj.rsu_esn
         obj_data = jsonable_encoder(db_obj, by_alias=False)
         update_data = obj_in.dict(exclude_unset=True)
         if update_data.get("lon") and update_data.get("lat"):
@@ -90,8 +100,10 @@ class CRUDRSU(CRUDBase[RSU, RSUCreate, RSUUpdate]):
                 setattr(db_obj, field, update_data[field])
         db_obj.update_time = datetime.utcnow()
         db.add(db_obj)
+        edge_outbox.stage(db, kind=crud_edge_outbox.UPSERT, rsu_id=db_obj.id)
         db.commit()
         db.refresh(db_obj)
+        rsu_identity.invalidate(rsu_esn, db_obj.rsu_esn)
         return db_obj
 
     def create_rsu(
@@ -107,16 +119,51 @@ class CRUDRSU(CRUDBase[RSU, RSUCreate, RSUUpdate]):
         obj_in_data["mng"] = get_mng_default()
         db_obj = self.model(**obj_in_data)
         db.add(db_obj)
+        db.flush()
+        edge_outbox.stage(db, kind=crud_edge_outbox.UPSERT, rsu_id=db_obj.id)
         db.commit()
         db.refresh(db_obj)
+        rsu_identity.invalidate(db_obj.rsu_esn)
         return db_obj
 
+    def remove(self, db: Session, *, id: int) -> RSU:
+        obj = db.query(self.model).get(id)
+        rsu_esn = obj.rsu_esn
+        db.delete(obj)
+        edge_outbox.stage(db, kind=crud_edge_outbox.DELETE, rsu_id=id, rsu_esn=rsu_esn)
+        db.commit()
+        rsu_identity.invalidate(rsu_esn)
+        return obj
+
     def get_first(self, db: Session) -> RSU:
         return db.query(self.model).first()
 
     def get_by_rsu_esn(self, db: Session, *, rsu_esn: str) -> RSU:
         return db.query(self.model).filter(self.model.rsu_esn == rsu_esn).first()
 
+    def get_esns_by_online_status(self, db: Session, *, online_status: bool) -> List[str]:
+        query_ = db.query(self.model.rsu_esn).filter(self.model.online_status == online_status)
+        return [rsu_esn for rsu_esn, in query_.all()]
+
+    def update_online_status_by_esns(
+        self, db: Session, *, rsu_esns: List[str], online_status: bool
+    ) -> int:
+        if not rsu_esns:
+            return 0
+        count = (
+            db.query(self.model)
+            .filter(self.model.rsu_esn.in_(rsu_esns), self.model.online_status != online_status)
+            .update(
+                {
+                    self.model.online_status: online_status,
+                    self.model.update_time: datetime.utcnow(),
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        return count
+
     def get_multi_with_total(
         self,
         db: Session,
@@ -147,6 +194,9 @@ class CRUDRSU(CRUDBase[RSU, RSUCreate, RSUUpdate]):
         if enabled is not None:
             query_ = query_.filter(self.model.enabled == enabled)
         total = query_.count()
+        query_ = query_.options(
+            joinedload(self.model.rsu_model), load_area(selectinload(self.model.intersection))
+        )
         if limit != -1:
             query_ = query_.offset(skip).limit(limit)
         data = query_.all()
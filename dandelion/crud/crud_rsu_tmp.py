@@ -17,6 +17,7 @@ from __future__ import annotations
 from typing import List, Optional, Tuple
 
 from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from dandelion.crud.base import CRUDBase
@@ -60,5 +61,13 @@ class CRUDRSUTMP(CRUDBase[RSUTMP, RSUTMPCreate, RSUTMPUpdate]):
         data = query_.all()
         return total, data
 
+    def count(self, db: Session, *, intersection_code: Optional[str] = None) -> int:
+        query_ = db.query(func.count(self.model.id))
+        if intersection_code is not None:
+            query_ = query_.join(RSU, self.model.rsu_id == RSU.id).filter(
+                RSU.intersection_code == intersection_code
+            )
+        return query_.scalar()
+
 
 rsu_tmp = CRUDRSUTMP(RSUTMP)
@@ -20,6 +20,7 @@ from sqlalchemy.orm import Session
 
 from dandelion.core.security import get_password_hash, verify_password
 from dandelion.crud.base import CRUDBase
+from dandelion.db import token_cache
 from dandelion.models import User
 from dandelion.schemas import UserCreate, UserUpdate
 
@@ -48,7 +49,14 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             hashed_password = get_password_hash(update_data["password"])
             del update_data["password"]
             update_data["hashed_password"] = hashed_password
-        return super().update(db, db_obj=db_obj, obj_in=update_data)
+        db_obj = super().update(db, db_obj=db_obj, obj_in=update_data)
+        token_cache.invalidate_user(db_obj.id)
+        return db_obj
+
+    def remove(self, db: Session, *, id: int) -> User:
+        obj = super().remove(db, id=id)
+        token_cache.invalidate_user(id)
+        return obj
 
     def authenticate(self, db: Session, *, username: str, password: str) -> Optional[User]:
         user = self.get_by_username(db, username=username)
@@ -14,16 +14,12 @@
 
 from __future__ import annotations
 
-import json
-from typing import List
-
 from sqlalchemy.orm import Session
 
 from dandelion import crud
+from dandelion.crud import crud_edge_outbox
 from dandelion.models import MNG
 from dandelion.models.mng import Reboot
-from dandelion.mqtt import cloud_server as mqtt_cloud_server
-from dandelion.mqtt.topic import v2x_edge
 
 
 def get_mng_default() -> MNG:
@@ -38,20 +34,6 @@ def get_mng_default() -> MNG:
 
 
 def refresh_cloud_rsu(db: Session):
-    if mqtt_cloud_server.MQTT_CLIENT is not None:
-        _, rsus = crud.rsu.get_multi_with_total(db, is_default=False)
-        node_rsus: List[dict] = []
-        for rsu in rsus:
-            node_rsu = dict(
-                name=rsu.rsu_name,
-                esn=rsu.rsu_esn,
-                intersectionCode=rsu.intersection_code,
-                location=rsu.location,
-                edge_rsu_id=rsu.id,
-            )
-            node_rsus.append(node_rsu)
-        mqtt_cloud_server.MQTT_CLIENT.publish(
-            topic=v2x_edge.V2X_EDGE_RSU_UP,
-            payload=json.dumps(dict(id=mqtt_cloud_server.EDGE_ID, rsus=node_rsus)),
-            qos=0,
-        )
+    """Queue a full sync of the RSUs of this edge node to the center."""
+    crud.edge_outbox.stage(db, kind=crud_edge_outbox.SYNC)
+    db.commit()
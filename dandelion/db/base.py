@@ -23,6 +23,7 @@ from dandelion.models.area import Area
 from dandelion.models.camera import Camera
 from dandelion.models.city import City
 from dandelion.models.country import Country
+from dandelion.models.edge_outbox import EdgeOutbox
 from dandelion.models.mng import MNG
 from dandelion.models.province import Province
 from dandelion.models.radar import Radar
@@ -14,8 +14,11 @@
 
 from __future__ import annotations
 
+import threading
+import time
 import urllib
 from logging import LoggerAdapter
+from typing import Any, Dict
 
 import redis
 from oslo_config import cfg
@@ -23,6 +26,8 @@ from oslo_log import log
 from oslo_utils import strutils
 from redis import sentinel
 
+from dandelion import metrics
+
 CONF: cfg = cfg.CONF
 LOG: LoggerAdapter = log.getLogger(__name__)
 
@@ -66,6 +71,48 @@ CLIENT_INT_ARGS = frozenset(
 
 DEFAULT_SOCKET_TIMEOUT: int = 30
 
+# Command name => latency, pipelines are observed as a whole as PIPELINE
+COMMAND_LATENCY: Dict[str, metrics.Histogram] = {}
+_COMMAND_LATENCY_LOCK = threading.Lock()
+
+
+def _observe(command: str, seconds: float) -> None:
+    histogram = COMMAND_LATENCY.get(command)
+    if histogram is None:
+        with _COMMAND_LATENCY_LOCK:
+            histogram = COMMAND_LATENCY.setdefault(command, metrics.Histogram())
+    histogram.observe(seconds)
+
+
+class InstrumentedPipeline(redis.client.Pipeline):
+    def execute(self, raise_on_error: bool = True) -> Any:
+        start = time.perf_counter()
+        try:
+            return super().execute(raise_on_error)
+        finally:
+            _observe("PIPELINE", time.perf_counter() - start)
+
+
+class InstrumentedRedis(redis.StrictRedis):
+    """Redis client recording the latency of each command."""
+
+    def execute_command(self, *args: Any, **options: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return super().execute_command(*args, **options)
+        finally:
+            _observe(str(args[0]).upper(), time.perf_counter() - start)
+
+    def pipeline(self, transaction: bool = True, shard_hint: Any = None) -> InstrumentedPipeline:
+        return InstrumentedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
+def get_command_latency() -> Dict[str, metrics.Histogram]:
+    with _COMMAND_LATENCY_LOCK:
+        return dict(COMMAND_LATENCY)
+
 
 def setup_redis() -> None:
     parser_url, options_ = CONF.redis.connection.split("//", 1)[1].rsplit("?", 1)
@@ -105,7 +152,9 @@ def setup_redis() -> None:
         del kwargs["sentinel"]
         if "sentinel_fallback" in kwargs:
             del kwargs["sentinel_fallback"]
-        REDIS_CONN = sentinel_server.master_for(sentinel_name, **kwargs)
+        REDIS_CONN = sentinel_server.master_for(
+            sentinel_name, redis_class=InstrumentedRedis, **kwargs
+        )
     else:
-        REDIS_CONN = redis.StrictRedis(**kwargs)
+        REDIS_CONN = InstrumentedRedis(**kwargs)
     LOG.info("Redis setup complete")
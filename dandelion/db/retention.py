@@ -0,0 +1,305 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import date, datetime, timedelta
+from logging import LoggerAdapter
+from typing import Any, Dict, List, Optional, Tuple
+
+from oslo_config import cfg
+from oslo_log import log
+from sqlalchemy import delete, select, text
+from sqlalchemy.engine import Connection
+
+from dandelion import models
+from dandelion.db import session
+
+CONF: cfg = cfg.CONF
+LOG: LoggerAdapter = log.getLogger(__name__)
+
+# Purged in this order, rsm_participants reference rsm.
+TABLES: Dict[str, Any] = {
+    "rsm_participants": models.Participants,
+    "rsm": models.RSM,
+    "rsi_event": models.RSIEvent,
+    "cgw": models.CGW,
+    "rsi_cwm": models.RSICWM,
+    "rsi_clc": models.RSICLC,
+    "rsi_dnp": models.RSIDNP,
+    "rsi_sds": models.RSISDS,
+    "osw": models.OSW,
+    "ssw": models.SSW,
+    "rdw": models.RDW,
+}
+
+# Table => (child table, foreign key column), children are removed together with
+# their parent rows, whatever the retention of the child table is.
+CHILDREN: Dict[str, Tuple[str, str]] = {
+    "rsm": ("rsm_participants", "rsm_id"),
+}
+
+# MySQL TO_DAYS() of date.fromordinal(1)
+TO_DAYS_OFFSET = 365
+
+
+class PurgeStats(object):
+    def __init__(self, table: str) -> None:
+        self.table = table
+        self.mode: Optional[str] = None
+        self.running = False
+        self.cutoff: Optional[datetime] = None
+        self.deleted = 0
+        self.dropped_partitions = 0
+        self.total_deleted = 0
+        self.runs = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self.last_run_time: Optional[float] = None
+        self.last_duration = 0.0
+        self._lock = threading.Lock()
+
+    def start(self, cutoff: datetime) -> None:
+        with self._lock:
+            self.running = True
+            self.cutoff = cutoff
+            self.deleted = 0
+            self.dropped_partitions = 0
+            self.runs += 1
+            self.last_run_time = time.time()
+
+    def progress(self, deleted: int, dropped_partitions: int = 0) -> None:
+        with self._lock:
+            self.deleted += deleted
+            self.total_deleted += deleted
+            self.dropped_partitions += dropped_partitions
+
+    def fail(self, ex: Exception) -> None:
+        with self._lock:
+            self.errors += 1
+            self.last_error = str(ex)
+
+    def finish(self, duration: float) -> None:
+        with self._lock:
+            self.running = False
+            self.last_duration = duration
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(
+                mode=self.mode,
+                running=self.running,
+                cutoff=self.cutoff.isoformat() if self.cutoff else None,
+                deletedRows=self.deleted,
+                droppedPartitions=self.dropped_partitions,
+                totalDeletedRows=self.total_deleted,
+                runs=self.runs,
+                errors=self.errors,
+                lastError=self.last_error,
+                lastRunTime=self.last_run_time,
+                lastDuration=self.last_duration,
+            )
+
+
+STATS: Dict[str, PurgeStats] = {}
+
+
+def retention_days(table: str) -> int:
+    retention_conf = CONF.retention
+    return int(
+        retention_conf.table_retention_days.get(table, retention_conf.default_retention_days)
+    )
+
+
+def purge_all() -> None:
+    for table in TABLES:
+        days = retention_days(table)
+        try:
+            if days > 0:
+                purge(table, days)
+            else:
+                # Partitions are added ahead even when rows are kept forever,
+                # otherwise new rows pile up in the MAXVALUE partition.
+                _add_partitions(table, _get_partitions(table))
+        except Exception as ex:
+            LOG.error(f"Retention purge of {table} failed: {ex}")
+
+
+def purge(table: str, days: int) -> int:
+    """
+    Remove the rows of `table` created more than `days` ago. Tables partitioned by
+    create_time drop their expired daily partitions, other tables are deleted from
+    in batches of `delete_batch_size` rows, one transaction per batch.
+    """
+    stats = STATS.setdefault(table, PurgeStats(table))
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    start = time.monotonic()
+    stats.start(cutoff)
+    try:
+        partitions = _get_partitions(table)
+        if partitions:
+            stats.mode = "partition"
+            _add_partitions(table, partitions)
+            _drop_partitions(table, partitions, cutoff, stats)
+        else:
+            stats.mode = "delete"
+            _delete_batches(table, cutoff, stats)
+    except Exception as ex:
+        stats.fail(ex)
+        raise
+    finally:
+        stats.finish(time.monotonic() - start)
+    LOG.info(
+        f"Retention purge of {table} older than {cutoff:%Y-%m-%d %H:%M:%S}: "
+        f"{stats.deleted} rows, {stats.dropped_partitions} partitions"
+    )
+    return stats.deleted
+
+
+def to_days(day: date) -> int:
+    return day.toordinal() + TO_DAYS_OFFSET
+
+
+def from_days(days: int) -> date:
+    return date.fromordinal(days - TO_DAYS_OFFSET)
+
+
+def partition_name(bound: int) -> str:
+    return f"p{from_days(bound):%Y%m%d}"
+
+
+def partition_definition(bound: int) -> str:
+    return f"PARTITION {partition_name(bound)} VALUES LESS THAN ({bound})"
+
+
+def _get_partitions(table: str) -> List[Tuple[str, Optional[int], int]]:
+    """(name, TO_DAYS upper bound or None for MAXVALUE, estimated rows) by position."""
+    if session.ENGINE.dialect.name != "mysql":
+        return []
+    with session.ENGINE.connect() as conn:
+        rows = conn.execute(
+            text(
+                "SELECT PARTITION_NAME, PARTITION_DESCRIPTION, TABLE_ROWS "
+                "FROM information_schema.PARTITIONS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table "
+                "AND PARTITION_NAME IS NOT NULL ORDER BY PARTITION_ORDINAL_POSITION"
+            ),
+            dict(table=table),
+        ).all()
+    return [
+        (name, None if bound == "MAXVALUE" else int(bound), int(table_rows or 0))
+        for name, bound, table_rows in rows
+    ]
+
+
+def _add_partitions(table: str, partitions: List[Tuple[str, Optional[int], int]]) -> None:
+    if not partitions:
+        return
+    bounds = [bound for _, bound, _ in partitions if bound is not None]
+    last = max(bounds) if bounds else to_days(datetime.utcnow().date())
+    target = to_days(
+        datetime.utcnow().date() + timedelta(days=CONF.retention.partition_days_ahead + 1)
+    )
+    if last >= target:
+        return
+    definitions = [partition_definition(bound) for bound in range(last + 1, target + 1)]
+    maxvalue = [name for name, bound, _ in partitions if bound is None]
+    if maxvalue:
+        # The MAXVALUE partition stays empty as long as partitions are added
+        # ahead of time, so reorganizing it does not copy any rows.
+        definitions.append(f"PARTITION {maxvalue[0]} VALUES LESS THAN MAXVALUE")
+        ddl = f"ALTER TABLE {table} REORGANIZE PARTITION {maxvalue[0]} INTO"
+    else:
+        ddl = f"ALTER TABLE {table} ADD PARTITION"
+    with session.ENGINE.begin() as conn:
+        conn.execute(text(f"{ddl} ({', '.join(definitions)})"))
+    LOG.info(f"Added {target - last} partitions to {table}")
+
+
+def _drop_partitions(
+    table: str,
+    partitions: List[Tuple[str, Optional[int], int]],
+    cutoff: datetime,
+    stats: PurgeStats,
+) -> None:
+    # A partition only holds rows created before its bound, so it is expired
+    # once its bound is not later than the cutoff.
+    expired = [
+        (name, table_rows)
+        for name, bound, table_rows in partitions
+        if bound is not None and bound <= to_days(cutoff.date())
+    ]
+    if not expired:
+        return
+    with session.ENGINE.begin() as conn:
+        conn.execute(
+            text(f"ALTER TABLE {table} DROP PARTITION {', '.join(name for name, _ in expired)}")
+        )
+    stats.progress(sum(table_rows for _, table_rows in expired), len(expired))
+
+
+def _delete_batches(table: str, cutoff: datetime, stats: PurgeStats) -> None:
+    retention_conf = CONF.retention
+    batch_size = retention_conf.delete_batch_size
+    table_ = TABLES[table].__table__
+    with session.ENGINE.connect() as conn:
+        first_kept_id = _first_kept_id(conn, table_, cutoff)
+    while True:
+        with session.ENGINE.begin() as conn:
+            ids = _expired_ids(conn, table_, cutoff, first_kept_id, batch_size)
+            if not ids:
+                break
+            if table in CHILDREN:
+                child, column = CHILDREN[table]
+                child_ = TABLES[child].__table__
+                conn.execute(delete(child_).where(child_.c[column].in_(ids)))
+            deleted = conn.execute(delete(table_).where(table_.c.id.in_(ids))).rowcount
+        stats.progress(deleted)
+        if len(ids) < batch_size:
+            break
+        time.sleep(retention_conf.delete_batch_interval)
+
+
+def _first_kept_id(conn: Connection, table_: Any, cutoff: datetime) -> Optional[int]:
+    # Rows are appended in create_time order, so walking the primary key up to
+    # the first row to keep only reads the expired rows, without an index on
+    # create_time. None when every row is expired.
+    return conn.execute(
+        select(table_.c.id).where(table_.c.create_time >= cutoff).order_by(table_.c.id).limit(1)
+    ).scalar()
+
+
+def _expired_ids(
+    conn: Connection,
+    table_: Any,
+    cutoff: datetime,
+    first_kept_id: Optional[int],
+    batch_size: int,
+) -> List[int]:
+    query = select(table_.c.id).where(table_.c.create_time < cutoff)
+    if first_kept_id is not None:
+        # Bounds the scan by primary key once no expired rows are left
+        query = query.where(table_.c.id < first_kept_id)
+    return conn.execute(query.order_by(table_.c.id).limit(batch_size)).scalars().all()
+
+
+def get_stats() -> Dict[str, Any]:
+    return {
+        table: dict(
+            retentionDays=retention_days(table), **(STATS[table].stats() if table in STATS else {})
+        )
+        for table in TABLES
+    }
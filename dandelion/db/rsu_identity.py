@@ -0,0 +1,171 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from logging import LoggerAdapter
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from oslo_config import cfg
+from oslo_log import log
+from sqlalchemy.orm import Session
+
+from dandelion.db import redis_pool
+from dandelion.models import RSU
+
+CONF: cfg = cfg.CONF
+LOG: LoggerAdapter = log.getLogger(__name__)
+
+RSU_IDENTITY_CACHE: Optional[RSUIdentityCache] = None
+_RSU_IDENTITY_CACHE_LOCK = threading.Lock()
+
+
+class RSUIdentity(NamedTuple):
+    id: int
+    rsu_esn: str
+    rsu_id: str
+    rsu_name: str
+    intersection_code: str
+    enabled: bool
+
+
+class RSUIdentityCache(object):
+    def __init__(self, *, backend: str, size: int, ttl: int, negative_ttl: int):
+        """
+        Cache of rsu_esn => RSUIdentity, unknown ESNs are cached as None for
+        the shorter negative_ttl.
+
+        The memory backend is a per process LRU, the redis backend shares
+        entries (and invalidations) between processes.
+        """
+        self.backend = backend
+        self.size = size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries: OrderedDict[str, Tuple[Optional[RSUIdentity], float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, db: Session, rsu_esn: str) -> Optional[RSUIdentity]:
+        found, identity = self._get_cached(rsu_esn)
+        if found:
+            self.hits += 1
+            return identity
+        self.misses += 1
+        row = (
+            db.query(
+                RSU.id, RSU.rsu_esn, RSU.rsu_id, RSU.rsu_name, RSU.intersection_code, RSU.enabled
+            )
+            .filter(RSU.rsu_esn == rsu_esn)
+            .first()
+        )
+        identity = None if row is None else RSUIdentity(*row)
+        self._set_cached(rsu_esn, identity)
+        return identity
+
+    def invalidate(self, *rsu_esns: str) -> None:
+        rsu_esns = tuple(rsu_esn for rsu_esn in rsu_esns if rsu_esn)
+        if not rsu_esns:
+            return
+        self.invalidations += len(rsu_esns)
+        if self.backend == "redis":
+            redis_pool.REDIS_CONN.delete(*[self._key(rsu_esn) for rsu_esn in rsu_esns])
+            return
+        with self._lock:
+            for rsu_esn in rsu_esns:
+                self._entries.pop(rsu_esn, None)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        stats: Dict[str, Any] = dict(
+            backend=self.backend,
+            hits=self.hits,
+            misses=self.misses,
+            hitRate=round(self.hits / lookups, 4) if lookups else 0.0,
+            invalidations=self.invalidations,
+        )
+        if self.backend == "memory":
+            stats["size"] = len(self._entries)
+        return stats
+
+    @staticmethod
+    def _key(rsu_esn: str) -> str:
+        return f"RSU_IDENTITY_{rsu_esn}"
+
+    def _get_cached(self, rsu_esn: str) -> Tuple[bool, Optional[RSUIdentity]]:
+        if self.backend == "redis":
+            value = redis_pool.REDIS_CONN.get(self._key(rsu_esn))
+            if value is None:
+                return False, None
+            data = json.loads(value)
+            return True, None if data is None else RSUIdentity(*data)
+        with self._lock:
+            entry = self._entries.get(rsu_esn)
+            if entry is None:
+                return False, None
+            if entry[1] < time.monotonic():
+                del self._entries[rsu_esn]
+                return False, None
+            self._entries.move_to_end(rsu_esn)
+            return True, entry[0]
+
+    def _set_cached(self, rsu_esn: str, identity: Optional[RSUIdentity]) -> None:
+        ttl = self.ttl if identity is not None else self.negative_ttl
+        if not ttl:
+            return
+        if self.backend == "redis":
+            redis_pool.REDIS_CONN.set(self._key(rsu_esn), json.dumps(identity), ex=ttl)
+            return
+        with self._lock:
+            self._entries[rsu_esn] = (identity, time.monotonic() + ttl)
+            self._entries.move_to_end(rsu_esn)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+
+def get_cache() -> RSUIdentityCache:
+    global RSU_IDENTITY_CACHE
+    if RSU_IDENTITY_CACHE is None:
+        with _RSU_IDENTITY_CACHE_LOCK:
+            if RSU_IDENTITY_CACHE is None:
+                RSU_IDENTITY_CACHE = RSUIdentityCache(
+                    backend=CONF.ingest.rsu_cache_backend,
+                    size=CONF.ingest.rsu_cache_size,
+                    ttl=CONF.ingest.rsu_cache_ttl,
+                    negative_ttl=CONF.ingest.rsu_cache_negative_ttl,
+                )
+    return RSU_IDENTITY_CACHE
+
+
+def get(db: Session, rsu_esn: str) -> Optional[RSUIdentity]:
+    return get_cache().get(db, rsu_esn)
+
+
+def invalidate(*rsu_esns: str) -> None:
+    try:
+        get_cache().invalidate(*rsu_esns)
+    except Exception as ex:
+        LOG.warn(f"Failed to invalidate RSU identity cache {rsu_esns}: {ex}")
+
+
+def get_stats() -> Dict[str, Any]:
+    return get_cache().stats()
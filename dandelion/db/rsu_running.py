@@ -0,0 +1,244 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import json
+import struct
+import time
+from logging import LoggerAdapter
+from typing import Any, Dict, List, Optional, Tuple
+
+import redis
+from oslo_config import cfg
+from oslo_log import log
+
+CONF: cfg = cfg.CONF
+LOG: LoggerAdapter = log.getLogger(__name__)
+
+# Metric name => the two fields sampled from RSU_RUNNING_INFO_{rsu_esn}
+METRICS: Dict[str, Tuple[str, str]] = {
+    "cpu": ("uti", "load"),
+    "mem": ("total", "used"),
+    "disk": ("read", "write"),
+    "net": ("rxByte", "wxByte"),
+}
+
+# Tier name => bucket seconds, raw samples are not bucketed
+TIERS: Dict[str, int] = {
+    "raw": 0,
+    "hourly": 60 * 60,
+    "daily": 60 * 60 * 24,
+}
+
+# A series is a redis string of fixed width records ordered by time:
+# time (uint32), sample count (uint16), first field (float32), second field (float32)
+RECORD = struct.Struct("<IHff")
+
+LEGACY_CHECKED = False
+
+
+def series_key(metric: str, tier: str, rsu_esn: str) -> str:
+    return f"RSU_SERIES_{metric.upper()}_{tier.upper()}_{rsu_esn}"
+
+
+def legacy_series_key(metric: str, tier: str, rsu_esn: str) -> str:
+    if tier == "raw":
+        return f"RSU_RUNNING_{metric.upper()}_{rsu_esn}"
+    return f"RSU_RUNNING_{metric.upper()}_{tier.upper()}_{rsu_esn}"
+
+
+def _retention(tier: str) -> int:
+    return getattr(CONF.rsu_running, f"{tier}_retention")
+
+
+def _float(value: Any) -> float:
+    """Reported values may be missing, null or strings, anything not a number counts as 0."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _sample(metric: str, value: Optional[bytes]) -> Tuple[float, float]:
+    try:
+        data = json.loads(value or "{}")
+    except ValueError:
+        LOG.warn(f"Invalid RSU running info of {metric}: {value!r}")
+        data = {}
+    if not isinstance(data, dict):
+        data = {}
+    field_a, field_b = METRICS[metric]
+    if metric == "cpu":
+        # uti is reported as a comma separated list, one item per core
+        uti = data.get(field_a)
+        return len(str(uti).split(",")) if uti else 0, _float(data.get(field_b))
+    return _float(data.get(field_a)), _float(data.get(field_b))
+
+
+def _decode(metric: str, buf: bytes) -> List[Dict[str, Any]]:
+    field_a, field_b = METRICS[metric]
+    return [
+        {"time": t, field_a: a, field_b: b, "count": count}
+        for t, count, a, b in RECORD.iter_unpack(buf)
+    ]
+
+
+def _bisect(buf: bytes, ts: int) -> int:
+    """Index of the first record of buf whose time is not before ts."""
+    lo, hi = 0, len(buf) // RECORD.size
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if RECORD.unpack_from(buf, mid * RECORD.size)[0] < ts:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def migrate_legacy(redis_conn: redis.Redis, rsu_esns: List[str]) -> None:
+    """Pack the JSON sorted set series of older releases and drop them."""
+    pipe = redis_conn.pipeline(transaction=False)
+    for rsu_esn in rsu_esns:
+        for metric in METRICS:
+            for tier in TIERS:
+                pipe.zrange(legacy_series_key(metric, tier, rsu_esn), 0, -1)
+    results = iter(pipe.execute())
+
+    migrated = 0
+    pipe = redis_conn.pipeline(transaction=False)
+    for rsu_esn in rsu_esns:
+        for metric, (field_a, field_b) in METRICS.items():
+            for tier in TIERS:
+                members = next(results)
+                if not members:
+                    continue
+                records = []
+                for member in members[-_retention(tier) :]:
+                    data = json.loads(member)
+                    records.append(
+                        RECORD.pack(
+                            int(_float(data.get("time"))),
+                            int(_float(data.get("count", 1))),
+                            _float(data.get(field_a)),
+                            _float(data.get(field_b)),
+                        )
+                    )
+                pipe.set(series_key(metric, tier, rsu_esn), b"".join(records))
+                pipe.delete(legacy_series_key(metric, tier, rsu_esn))
+                migrated += 1
+    pipe.execute()
+    if migrated:
+        LOG.info(f"Migrated {migrated} RSU running info series to packed records")
+
+
+def rollup(redis_conn: redis.Redis, rsu_esns: List[str], now: Optional[int] = None) -> None:
+    """Sample the running info of RSUs into the raw, hourly and daily series.
+
+    Each batch of RSUs costs two round trips: one pipeline reads the running
+    info hashes and the tail of every series, one pipeline appends the new
+    samples or overwrites the open hourly/daily bucket in place. Series are
+    trimmed back to their retention once they grow a tenth past it.
+    """
+    global LEGACY_CHECKED
+    c_time = int(now or time.time())
+    batch_size = CONF.rsu_running.rollup_batch_size
+    trims: Dict[str, int] = {}
+    for i in range(0, len(rsu_esns), batch_size):
+        batch = rsu_esns[i : i + batch_size]
+        if not LEGACY_CHECKED:
+            migrate_legacy(redis_conn, batch)
+
+        read_pipe = redis_conn.pipeline(transaction=False)
+        for rsu_esn in batch:
+            read_pipe.hgetall(f"RSU_RUNNING_INFO_{rsu_esn}")
+            for metric in METRICS:
+                for tier in TIERS:
+                    key = series_key(metric, tier, rsu_esn)
+                    read_pipe.strlen(key)
+                    read_pipe.getrange(key, -RECORD.size, -1)
+        results = iter(read_pipe.execute())
+
+        write_pipe = redis_conn.pipeline(transaction=False)
+        for rsu_esn in batch:
+            info = {
+                (k.decode("utf-8") if isinstance(k, bytes) else k): v
+                for k, v in next(results).items()
+            }
+            for metric in METRICS:
+                a, b = _sample(metric, info.get(metric))
+                for tier, seconds in TIERS.items():
+                    key = series_key(metric, tier, rsu_esn)
+                    length, last = next(results), next(results)
+                    bucket = c_time - c_time % seconds if seconds else c_time
+                    if seconds and len(last) == RECORD.size:
+                        last_time, count, last_a, last_b = RECORD.unpack(last)
+                        if last_time == bucket:
+                            # Fold the sample into the open bucket average
+                            record = RECORD.pack(
+                                bucket,
+                                count + 1,
+                                (last_a * count + a) / (count + 1),
+                                (last_b * count + b) / (count + 1),
+                            )
+                            write_pipe.setrange(key, length - RECORD.size, record)
+                            continue
+                    write_pipe.append(key, RECORD.pack(bucket, 1, a, b))
+                    retention = _retention(tier)
+                    if length // RECORD.size + 1 > retention + max(1, retention // 10):
+                        trims[key] = retention * RECORD.size
+        write_pipe.execute()
+    LEGACY_CHECKED = True
+
+    if trims:
+        read_pipe = redis_conn.pipeline(transaction=False)
+        for key, keep in trims.items():
+            read_pipe.getrange(key, -keep, -1)
+        write_pipe = redis_conn.pipeline(transaction=False)
+        for key, buf in zip(trims, read_pipe.execute()):
+            write_pipe.set(key, buf)
+        write_pipe.execute()
+    LOG.debug(f"Rolled up running info of {len(rsu_esns)} RSUs, trimmed {len(trims)} series")
+
+
+def read_recent(
+    redis_conn: redis.Redis, rsu_esn: str, tier: str = "raw", count: int = 7
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Return the newest samples of every metric of a RSU, newest first."""
+    pipe = redis_conn.pipeline(transaction=False)
+    for metric in METRICS:
+        pipe.getrange(series_key(metric, tier, rsu_esn), -count * RECORD.size, -1)
+    return {metric: _decode(metric, buf)[::-1] for metric, buf in zip(METRICS, pipe.execute())}
+
+
+def read_range(
+    redis_conn: redis.Redis,
+    rsu_esn: str,
+    tier: str = "raw",
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Return the samples of every metric of a RSU between start and end
+    (inclusive, unix seconds), newest first."""
+    pipe = redis_conn.pipeline(transaction=False)
+    for metric in METRICS:
+        pipe.get(series_key(metric, tier, rsu_esn))
+    samples = {}
+    for metric, buf in zip(METRICS, pipe.execute()):
+        buf = buf or b""
+        lo = 0 if start is None else _bisect(buf, start)
+        hi = len(buf) // RECORD.size if end is None else _bisect(buf, end + 1)
+        samples[metric] = _decode(metric, buf[lo * RECORD.size : hi * RECORD.size])[::-1]
+    return samples
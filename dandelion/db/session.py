@@ -14,19 +14,52 @@
 
 from __future__ import annotations
 
+import threading
+import time
 import urllib
+from contextlib import contextmanager
+from contextvars import ContextVar
 from logging import LoggerAdapter
-from typing import Dict
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar, Union
 
 from oslo_config import cfg
 from oslo_log import log
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
 
 CONF = cfg.CONF
 LOG: LoggerAdapter = log.getLogger(__name__)
 
 DB_SESSION_LOCAL: Session
+ENGINE: Engine
+ASYNC_SESSION_LOCAL: Optional[sessionmaker] = None
+ASYNC_ENGINE: Optional[AsyncEngine] = None
+
+# Sync driver => async driver of the same database
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+T = TypeVar("T")
+
+_POOL_STATS: Dict[str, int] = dict(connects=0, checkouts=0, checkedOut=0, maxCheckedOut=0)
+_POOL_STATS_LOCK = threading.Lock()
+
+
+class QueryStats(object):
+    """Number of queries and seconds spent executing them within a track_queries block."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+
+
+_QUERY_STATS: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
 
 
 def setup_db() -> None:
@@ -45,11 +78,63 @@ def setup_db() -> None:
 
         engine = create_engine(connection, pool_pre_ping=True, **engine_cfg)
 
-    global DB_SESSION_LOCAL
+    event.listen(engine, "connect", _on_connect)
+    event.listen(engine, "checkout", _on_checkout)
+    event.listen(engine, "checkin", _on_checkin)
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    global DB_SESSION_LOCAL, ENGINE
+    ENGINE = engine
     DB_SESSION_LOCAL = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
     LOG.info("DB setup complete")
 
+    if CONF.database.enable_async:
+        setup_async_db()
+
+
+def setup_async_db() -> None:
+    connection = async_connection()
+    try:
+        if connection.startswith("sqlite"):
+            engine = create_async_engine(connection)
+        else:
+            engine = create_async_engine(
+                connection,
+                pool_pre_ping=True,
+                pool_size=CONF.database.max_pool_size,
+                max_overflow=CONF.database.max_overflow,
+            )
+    except ImportError as ex:
+        LOG.error(f"Async DB driver not installed, reads stay on the threadpool: {ex}")
+        return
+
+    for name, func in [
+        ("connect", _on_connect),
+        ("checkout", _on_checkout),
+        ("checkin", _on_checkin),
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+    ]:
+        event.listen(engine.sync_engine, name, func)
+
+    global ASYNC_SESSION_LOCAL, ASYNC_ENGINE
+    ASYNC_ENGINE = engine
+    ASYNC_SESSION_LOCAL = sessionmaker(
+        autocommit=False, autoflush=False, bind=engine, class_=AsyncSession
+    )
+
+    LOG.info(f"Async DB setup complete, driver: {engine.dialect.driver}")
+
+
+def async_connection() -> str:
+    connection = CONF.database.connection
+    if not connection.startswith("sqlite"):
+        connection = connection_database()
+    driver, sep, rest = connection.partition("://")
+    return f"{ASYNC_DRIVERS.get(driver, driver)}{sep}{rest}"
+
 
 def connection_database() -> str:
     connection = CONF.database.connection
@@ -61,3 +146,109 @@ def connection_database() -> str:
         + connection[right:]
     )
     return connection
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """Provide a session which is rolled back on error and always closed."""
+    db: Session = DB_SESSION_LOCAL()
+    try:
+        yield db
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+class ThreadedSession(object):
+    def __init__(self) -> None:
+        """
+        Stand-in for an AsyncSession while the async engine is off, running the
+        work on a sync session in the threadpool.
+        """
+        self.sync_session: Session = DB_SESSION_LOCAL()
+
+    async def run_sync(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await run_in_threadpool(func, self.sync_session, *args, **kwargs)
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_session.close)
+
+
+AsyncDB = Union[AsyncSession, ThreadedSession]
+
+
+def async_session() -> AsyncDB:
+    """
+    Session for `async def` endpoints. Their queries go through `run_sync`, on the
+    event loop with the async engine, or in the threadpool without it.
+    """
+    if ASYNC_SESSION_LOCAL is not None:
+        return ASYNC_SESSION_LOCAL()
+    return ThreadedSession()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Count the queries run in the current context. The context is copied into
+    the threadpool running sync endpoints, so they add up to the same stats.
+    """
+    stats = QueryStats()
+    token = _QUERY_STATS.set(stats)
+    try:
+        yield stats
+    finally:
+        _QUERY_STATS.reset(token)
+
+
+def _before_cursor_execute(
+    conn: Any, cursor: Any, statement: Any, parameters: Any, context: Any, executemany: bool
+) -> None:
+    if _QUERY_STATS.get() is not None:
+        conn.info["query_start"] = time.perf_counter()
+
+
+def _after_cursor_execute(
+    conn: Any, cursor: Any, statement: Any, parameters: Any, context: Any, executemany: bool
+) -> None:
+    stats = _QUERY_STATS.get()
+    query_start = conn.info.pop("query_start", None)
+    if stats is None or query_start is None:
+        return
+    stats.count += 1
+    stats.duration += time.perf_counter() - query_start
+
+
+def _on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+    with _POOL_STATS_LOCK:
+        _POOL_STATS["connects"] += 1
+
+
+def _on_checkout(dbapi_connection: Any, connection_record: Any, connection_proxy: Any) -> None:
+    with _POOL_STATS_LOCK:
+        _POOL_STATS["checkouts"] += 1
+        _POOL_STATS["checkedOut"] += 1
+        _POOL_STATS["maxCheckedOut"] = max(_POOL_STATS["maxCheckedOut"], _POOL_STATS["checkedOut"])
+
+
+def _on_checkin(dbapi_connection: Any, connection_record: Any) -> None:
+    with _POOL_STATS_LOCK:
+        _POOL_STATS["checkedOut"] = max(_POOL_STATS["checkedOut"] - 1, 0)
+
+
+def get_pool_status() -> Dict[str, Any]:
+    """
+    Connection pool statistics, `maxCheckedOut` is the high-water mark of
+    connections in use and is the number to size `max_pool_size` from.
+    """
+    pool = ENGINE.pool
+    with _POOL_STATS_LOCK:
+        status: Dict[str, Any] = dict(_POOL_STATS)
+    status["pool"] = pool.__class__.__name__
+    for name in ["size", "checkedin", "overflow"]:
+        func = getattr(pool, name, None)
+        if func is not None:
+            status[name] = func()
+    return status
@@ -0,0 +1,122 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from logging import LoggerAdapter
+from typing import Any, Dict, Optional, Tuple
+
+from jose import jwt
+from oslo_config import cfg
+from oslo_log import log
+
+from dandelion import schemas
+
+CONF: cfg = cfg.CONF
+LOG: LoggerAdapter = log.getLogger(__name__)
+
+TOKEN_CACHE: Optional[TokenCache] = None
+_TOKEN_CACHE_LOCK = threading.Lock()
+
+
+class TokenCache(object):
+    def __init__(self, *, size: int, ttl: int):
+        """
+        Per process LRU of token hash => user the token was validated for.
+        Entries expire after `ttl` seconds or with the token, whichever is first.
+        """
+        self.size = size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, Tuple[schemas.User, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[schemas.User]:
+        if not self.ttl:
+            return None
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+        return None
+
+    def set(self, token: str, user: schemas.User) -> None:
+        if not self.ttl:
+            return
+        expires_at = time.time() + self.ttl
+        try:
+            exp = jwt.get_unverified_claims(token).get("exp")
+        except jwt.JWTError:
+            exp = None
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+        with self._lock:
+            self._entries[self._key(token)] = (user, expires_at)
+            self._entries.move_to_end(self._key(token))
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            keys = [key for key, (user, _) in self._entries.items() if user.id == user_id]
+            for key in keys:
+                del self._entries[key]
+            self.invalidations += len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            hitRate=round(self.hits / lookups, 4) if lookups else 0.0,
+            invalidations=self.invalidations,
+            size=len(self._entries),
+        )
+
+
+def get_cache() -> TokenCache:
+    global TOKEN_CACHE
+    if TOKEN_CACHE is None:
+        with _TOKEN_CACHE_LOCK:
+            if TOKEN_CACHE is None:
+                token_conf = CONF.token
+                TOKEN_CACHE = TokenCache(
+                    size=token_conf.validation_cache_size, ttl=token_conf.validation_cache_ttl
+                )
+    return TOKEN_CACHE
+
+
+def invalidate_user(user_id: int) -> None:
+    get_cache().invalidate_user(user_id)
+
+
+def get_stats() -> Dict[str, Any]:
+    return get_cache().stats()
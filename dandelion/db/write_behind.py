@@ -0,0 +1,166 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from logging import LoggerAdapter
+from typing import Any, Callable, Dict, List, Optional
+
+from oslo_log import log
+
+LOG: LoggerAdapter = log.getLogger(__name__)
+
+_BUFFERS: List[WriteBehindBuffer] = []
+_BUFFERS_LOCK = threading.Lock()
+
+
+class WriteBehindBuffer(object):
+    def __init__(
+        self,
+        name: str,
+        flush_func: Callable[[List[Any]], None],
+        *,
+        batch_size: int,
+        flush_interval: float,
+        queue_size: int,
+    ):
+        """
+        In-memory queue drained by a background thread, which hands items to
+        `flush_func` in batches of at most `batch_size`, or whatever has been
+        queued after `flush_interval` seconds.
+        """
+        self.name = name
+        self.flush_func = flush_func
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.flushed = 0
+        self.failed = 0
+        self.flush_count = 0
+        self.last_flush_size = 0
+        self.last_flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name=f"write-behind-{self.name}", daemon=True
+            )
+            self._thread.start()
+        with _BUFFERS_LOCK:
+            _BUFFERS.append(self)
+        LOG.info(f"Write-behind buffer [{self.name}] started")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        LOG.info(f"Write-behind buffer [{self.name}] stopped: {self.stats()}")
+
+    def put(self, item: Any) -> bool:
+        if self._thread is None:
+            self.start()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+            LOG.warn(f"Write-behind buffer [{self.name}] is full, item dropped")
+            return False
+        self.enqueued += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(
+            name=self.name,
+            queueDepth=self._queue.qsize(),
+            enqueued=self.enqueued,
+            dropped=self.dropped,
+            flushed=self.flushed,
+            failed=self.failed,
+            flushCount=self.flush_count,
+            lastFlushSize=self.last_flush_size,
+            lastFlushSeconds=self.last_flush_seconds,
+            maxFlushSeconds=self.max_flush_seconds,
+        )
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            batch = self._drain(wait=True)
+            if batch:
+                self._flush(batch)
+        # Write out whatever is left before exiting.
+        while True:
+            batch = self._drain(wait=False)
+            if not batch:
+                break
+            self._flush(batch)
+
+    def _drain(self, wait: bool) -> List[Any]:
+        batch: List[Any] = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if wait and timeout > 0:
+                    batch.append(self._queue.get(timeout=timeout))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _flush(self, batch: List[Any]) -> None:
+        start_time = time.monotonic()
+        try:
+            self.flush_func(batch)
+        except Exception as ex:
+            self.failed += len(batch)
+            LOG.error(
+                f"Write-behind buffer [{self.name}] failed to flush {len(batch)} items: {ex}"
+            )
+            return
+        flush_seconds = time.monotonic() - start_time
+        self.flushed += len(batch)
+        self.flush_count += 1
+        self.last_flush_size = len(batch)
+        self.last_flush_seconds = flush_seconds
+        self.max_flush_seconds = max(self.max_flush_seconds, flush_seconds)
+        LOG.debug(
+            f"Write-behind buffer [{self.name}] flushed {len(batch)} items in "
+            f"{flush_seconds:.3f}s, queue depth: {self._queue.qsize()}"
+        )
+
+
+def get_stats() -> List[Dict[str, Any]]:
+    with _BUFFERS_LOCK:
+        return [buffer.stats() for buffer in _BUFFERS]
+
+
+def stop_all(timeout: Optional[float] = None) -> None:
+    with _BUFFERS_LOCK:
+        buffers = list(_BUFFERS)
+    for buffer in buffers:
+        buffer.stop(timeout)
@@ -0,0 +1,77 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import signal
+import sys
+import threading
+from logging import LoggerAdapter
+from typing import Any
+
+from oslo_config import cfg
+from oslo_log import log
+
+# crud has to be imported ahead of the mqtt modules, which import each other through it.
+from dandelion import constants, crud, version  # noqa: F401
+from dandelion.db import redis_pool, session as db_session, write_behind
+from dandelion.mqtt import (
+    cloud_server as mqtt_cloud_server,
+    dispatcher as mqtt_dispatcher,
+    server as mqtt_server,
+)
+
+CONF: cfg = cfg.CONF
+LOG: LoggerAdapter = log.getLogger(__name__)
+
+STOPPED = threading.Event()
+
+
+def _on_signal(signum: int, frame: Any) -> None:
+    LOG.info(f"Received signal {signum}, stopping...")
+    STOPPED.set()
+
+
+def main() -> None:
+    """Run the MQTT topic_router consumers without the API server."""
+    log.register_options(CONF)
+    CONF(
+        args=sys.argv[1:],
+        project=constants.PROJECT_NAME,
+        version=version.version_string(),
+        default_config_files=[constants.CONFIG_FILE_PATH],
+    )
+    log.setup(CONF, constants.PROJECT_NAME)
+
+    db_session.setup_db()
+    redis_pool.setup_redis()
+    mqtt_server.connect()
+    # Handlers forward RSU data to the center through the cloud client.
+    if CONF.mode.mode in ["edge", "coexist"]:
+        mqtt_cloud_server.connect()
+
+    signal.signal(signal.SIGTERM, _on_signal)
+    signal.signal(signal.SIGINT, _on_signal)
+    LOG.info("Dandelion ingest started")
+    while not STOPPED.wait(1):
+        pass
+
+    LOG.info("Shutting down...")
+    mqtt_server.disconnect()
+    mqtt_dispatcher.stop_all(timeout=10)
+    write_behind.stop_all(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,24 +14,28 @@
 
 from __future__ import annotations
 
-import time
-import uuid
 from logging import LoggerAdapter
 
 from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.schedulers.background import BackgroundScheduler
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi_utils.tasks import repeat_every
 from oslo_config import cfg
 from oslo_log import log
 from pytz import utc
 from starlette.middleware.cors import CORSMiddleware
 
-from dandelion import constants, periodic_tasks, version
+from dandelion import constants, periodic_tasks, scheduler, version
+from dandelion.api import metrics as api_metrics, middleware
 from dandelion.api.api_v1.api import api_router
-from dandelion.db import redis_pool, session as db_session
-from dandelion.mqtt import cloud_server as mqtt_cloud_server, server as mqtt_server
+from dandelion.db import redis_pool, session as db_session, write_behind
+from dandelion.mqtt import (
+    cloud_server as mqtt_cloud_server,
+    dispatcher as mqtt_dispatcher,
+    outbox as mqtt_outbox,
+    server as mqtt_server,
+)
 
 CONF: cfg = cfg.CONF
 LOG: LoggerAdapter = log.getLogger(__name__)
@@ -42,6 +46,7 @@ app = FastAPI(
 )
 
 mode_conf = CONF.mode
+role_conf = CONF.role
 
 
 # Startup
@@ -58,7 +63,7 @@ def prepare() -> None:
 
 @app.on_event("startup")
 def setup_mqtt() -> None:
-    mqtt_server.connect()
+    mqtt_server.connect(subscribe=role_conf.role in ["ingest", "all"])
 
 
 @app.on_event("startup")
@@ -77,6 +82,26 @@ def setup_redis() -> None:
     redis_pool.setup_redis()
 
 
+@app.on_event("startup")
+def setup_scheduler_leader_election() -> None:
+    if role_conf.role in ["scheduler", "all"]:
+        scheduler.setup()
+
+
+@app.on_event("startup")
+def setup_rsu_offline_listener() -> None:
+    if role_conf.role in ["scheduler", "all"]:
+        periodic_tasks.start_rsu_offline_listener()
+
+
+@app.on_event("startup")
+def setup_edge_outbox() -> None:
+    if mode_conf.mode in ["edge", "coexist"] and role_conf.role in ["scheduler", "all"]:
+        if not CONF.scheduler.leader_election:
+            LOG.warn("Scheduler leader election is disabled, every process drains the outbox")
+        mqtt_outbox.get_drainer().start()
+
+
 @app.on_event("startup")
 def setup_app():
     # Set all CORS enabled origins
@@ -92,38 +117,72 @@ def setup_app():
 
 @app.on_event("startup")
 def setup_rsu_running():
+    if role_conf.role not in ["scheduler", "all"]:
+        return
     job_stores = {"default": MemoryJobStore()}
     executors = {"default": ThreadPoolExecutor(5)}
     job_defaults = {"coalesce": False, "max_instances": 3}
-    scheduler = BackgroundScheduler(
+    scheduler_ = BackgroundScheduler(
         jobstores=job_stores, executors=executors, job_defaults=job_defaults, timezone=utc
     )
-    scheduler.add_job(periodic_tasks.rsu_info, trigger="cron", minute="00,10,20,30,40,50")
-    scheduler.start()
+    scheduler_.add_job(
+        scheduler.run_job,
+        args=["rsu_info", periodic_tasks.rsu_info],
+        kwargs={"interval": 60 * 10},
+        trigger="cron",
+        minute="00,10,20,30,40,50",
+    )
+    scheduler_.start()
 
 
 @app.on_event("startup")
 @repeat_every(seconds=60)
 def update_rsu_online_status() -> None:
-    periodic_tasks.update_rsu_online_status()
+    if role_conf.role not in ["scheduler", "all"]:
+        return
+    scheduler.run_job(
+        "update_rsu_online_status", periodic_tasks.update_rsu_online_status, interval=60
+    )
 
 
 @app.on_event("startup")
 @repeat_every(seconds=60)
 def delete_offline_edge() -> None:
-    periodic_tasks.delete_offline_edge()
+    if role_conf.role not in ["scheduler", "all"]:
+        return
+    scheduler.run_job("delete_offline_edge", periodic_tasks.delete_offline_edge, interval=60)
 
 
 @app.on_event("startup")
 @repeat_every(seconds=10)
 def edge_heartbeat() -> None:
-    periodic_tasks.edge_heartbeat()
+    if role_conf.role not in ["scheduler", "all"]:
+        return
+    scheduler.run_job("edge_heartbeat", periodic_tasks.edge_heartbeat, interval=10)
+
+
+@app.on_event("startup")
+@repeat_every(seconds=60)
+def log_db_pool_status() -> None:
+    periodic_tasks.log_db_pool_status()
 
 
 @app.on_event("startup")
 @repeat_every(seconds=60 * 60 * 24)
 def delete_unused_bitmap() -> None:
-    periodic_tasks.delete_unused_bitmap()
+    if role_conf.role not in ["scheduler", "all"]:
+        return
+    scheduler.run_job(
+        "delete_unused_bitmap", periodic_tasks.delete_unused_bitmap, interval=60 * 60 * 24
+    )
+
+
+@app.on_event("startup")
+@repeat_every(seconds=60 * 60)
+def purge_expired_rows() -> None:
+    if role_conf.role not in ["scheduler", "all"]:
+        return
+    scheduler.run_job("purge_expired_rows", periodic_tasks.purge_expired_rows, interval=60 * 60)
 
 
 # Shutdown
@@ -131,25 +190,17 @@ def delete_unused_bitmap() -> None:
 def shutdown_event():
     LOG.info("Shutting down...")
     periodic_tasks.edge_delete()
+    periodic_tasks.stop_rsu_offline_listener()
+    scheduler.stop(timeout=5)
+    mqtt_server.disconnect()
+    if mqtt_outbox.DRAINER is not None:
+        mqtt_outbox.DRAINER.stop(timeout=10)
+    mqtt_dispatcher.stop_all(timeout=10)
+    write_behind.stop_all(timeout=10)
 
 
 # Middleware
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
-
-
-@app.middleware("http")
-async def add_request_id_header(request: Request, call_next):
-    request_id = uuid.uuid4().hex
-    LOG.info(f"Request path: {request.url.path}, request id: {request_id}")
-    response = await call_next(request)
-    response.headers["OpenV2X-Request-ID"] = request_id
-    return response
-
+app.add_middleware(middleware.RequestMiddleware)
 
 app.include_router(api_router, prefix=constants.API_V1_STR)
+app.include_router(api_metrics.router)
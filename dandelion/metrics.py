@@ -0,0 +1,110 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Seconds, upper bounds of the latency histogram buckets
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Histogram(object):
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> Tuple[List[int], int, float]:
+        """Cumulative bucket counts, the last one being +Inf, total count and sum."""
+        with self._lock:
+            counts = list(self._counts)
+            sum_ = self._sum
+        cumulative = []
+        total = 0
+        for count in counts:
+            total += count
+            cumulative.append(total)
+        return cumulative, total, sum_
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Optional[Dict[str, Any]]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _value(value: Any) -> str:
+    if value is None:
+        return "NaN"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Exposition(object):
+    """Builds a page in the Prometheus text exposition format."""
+
+    def __init__(self, labels: Optional[Dict[str, Any]] = None) -> None:
+        self._lines: List[str] = []
+        # Added to every sample
+        self._labels = labels or {}
+
+    def metric(self, name: str, kind: str, help_: str) -> None:
+        self._lines.append(f"# HELP {name} {help_}")
+        self._lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name: str, value: Any, labels: Optional[Dict[str, Any]] = None) -> None:
+        self._lines.append(f"{name}{_labels({**self._labels, **(labels or {})})} {_value(value)}")
+
+    def histogram(
+        self, name: str, histogram: Histogram, labels: Optional[Dict[str, Any]] = None
+    ) -> None:
+        cumulative, count, sum_ = histogram.snapshot()
+        labels = labels or {}
+        for bound, bucket_count in zip(histogram.buckets, cumulative):
+            self.sample(f"{name}_bucket", bucket_count, {**labels, "le": bound})
+        self.sample(f"{name}_bucket", count, {**labels, "le": "+Inf"})
+        self.sample(f"{name}_count", count, labels)
+        self.sample(f"{name}_sum", sum_, labels)
+
+    def render(self) -> str:
+        return "\n".join(self._lines) + "\n"
@@ -25,6 +25,7 @@ from .cgw import CGW
 from .city import City
 from .country import Country
 from .edge import EdgeNode
+from .edge_outbox import EdgeOutbox
 from .edge_rsu import EdgeNodeRSU
 from .intersection import Intersection
 from .lidar import Lidar
@@ -0,0 +1,36 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+from sqlalchemy import Column, Integer, String
+
+from dandelion.db.base_class import Base, DandelionBase
+
+
+class EdgeOutbox(Base, DandelionBase):
+    """
+    RSU change of an edge node still to be reported to the center. Rows are
+    written in the transaction of the change and removed once published.
+    """
+
+    __tablename__ = "edge_outbox"
+
+    kind = Column(String(16), nullable=False, comment="upsert, delete or sync")
+    rsu_id = Column(Integer, nullable=True, index=True)
+    rsu_esn = Column(String(64), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<EdgeOutbox(id='{self.id}', kind='{self.kind}', rsuId='{self.rsu_id}')>"
@@ -23,7 +23,6 @@ from typing import Any
 import paho.mqtt.client as mqtt
 from oslo_config import cfg
 from oslo_log import log
-from sqlalchemy.orm import Session
 
 from dandelion import conf, crud
 from dandelion.mqtt.service.cloud.edge_info_ack import EdgeInfoACKRouterHandler
@@ -87,8 +86,8 @@ def _on_disconnect(client: mqtt.Client, userdata: Any, rc: int) -> None:
 def connect() -> None:
     from dandelion.db import session
 
-    db: Session = session.DB_SESSION_LOCAL()
-    config = crud.system_config.get(db, 1)
+    with session.session_scope() as db:
+        config = crud.system_config.get(db, 1)
     if config:
         global EDGE_NAME
         EDGE_NAME = config.name
@@ -0,0 +1,188 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import queue
+import re
+import threading
+import time
+import zlib
+from logging import LoggerAdapter
+from typing import Any, Callable, Dict, List, Optional
+
+import paho.mqtt.client as mqtt
+from oslo_config import cfg
+from oslo_log import log
+
+from dandelion import conf
+
+LOG: LoggerAdapter = log.getLogger(__name__)
+CONF: cfg = conf.CONF
+
+DEFAULT_FAMILY = "rsu"
+DISPATCHERS: Dict[str, Dispatcher] = {}
+_DISPATCHERS_LOCK = threading.Lock()
+
+_RSU_ESN_PATTERN = re.compile(rb'"rsuEsn"\s*:\s*"([^"]*)"')
+_EDGE_ID_PATTERN = re.compile(rb'"id"\s*:\s*(\d+)')
+
+Callback = Callable[[mqtt.Client, Any, mqtt.MQTTMessage], None]
+
+
+def ordering_key(msg: mqtt.MQTTMessage) -> str:
+    """
+    Messages with the same key are handled in order by the same worker.
+    RSU specific topics carry the ESN as third level, e.g. V2X/RSU/{esn}/MAP/UP,
+    the others carry it as `rsuEsn` in the payload. Edge topics are keyed by the
+    edge node `id`, keeping the RSU syncs of a node in order.
+    """
+    levels = msg.topic.split("/")
+    if len(levels) > 4 and levels[0] == "V2X" and levels[1] == "RSU":
+        return levels[2]
+    if levels[:2] == ["V2X", "EDGE"]:
+        match = _EDGE_ID_PATTERN.search(msg.payload)
+        if match:
+            return f"EDGE{match.group(1).decode('utf-8')}"
+    match = _RSU_ESN_PATTERN.search(msg.payload)
+    if match:
+        return match.group(1).decode("utf-8", "replace")
+    return msg.topic
+
+
+class Dispatcher(object):
+    def __init__(self, family: str, *, workers: int, queue_size: int, block_timeout: float):
+        """
+        Worker threads of one topic family, each with its own bounded queue.
+        A message is routed to a worker by its ordering key.
+        """
+        self.family = family
+        self.block_timeout = block_timeout
+        self._queues: List[queue.Queue] = [
+            queue.Queue(maxsize=queue_size) for _ in range(max(workers, 1))
+        ]
+        self._threads: List[threading.Thread] = [
+            threading.Thread(
+                target=self._run, args=(queue_,), name=f"mqtt-{family}-{i}", daemon=True
+            )
+            for i, queue_ in enumerate(self._queues)
+        ]
+        self._lock = threading.Lock()
+
+        self.submitted = 0
+        self.blocked = 0
+        self.dropped = 0
+        self.processed = 0
+        self.max_wait_seconds = 0.0
+        self.max_handle_seconds = 0.0
+
+    def start(self) -> None:
+        for thread in self._threads:
+            thread.start()
+        LOG.info(f"MQTT dispatcher [{self.family}] started with {len(self._threads)} workers")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        for queue_ in self._queues:
+            queue_.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        LOG.info(f"MQTT dispatcher [{self.family}] stopped: {self.stats()}")
+
+    def submit(self, key: str, func: Callback, *args: Any) -> bool:
+        queue_ = self._queues[zlib.crc32(key.encode("utf-8")) % len(self._queues)]
+        item = (time.monotonic(), func, args)
+        try:
+            queue_.put_nowait(item)
+        except queue.Full:
+            self.blocked += 1
+            try:
+                queue_.put(item, timeout=self.block_timeout)
+            except queue.Full:
+                self.dropped += 1
+                LOG.warn(f"MQTT dispatcher [{self.family}] queue is full, message dropped")
+                return False
+        self.submitted += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(
+            family=self.family,
+            workers=len(self._threads),
+            queueDepth=[queue_.qsize() for queue_ in self._queues],
+            submitted=self.submitted,
+            blocked=self.blocked,
+            dropped=self.dropped,
+            processed=self.processed,
+            maxWaitSeconds=self.max_wait_seconds,
+            maxHandleSeconds=self.max_handle_seconds,
+        )
+
+    def _run(self, queue_: queue.Queue) -> None:
+        while True:
+            item = queue_.get()
+            if item is None:
+                break
+            enqueue_time, func, args = item
+            start_time = time.monotonic()
+            try:
+                func(*args)
+            except Exception as ex:
+                LOG.error(f"MQTT dispatcher [{self.family}] handler failed: {ex}")
+            end_time = time.monotonic()
+            with self._lock:
+                self.processed += 1
+                self.max_wait_seconds = max(self.max_wait_seconds, start_time - enqueue_time)
+                self.max_handle_seconds = max(self.max_handle_seconds, end_time - start_time)
+
+
+def setup() -> None:
+    ingest_conf = CONF.ingest
+    if ingest_conf.dispatch_mode != "thread":
+        return
+    with _DISPATCHERS_LOCK:
+        if DISPATCHERS:
+            return
+        for family, workers in ingest_conf.dispatch_workers.items():
+            dispatcher = Dispatcher(
+                family,
+                workers=int(workers),
+                queue_size=ingest_conf.dispatch_queue_size,
+                block_timeout=ingest_conf.dispatch_block_timeout,
+            )
+            dispatcher.start()
+            DISPATCHERS[family] = dispatcher
+
+
+def callback(family: str, func: Callback) -> Callback:
+    """Wrap a message callback so it runs on the workers of `family`."""
+    if family not in DISPATCHERS and DEFAULT_FAMILY not in DISPATCHERS:
+        return func
+    dispatcher = DISPATCHERS.get(family) or DISPATCHERS[DEFAULT_FAMILY]
+
+    def _dispatch(client: mqtt.Client, userdata: Any, msg: mqtt.MQTTMessage) -> None:
+        dispatcher.submit(ordering_key(msg), func, client, userdata, msg)
+
+    return _dispatch
+
+
+def get_stats() -> List[Dict[str, Any]]:
+    return [dispatcher.stats() for dispatcher in DISPATCHERS.values()]
+
+
+def stop_all(timeout: Optional[float] = None) -> None:
+    with _DISPATCHERS_LOCK:
+        for dispatcher in DISPATCHERS.values():
+            dispatcher.stop(timeout)
+        DISPATCHERS.clear()
@@ -0,0 +1,210 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from logging import LoggerAdapter
+from typing import Any, Dict, List, Optional, Tuple
+
+from oslo_config import cfg
+from oslo_log import log
+from sqlalchemy.orm import Session
+
+from dandelion import crud, models, scheduler
+from dandelion.crud import crud_edge_outbox
+from dandelion.db import session
+from dandelion.mqtt import cloud_server
+from dandelion.mqtt.topic import v2x_edge
+
+LOG: LoggerAdapter = log.getLogger(__name__)
+CONF: cfg = cfg.CONF
+
+DRAINER: Optional[OutboxDrainer] = None
+_DRAINER_LOCK = threading.Lock()
+
+
+def _rsu_payload(rsu: models.RSU) -> Dict[str, Any]:
+    return dict(
+        name=rsu.rsu_name,
+        esn=rsu.rsu_esn,
+        intersectionCode=rsu.intersection_code,
+        location=rsu.location,
+        edge_rsu_id=rsu.id,
+    )
+
+
+def build_message(
+    db: Session,
+    edge_id: int,
+    rows: List[models.EdgeOutbox],
+    since_version: Optional[int],
+    version: int,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Coalesce pending rows into one publish bringing the center to `version`.
+    A delta only applies on top of `since_version`, without one, or with a full
+    sync pending, the whole inventory is sent.
+    """
+    if since_version is None or any(row.kind == crud_edge_outbox.SYNC for row in rows):
+        _, rsus = crud.rsu.get_multi_with_total(db, limit=-1, is_default=False)
+        return v2x_edge.V2X_EDGE_RSU_UP, dict(
+            id=edge_id, version=version, rsus=[_rsu_payload(rsu) for rsu in rsus]
+        )
+
+    rsu_ids = [row.rsu_id for row in rows if row.kind == crud_edge_outbox.UPSERT]
+    # RSUs deleted since have a pending delete instead
+    rsus = (
+        db.query(models.RSU)
+        .filter(models.RSU.id.in_(rsu_ids), models.RSU.is_default.is_(False))
+        .all()
+        if rsu_ids
+        else []
+    )
+    return v2x_edge.V2X_EDGE_RSU_DELTA_UP, dict(
+        id=edge_id,
+        sinceVersion=since_version,
+        version=version,
+        rsus=[_rsu_payload(rsu) for rsu in rsus],
+        removedEsns=[row.rsu_esn for row in rows if row.kind == crud_edge_outbox.DELETE],
+    )
+
+
+class OutboxDrainer(object):
+    def __init__(
+        self, *, batch_size: int, poll_interval: float, publish_timeout: float, debounce: float
+    ):
+        """
+        Background thread publishing the pending edge outbox rows to the center,
+        in the scheduler leader only.
+        It looks at the outbox every `poll_interval` seconds, or `debounce` seconds
+        after being woken up so that bursts of changes go out together, and removes
+        the rows once the broker acknowledged their publish.
+        """
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.publish_timeout = publish_timeout
+        self.debounce = debounce
+        # Inventory version the center was last brought to by this process
+        self.version: Optional[int] = None
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.drained = 0
+        self.published = 0
+        self.failed = 0
+        self.last_drain_seconds = 0.0
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="edge-outbox", daemon=True)
+        self._thread.start()
+        LOG.info("Edge outbox drainer started")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        LOG.info(f"Edge outbox drainer stopped: {self.stats()}")
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(
+            version=self.version,
+            drained=self.drained,
+            published=self.published,
+            failed=self.failed,
+            lastDrainSeconds=self.last_drain_seconds,
+        )
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            if self._wakeup.wait(self.poll_interval):
+                self._stopped.wait(self.debounce)
+            self._wakeup.clear()
+            try:
+                # Keep going while full batches come out
+                while self.drain() == self.batch_size and not self._stopped.is_set():
+                    pass
+            except Exception as ex:
+                self.failed += 1
+                LOG.error(f"Failed to drain the edge outbox: {ex}")
+
+    def drain(self) -> int:
+        client = cloud_server.MQTT_CLIENT
+        edge_id = cloud_server.get_edge_id()
+        # Nothing can be published before the center acknowledged this edge node
+        if client is None or not edge_id:
+            return 0
+        # The deltas chain on the version this process last published, only
+        # the scheduler leader drains so that one chain reaches the center.
+        if scheduler.LEADER is not None and not scheduler.LEADER.check_leader():
+            # Another leader may publish meanwhile, resume with a full sync
+            self.version = None
+            return 0
+        start_time = time.monotonic()
+        with session.session_scope() as db:
+            rows = crud.edge_outbox.get_pending(db, limit=self.batch_size)
+            if not rows:
+                return 0
+            # Milliseconds, so versions keep growing across restarts of the edge node
+            version = max(int(time.time() * 1000), (self.version or 0) + 1)
+            topic, payload = build_message(db, edge_id, rows, self.version, version)
+            ids = [row.id for row in rows]
+        # No transaction is open while waiting for the broker, RSU changes
+        # staging rows meanwhile never wait on the center.
+        info = client.publish(topic=topic, payload=json.dumps(payload), qos=1)
+        info.wait_for_publish(self.publish_timeout)
+        if not info.is_published():
+            # The center may or may not get it, the next publish has to be a full sync
+            self.version = None
+            raise SystemError(f"Publish to {topic} was not acknowledged")
+        self.published += 1
+        with session.session_scope() as db:
+            crud.edge_outbox.remove_by_ids(db, ids=ids)
+        self.version = version
+        self.drained += len(ids)
+        self.last_drain_seconds = time.monotonic() - start_time
+        return len(ids)
+
+
+def get_drainer() -> OutboxDrainer:
+    global DRAINER
+    if DRAINER is None:
+        with _DRAINER_LOCK:
+            if DRAINER is None:
+                DRAINER = OutboxDrainer(
+                    batch_size=CONF.outbox.batch_size,
+                    poll_interval=CONF.outbox.poll_interval,
+                    publish_timeout=CONF.outbox.publish_timeout,
+                    debounce=CONF.outbox.debounce,
+                )
+    return DRAINER
+
+
+def wake() -> None:
+    if DRAINER is not None:
+        DRAINER.wake()
+
+
+def get_stats() -> Optional[Dict[str, Any]]:
+    return DRAINER.stats() if DRAINER is not None else None
@@ -16,13 +16,14 @@ from __future__ import annotations
 
 import uuid
 from logging import LoggerAdapter
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import paho.mqtt.client as mqtt
 from oslo_config import cfg
 from oslo_log import log
 
 from dandelion import conf
+from dandelion.mqtt import dispatcher
 from dandelion.mqtt.service import RouterHandler
 from dandelion.mqtt.service.algorithm.cgw import CGWRouterHandler
 from dandelion.mqtt.service.algorithm.osw import OSWRouterHandler
@@ -40,6 +41,7 @@ from dandelion.mqtt.service.cloud.edge_info import EdgeInfoRouterHandler
 from dandelion.mqtt.service.cloud.edge_rsu import EdgeRSURouterHandler
 from dandelion.mqtt.service.cloud.edge_rsu_add import EdgeRSUAddRouterHandler
 from dandelion.mqtt.service.cloud.edge_rsu_delete import EdgeRSUDeleteRouterHandler
+from dandelion.mqtt.service.cloud.edge_rsu_delta import EdgeRSUDeltaRouterHandler
 from dandelion.mqtt.service.cloud.edge_rsu_location import EdgeRSULocationRouterHandler
 from dandelion.mqtt.service.map.map_up import MapRouterHandler
 from dandelion.mqtt.service.query.rsu_query_up import RSUQueryUPRouterHandler
@@ -75,6 +77,21 @@ topic_router: Dict[str, RouterHandler] = {
     v2x_rsu.V2X_RSU_PLUS_OSW_DOWN: OSWRouterHandler(),
     v2x_rsu.V2X_RSU_PLUS_SSW_DOWN: SSWRouterHandler(),
 }
+# Topic family decides which dispatch workers handle the topic, topics not
+# listed here belong to the default "rsu" family.
+topic_family: Dict[str, str] = {
+    v2x_rsu.V2X_RSU_HB_UP: "heartbeat",
+    v2x_rsu.V2X_RSU_PLUS_RSM_DOWN: "algorithm",
+    v2x_rsu.V2X_RSU_PLUS_RSI_DOWN: "algorithm",
+    v2x_rsu.V2X_RSU_PLUS_DNP_DOWN: "algorithm",
+    v2x_rsu.V2X_RSU_PLUS_CWM_DOWN: "algorithm",
+    v2x_rsu.V2X_RSU_PLUS_CLC_DOWN: "algorithm",
+    v2x_rsu.V2X_RSU_PLUS_SDS_DOWN: "algorithm",
+    v2x_rsu.V2X_RSU_PLUS_CGW_DOWN: "algorithm",
+    v2x_rsu.V2X_RSU_PLUS_RDW_DOWN: "algorithm",
+    v2x_rsu.V2X_RSU_PLUS_OSW_DOWN: "algorithm",
+    v2x_rsu.V2X_RSU_PLUS_SSW_DOWN: "algorithm",
+}
 MQTT_CLIENT: mqtt.Client = None
 
 if mode_conf.mode in ["center", "coexist"]:
@@ -83,8 +100,17 @@ if mode_conf.mode in ["center", "coexist"]:
     topic_router[v2x_edge.V2X_EDGE_RSU_UP] = EdgeRSURouterHandler()
     topic_router[v2x_edge.V2X_EDGE_RSU_ADD_UP] = EdgeRSUAddRouterHandler()
     topic_router[v2x_edge.V2X_EDGE_RSU_DELETE_UP] = EdgeRSUDeleteRouterHandler()
+    topic_router[v2x_edge.V2X_EDGE_RSU_DELTA_UP] = EdgeRSUDeltaRouterHandler()
     topic_router[v2x_edge.V2X_EDGE_RSU_LOCATION_UP] = EdgeRSULocationRouterHandler()
     topic_router[v2x_edge.V2X_EDGE_DELETE_UP] = EdgeDeleteRouterHandler()
+    topic_family[v2x_edge.V2X_EDGE_INFO_UP] = "edge"
+    topic_family[v2x_edge.V2X_EDGE_HB_UP] = "heartbeat"
+    topic_family[v2x_edge.V2X_EDGE_RSU_UP] = "edge"
+    topic_family[v2x_edge.V2X_EDGE_RSU_ADD_UP] = "edge"
+    topic_family[v2x_edge.V2X_EDGE_RSU_DELETE_UP] = "edge"
+    topic_family[v2x_edge.V2X_EDGE_RSU_DELTA_UP] = "edge"
+    topic_family[v2x_edge.V2X_EDGE_RSU_LOCATION_UP] = "edge"
+    topic_family[v2x_edge.V2X_EDGE_DELETE_UP] = "edge"
 
 
 def get_mqtt_client() -> mqtt.Client:
@@ -94,6 +120,10 @@ def get_mqtt_client() -> mqtt.Client:
     return MQTT_CLIENT
 
 
+def shared_topic(topic: str, group: Optional[str]) -> str:
+    return f"$share/{group}/{topic}" if group else topic
+
+
 def _on_connect(client: mqtt.Client, userdata: Any, flags: Any, rc: int) -> None:
     if rc != 0:
         raise SystemError("MQTT Connection failed")
@@ -102,9 +132,21 @@ def _on_connect(client: mqtt.Client, userdata: Any, flags: Any, rc: int) -> None
     global MQTT_CLIENT
     MQTT_CLIENT = client
 
+    if not userdata["subscribe"]:
+        LOG.info("MQTT connected for publishing only, topics are not subscribed")
+        return
+
+    share_group = CONF.mqtt.shared_subscription_group
     for route in topic_router:
-        client.message_callback_add(route, topic_router[route].request)
-        client.subscribe(topic=route, qos=0)
+        family = topic_family.get(route, dispatcher.DEFAULT_FAMILY)
+        # Callbacks match the topic a message was published to, so they are
+        # added for the plain route even when subscribing to a shared group.
+        client.message_callback_add(
+            route, dispatcher.callback(family, topic_router[route].request)
+        )
+        client.subscribe(topic=shared_topic(route, share_group), qos=0)
+    if share_group:
+        LOG.info(f"MQTT subscribed with shared subscription group: {share_group}")
 
 
 def _on_message(client: mqtt.Client, userdata: Any, msg: mqtt.MQTTMessage) -> None:
@@ -115,13 +157,24 @@ def _on_disconnect(client: mqtt.Client, userdata: Any, rc: int) -> None:
     LOG.error(f"MQTT Connection disconnected, rc: {rc}")
 
 
-def connect() -> None:
+def connect(subscribe: bool = True) -> None:
     mqtt_conf = CONF.mqtt
+    if subscribe:
+        dispatcher.setup()
 
-    _client = mqtt.Client(client_id=uuid.uuid4().hex)
+    _client = mqtt.Client(client_id=uuid.uuid4().hex, userdata={"subscribe": subscribe})
     _client.username_pw_set(mqtt_conf.username, mqtt_conf.password)
     _client.on_connect = _on_connect
     _client.on_message = _on_message
     _client.on_disconnect = _on_disconnect
     _client.connect(mqtt_conf.host, mqtt_conf.port, 60)
     _client.loop_start()
+
+
+def disconnect() -> None:
+    global MQTT_CLIENT
+    if MQTT_CLIENT is None:
+        return
+    MQTT_CLIENT.disconnect()
+    MQTT_CLIENT.loop_stop()
+    MQTT_CLIENT = None
@@ -15,11 +15,16 @@
 from __future__ import annotations
 
 import json
+import time
 from logging import LoggerAdapter
 from typing import Any, Dict
 
 import paho.mqtt.client as mqtt
 from oslo_log import log
+from sqlalchemy.orm import Session
+
+from dandelion.db import session
+from dandelion.mqtt import topic_stats
 
 LOG: LoggerAdapter = log.getLogger(__name__)
 
@@ -28,14 +33,28 @@ class RouterHandler(object):
     def request(
         self, _client: mqtt.MQTT_CLIENT, _user_data: Dict[str, Any], _msg: mqtt.MQTTMessage
     ) -> None:
+        start = time.perf_counter()
+        topic_ = _msg.topic
+        stats = topic_stats.get(topic_)
+        stats.message()
         try:
-            topic_ = _msg.topic
             msg_ = _msg.payload.decode("utf-8")
             LOG.info(f"{topic_} => {msg_}")
             data_ = json.loads(msg_)
-            self.handler(_client, topic_, data_)
+        except ValueError as ex:
+            stats.decode_failure()
+            LOG.error(ex)
+            return
+        try:
+            with session.session_scope() as db:
+                self.handler(db, _client, topic_, data_)
         except Exception as ex:
+            stats.handler_failure()
             LOG.error(ex)
+        finally:
+            stats.latency.observe(time.perf_counter() - start)
 
-    def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
+    def handler(
+        self, db: Session, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]
+    ) -> None:
         """"""
@@ -15,25 +15,25 @@
 from __future__ import annotations
 
 from logging import LoggerAdapter
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 import paho.mqtt.client as mqtt
 from oslo_log import log
 from sqlalchemy.orm import Session
 
 from dandelion import crud, schemas
-from dandelion.db import session
 from dandelion.mqtt.service import RouterHandler
 
 LOG: LoggerAdapter = log.getLogger(__name__)
 
 
 class CGWRouterHandler(RouterHandler):
-    def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        db: Session = session.DB_SESSION_LOCAL()
-
+    def handler(
+        self, db: Session, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]
+    ) -> None:
         sensor_pos = data.get("sensorPos", {})
         contents = data.get("content", [])
+        cgws: List[schemas.CGWCreate] = []
         for content in contents:
             cgw = schemas.CGWCreate()
             cgw.sensor_pos = sensor_pos
@@ -46,5 +46,6 @@ class CGWRouterHandler(RouterHandler):
             cgw.end_point = lane_info.get("endPoint")
             cgw.sec_mark = sec_mark
 
-            crud.cgw.create(db=db, obj_in=cgw)
+            cgws.append(cgw)
+        crud.cgw.create_many(db, objs_in=cgws)
         LOG.info(f"{topic} => CGW created")
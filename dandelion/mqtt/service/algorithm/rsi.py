@@ -22,16 +22,15 @@ from oslo_log import log
 from sqlalchemy.orm import Session
 
 from dandelion import crud, schemas
-from dandelion.db import session
 from dandelion.mqtt.service import RouterHandler
 
 LOG: LoggerAdapter = log.getLogger(__name__)
 
 
 class RSIRouterHandler(RouterHandler):
-    def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        db: Session = session.DB_SESSION_LOCAL()
-
+    def handler(
+        self, db: Session, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]
+    ) -> None:
         rsis = data.get("rsiDatas")
         if not rsis:
             LOG.warn(f"{topic} => RSIs is None")
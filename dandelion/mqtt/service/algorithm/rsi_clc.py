@@ -22,16 +22,15 @@ from oslo_log import log
 from sqlalchemy.orm import Session
 
 from dandelion import crud, schemas
-from dandelion.db import session
 from dandelion.mqtt.service import RouterHandler
 
 LOG: LoggerAdapter = log.getLogger(__name__)
 
 
 class RSICLCRouterHandler(RouterHandler):
-    def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        db: Session = session.DB_SESSION_LOCAL()
-
+    def handler(
+        self, db: Session, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]
+    ) -> None:
         clc = schemas.RSICLCCreate()
         clc.msg_id = data.get("id")
         if not clc.msg_id:
@@ -45,5 +44,5 @@ class RSICLCRouterHandler(RouterHandler):
             clc.drive_suggestion = coordinates.get("driveSuggestion", {})
             clc.info = coordinates.get("info", 0)
 
-        crud.rsi_clc.create(db, obj_in=clc)
+        crud.rsi_clc.create_many(db, objs_in=[clc])
         LOG.info(f"{topic} => RSI CLC created")
@@ -15,23 +15,23 @@
 from __future__ import annotations
 
 from logging import LoggerAdapter
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 import paho.mqtt.client as mqtt
 from oslo_log import log
 from sqlalchemy.orm import Session
 
 from dandelion import crud, schemas
-from dandelion.db import session
 from dandelion.mqtt.service import RouterHandler
 
 LOG: LoggerAdapter = log.getLogger(__name__)
 
 
 class RSICWMRouterHandler(RouterHandler):
-    def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        db: Session = session.DB_SESSION_LOCAL()
-
+    def handler(
+        self, db: Session, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]
+    ) -> None:
+        cwms: List[schemas.RSICWMCreate] = []
         for content in data.get("content", []):
             cwm = schemas.RSICWMCreate()
             cwm.sensor_pos = data.get("sensorPos", {})
@@ -57,6 +57,7 @@ class RSICWMRouterHandler(RouterHandler):
             cwm.other_width = other.get("size", {}).get("width", 0.0)
             cwm.other_kinematics_info = other.get("kinematicsInfo", {})
 
-            crud.rsi_cwm.create(db, obj_in=cwm)
+            cwms.append(cwm)
+        crud.rsi_cwm.create_many(db, objs_in=cwms)
 
         LOG.info(f"{topic} => RSI CWM created")
@@ -22,16 +22,15 @@ from oslo_log import log
 from sqlalchemy.orm import Session
 
 from dandelion import crud, schemas
-from dandelion.db import session
 from dandelion.mqtt.service import RouterHandler
 
 LOG: LoggerAdapter = log.getLogger(__name__)
 
 
 class RSIDNPRouterHandler(RouterHandler):
-    def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        db: Session = session.DB_SESSION_LOCAL()
-
+    def handler(
+        self, db: Session, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]
+    ) -> None:
         dnp = schemas.RSIDNPCreate()
 
         dnp.msg_id = data.get("id")
@@ -47,5 +46,5 @@ class RSIDNPRouterHandler(RouterHandler):
             dnp.path_guidance = coordinates.get("pathGuidance", [])
             dnp.info = coordinates.get("info", 0)
 
-        crud.rsi_dnp.create(db, obj_in=dnp)
+        crud.rsi_dnp.create_many(db, objs_in=[dnp])
         LOG.info(f"{topic} => RSI DNP created")
@@ -22,16 +22,15 @@ from oslo_log import log
 from sqlalchemy.orm import Session
 
 from dandelion import crud, schemas
-from dandelion.db import session
 from dandelion.mqtt.service import RouterHandler
 
 LOG: LoggerAdapter = log.getLogger(__name__)
 
 
 class RSISDSRouterHandler(RouterHandler):
-    def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        db: Session = session.DB_SESSION_LOCAL()
-
+    def handler(
+        self, db: Session, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]
+    ) -> None:
         sds = schemas.RSISDSCreate()
 
         sds.msg_id = data.get("id")
@@ -43,5 +42,5 @@ class RSISDSRouterHandler(RouterHandler):
         sds.sensor_pos = data.get("sensorPos", {})
         sds.ego_id = data.get("egoId", "0")
         sds.ego_pos = data.get("egoPos", {})
-        crud.rsi_sds.create(db, obj_in=sds)
+        crud.rsi_sds.create_many(db, objs_in=[sds])
         LOG.info(f"{topic} => RSI SDS created")
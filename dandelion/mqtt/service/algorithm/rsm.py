@@ -14,46 +14,85 @@
 
 from __future__ import annotations
 
+import threading
 from logging import LoggerAdapter
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import paho.mqtt.client as mqtt
+from oslo_config import cfg
 from oslo_log import log
 from sqlalchemy.orm import Session
 
-from dandelion import crud, models, schemas
+from dandelion import conf, crud, models, schemas
 from dandelion.db import session
+from dandelion.db.write_behind import WriteBehindBuffer
 from dandelion.mqtt.service import RouterHandler
 from dandelion.util import Optional as Optional_util
 
 LOG: LoggerAdapter = log.getLogger(__name__)
+CONF: cfg = conf.CONF
 
+RSM_BUFFER: Optional[WriteBehindBuffer] = None
+_RSM_BUFFER_LOCK = threading.Lock()
 
-class RSMRouterHandler(RouterHandler):
-    def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        db: Session = session.DB_SESSION_LOCAL()
 
+def _flush_rsms(rsms: List[Dict[str, Any]]) -> None:
+    with session.session_scope() as db:
+        total = crud.rsm.create_rsm_bulk(db, rsms=rsms)
+    LOG.info(f"{len(rsms)} RSMs with {total} participants created")
+
+
+def get_rsm_buffer() -> WriteBehindBuffer:
+    global RSM_BUFFER
+    with _RSM_BUFFER_LOCK:
+        if RSM_BUFFER is None:
+            ingest_conf = CONF.ingest
+            RSM_BUFFER = WriteBehindBuffer(
+                "rsm",
+                _flush_rsms,
+                batch_size=ingest_conf.rsm_batch_size,
+                flush_interval=ingest_conf.rsm_flush_interval,
+                queue_size=ingest_conf.rsm_queue_size,
+            )
+        return RSM_BUFFER
+
+
+class RSMRouterHandler(RouterHandler):
+    def handler(
+        self, db: Session, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]
+    ) -> None:
         rsms = Optional_util.none(data.get("content")).map(lambda v: v.get("rsms")).get()
         for rsm_ in rsms:
-            rsm = schemas.RSMCreate()
-            rsm.ref_pos = rsm_.get("refPos")
-
             ps = rsm_.get("participants")
             if not ps:
                 LOG.info(f"{topic} => RSM has no participants")
                 return None
-            participants: List[models.Participants] = []
+            participants: List[Dict[str, Any]] = []
             for p_ in ps:
-                p = models.Participants()
-                p.ptc_id = p_.get("ptcId")
-                p.ptc_type = p_.get("ptcType")
-                p.source = p_.get("source")
-                p.sec_mark = p_.get("secMark")
-                p.pos = p_.get("pos")
-                p.accuracy = p_.get("accuracy")
-                p.speed = p_.get("speed")
-                p.heading = p_.get("heading")
-                p.size = p_.get("size", {})
-                participants.append(p)
-            crud.rsm.create_rsm(db, obj_in=rsm, participants=participants)
-            LOG.info(f"{topic} => RSM created")
+                participants.append(
+                    dict(
+                        ptc_id=p_.get("ptcId"),
+                        ptc_type=p_.get("ptcType"),
+                        source=p_.get("source"),
+                        sec_mark=p_.get("secMark"),
+                        pos=p_.get("pos"),
+                        accuracy=p_.get("accuracy"),
+                        speed=p_.get("speed"),
+                        heading=p_.get("heading"),
+                        size=p_.get("size", {}),
+                    )
+                )
+            if CONF.ingest.rsm_write_behind:
+                get_rsm_buffer().put(dict(ref_pos=rsm_.get("refPos"), participants=participants))
+                LOG.debug(f"{topic} => RSM buffered")
+            else:
+                self._create_rsm(db, rsm_.get("refPos"), participants)
+                LOG.info(f"{topic} => RSM created")
+
+    @staticmethod
+    def _create_rsm(db: Session, ref_pos: Any, participants: List[Dict[str, Any]]) -> None:
+        rsm = schemas.RSMCreate()
+        rsm.ref_pos = ref_pos
+        crud.rsm.create_rsm(
+            db, obj_in=rsm, participants=[models.Participants(**p) for p in participants]
+        )
@@ -15,25 +15,25 @@
 from __future__ import annotations
 
 from logging import LoggerAdapter
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 import paho.mqtt.client as mqtt
 from oslo_log import log
 from sqlalchemy.orm import Session
 
 from dandelion import crud, schemas
-from dandelion.db import session
 from dandelion.mqtt.service import RouterHandler
 
 LOG: LoggerAdapter = log.getLogger(__name__)
 
 
 class SSWRouterHandler(RouterHandler):
-    def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        db: Session = session.DB_SESSION_LOCAL()
-
+    def handler(
+        self, db: Session, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]
+    ) -> None:
         sensor_pos = data.get("sensorPos", {})
         contents = data.get("content", [])
+        ssws: List[schemas.SSWCreate] = []
         for content in contents:
             ssw = schemas.SSWCreate()
             sec_mark = content.get("secMark")
@@ -48,5 +48,6 @@ class SSWRouterHandler(RouterHandler):
             ssw.height = ego_info.get("height")
             ssw.sec_mark = sec_mark
 
-            crud.ssw.create(db=db, obj_in=ssw)
+            ssws.append(ssw)
+        crud.ssw.create_many(db, objs_in=ssws)
         LOG.info(f"{topic} => SSW created")
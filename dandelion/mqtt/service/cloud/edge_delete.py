@@ -23,15 +23,16 @@ from oslo_log import log
 from sqlalchemy.orm import Session
 
 from dandelion import crud
-from dandelion.db import redis_pool, session
+from dandelion.db import redis_pool
 from dandelion.mqtt.service import RouterHandler
 
 LOG: LoggerAdapter = log.getLogger(__name__)
 
 
 class EdgeDeleteRouterHandler(RouterHandler):
-    def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        db: Session = session.DB_SESSION_LOCAL()
+    def handler(
+        self, db: Session, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]
+    ) -> None:
         redis_conn: redis.Redis = redis_pool.REDIS_CONN
         edge_id: int = data.get("edge_id", 0)
         redis_conn.delete(f"EDGE_ONLINE_{edge_id}")
@@ -20,6 +20,7 @@ from typing import Any, Dict
 
 import paho.mqtt.client as mqtt
 from oslo_log import log
+from sqlalchemy.orm import Session
 
 from dandelion.mqtt.service import RouterHandler
 from dandelion.mqtt.topic.v2x_edge import edge_forward
@@ -28,7 +29,9 @@ LOG: LoggerAdapter = log.getLogger(__name__)
 
 
 class EdgeForwardRouterHandler(RouterHandler):
-    def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
+    def handler(
+        self, db: Session, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]
+    ) -> None:
         from dandelion.mqtt.cloud_server import get_edge_id
 
         edge_id = get_edge_id()
@@ -20,6 +20,7 @@ from typing import Any, Dict
 import paho.mqtt.client as mqtt
 import redis
 from oslo_log import log
+from sqlalchemy.orm import Session
 
 from dandelion.db import redis_pool
 from dandelion.mqtt.service import RouterHandler
@@ -28,7 +29,9 @@ LOG: LoggerAdapter = log.getLogger(__name__)
 
 
 class EdgeHBRouterHandler(RouterHandler):
-    def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
+    def handler(
+        self, db: Session, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]
+    ) -> None:
         redis_conn: redis.Redis = redis_pool.REDIS_CONN
         redis_conn.set(f"EDGE_ONLINE_{data.get('id')}", 1, ex=30)
         LOG.info(f"{topic} => Edge HB")
@@ -23,7 +23,6 @@ from oslo_log import log
 from sqlalchemy.orm import Session
 
 from dandelion import crud, schemas
-from dandelion.db import session
 from dandelion.mqtt.service import RouterHandler
 from dandelion.mqtt.topic.v2x_edge import v2x_edge_key_info_up_ack
 
@@ -31,8 +30,9 @@ LOG: LoggerAdapter = log.getLogger(__name__)
 
 
 class EdgeInfoRouterHandler(RouterHandler):
-    def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        db: Session = session.DB_SESSION_LOCAL()
+    def handler(
+        self, db: Session, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]
+    ) -> None:
         name = data.get("name")
         if name:
             edge_node = crud.edge_node.get_by_name(db, name)
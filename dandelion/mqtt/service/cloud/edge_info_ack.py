@@ -24,23 +24,32 @@ from sqlalchemy.orm import Session
 
 from dandelion import crud
 from dandelion.crud import utils as db_util
-from dandelion.db import session
 from dandelion.mqtt.server import get_mqtt_client
 from dandelion.mqtt.service import RouterHandler
+from dandelion.mqtt.service.cloud.edge_rsu_sync import EdgeRSUSyncRouterHandler
 from dandelion.mqtt.topic.v2x_config import V2X_CONFIG_UPDATE_NOTICE
+from dandelion.mqtt.topic.v2x_edge import v2x_edge_rsu_sync_down
 
 LOG: LoggerAdapter = log.getLogger(__name__)
 
 
 class EdgeInfoACKRouterHandler(RouterHandler):
-    def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
+    def handler(
+        self, db: Session, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]
+    ) -> None:
+        from dandelion.mqtt import outbox
         from dandelion.mqtt.cloud_server import set_edge_id
 
         node_id = int(data.get("id", 0))
         set_edge_id(node_id)
-        db: Session = session.DB_SESSION_LOCAL()
         crud.system_config.update_node_id(db, _id=1, node_id=node_id)
 
+        # The center asks for a full RSU sync when it missed a delta
+        sync_topic = v2x_edge_rsu_sync_down(node_id)
+        client.message_callback_add(sync_topic, EdgeRSUSyncRouterHandler().request)
+        client.subscribe(topic=sync_topic, qos=1)
+
         # Notification cerebrum
         get_mqtt_client().publish(topic=V2X_CONFIG_UPDATE_NOTICE, payload=json.dumps({}), qos=0)
         db_util.refresh_cloud_rsu(db)
+        outbox.wake()
@@ -21,34 +21,43 @@ import paho.mqtt.client as mqtt
 from oslo_log import log
 from sqlalchemy.orm import Session
 
-from dandelion import crud, schemas
-from dandelion.db import session
+from dandelion import crud
 from dandelion.mqtt.service import RouterHandler
 
 LOG: LoggerAdapter = log.getLogger(__name__)
 
 
+def rsu_values(node_rsu: Dict[str, Any]) -> Dict[str, Any]:
+    """Column values of the `edge_node_rsu` row of an RSU reported by an edge node."""
+    location = node_rsu.get("location") or {}
+    if location:
+        location = dict(
+            lat=float(location.get("lat", 39.91)), lon=float(location.get("lon", 116.40))
+        )
+    return dict(
+        edge_rsu_id=node_rsu.get("edge_rsu_id"),
+        name=node_rsu.get("name", ""),
+        esn=node_rsu.get("esn", ""),
+        intersection_code=node_rsu.get("intersectionCode", ""),
+        location=location,
+    )
+
+
 class EdgeRSURouterHandler(RouterHandler):
-    def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        LOG.info(f"{topic} => Edge RSU sync {data}")
-        db: Session = session.DB_SESSION_LOCAL()
-        id = data.get("id")
-        if id:
-            crud.edge_node_rsu.remove_by_node_id(db, edge_node_id=id)
-            node_rsus = data.get("rsus")
-            if node_rsus:
-                for node_rsu in node_rsus:
-                    edge_node_rsu = schemas.EdgeNodeRSUCreate()
-                    edge_node_rsu.edge_node_id = id
-                    edge_node_rsu.name = node_rsu.get("name", "")
-                    edge_node_rsu.esn = node_rsu.get("esn", "")
-                    edge_node_rsu.intersection_code = node_rsu.get("intersectionCode", "")
-                    edge_node_rsu.edge_rsu_id = node_rsu.get("edge_rsu_id")
-                    location = node_rsu.get("location", {})
-                    if location:
-                        edge_node_rsu.location = schemas.Location()
-                        edge_node_rsu.location.lon = location.get("lon", 116.40)
-                        edge_node_rsu.location.lat = location.get("lat", 39.91)
-                    _ = crud.edge_node_rsu.create(db, obj_in=edge_node_rsu)
-
-        LOG.info(f"{topic} => Edge RSU synced")
+    def handler(
+        self, db: Session, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]
+    ) -> None:
+        LOG.info(f"{topic} => Edge RSU sync {data.get('id')}")
+        id_ = data.get("id")
+        if id_:
+            version = data.get("version")
+            if version is not None:
+                edge_node = crud.edge_node.get(db, id_)
+                if edge_node is not None:
+                    # Committed along with the RSUs
+                    edge_node.rsu_version = version
+            node_rsus = data.get("rsus") or []
+            result = crud.edge_node_rsu.sync(
+                db, edge_node_id=id_, rsus=[rsu_values(rsu) for rsu in node_rsus], replace=True
+            )
+            LOG.info(f"{topic} => Edge RSU synced, version: {version}, {result}")
@@ -22,30 +22,42 @@ from oslo_log import log
 from sqlalchemy.orm import Session
 
 from dandelion import crud, schemas
-from dandelion.db import session
 from dandelion.mqtt.service import RouterHandler
 
 LOG: LoggerAdapter = log.getLogger(__name__)
 
 
 class EdgeRSUAddRouterHandler(RouterHandler):
-    def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
+    def handler(
+        self, db: Session, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]
+    ) -> None:
         LOG.info(f"{topic} => Edge RSU add {data}")
-        db: Session = session.DB_SESSION_LOCAL()
         id_ = data.get("id")
         if id_ is not None:
-            node_rsu = data.get("rsu")
-            if node_rsu is not None:
-                edge_node_rsu = schemas.EdgeNodeRSUCreate()
-                edge_node_rsu.edge_node_id = id_
-                edge_node_rsu.name = node_rsu.get("name", "")
-                edge_node_rsu.esn = node_rsu.get("esn", "")
-                edge_node_rsu.intersection_code = node_rsu.get("intersectionCode", "")
-                edge_node_rsu.edge_rsu_id = node_rsu.get("edge_rsu_id")
-                location = node_rsu.get("location", {})
-                if location is not None:
-                    edge_node_rsu.location = schemas.Location()
-                    edge_node_rsu.location.lon = location.get("lon", 116.40)
-                    edge_node_rsu.location.lat = location.get("lat", 39.91)
-                _ = crud.edge_node_rsu.create(db, obj_in=edge_node_rsu)
+            # Batched by the edge outbox, single RSU from older edge nodes
+            node_rsus = data.get("rsus") or [data.get("rsu")]
+            for node_rsu in node_rsus:
+                if node_rsu is not None:
+                    self._upsert(db, id_, node_rsu)
             LOG.info(f"{topic} => Edge RSU added")
+
+    @staticmethod
+    def _upsert(db: Session, id_: int, node_rsu: Any) -> None:
+        edge_node_rsu = schemas.EdgeNodeRSUCreate()
+        edge_node_rsu.edge_node_id = id_
+        edge_node_rsu.name = node_rsu.get("name", "")
+        edge_node_rsu.esn = node_rsu.get("esn", "")
+        edge_node_rsu.intersection_code = node_rsu.get("intersectionCode", "")
+        edge_node_rsu.edge_rsu_id = node_rsu.get("edge_rsu_id")
+        location = node_rsu.get("location", {})
+        if location is not None:
+            edge_node_rsu.location = schemas.Location()
+            edge_node_rsu.location.lon = location.get("lon", 116.40)
+            edge_node_rsu.location.lat = location.get("lat", 39.91)
+        node_rsu_in_db = crud.edge_node_rsu.get_by_node_id_rsu(
+            db, edge_node_id=id_, edge_rsu_id=edge_node_rsu.edge_rsu_id
+        )
+        if node_rsu_in_db is not None:
+            crud.edge_node_rsu.update(db, db_obj=node_rsu_in_db, obj_in=edge_node_rsu.dict())
+        else:
+            crud.edge_node_rsu.create(db, obj_in=edge_node_rsu)
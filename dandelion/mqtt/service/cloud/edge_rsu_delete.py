@@ -22,18 +22,21 @@ from oslo_log import log
 from sqlalchemy.orm import Session
 
 from dandelion import crud
-from dandelion.db import session
 from dandelion.mqtt.service import RouterHandler
 
 LOG: LoggerAdapter = log.getLogger(__name__)
 
 
 class EdgeRSUDeleteRouterHandler(RouterHandler):
-    def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
+    def handler(
+        self, db: Session, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]
+    ) -> None:
         LOG.info(f"{topic} => Edge RSU sync {data}")
-        db: Session = session.DB_SESSION_LOCAL()
         id_ = data.get("id")
-        esn = data.get("rsuEsn")
-        if id_ is not None and esn is not None:
-            crud.edge_node_rsu.remove_by_node_id_esn(db, edge_node_id=id_, rsu_esn=esn)
+        # Batched by the edge outbox, single ESN from older edge nodes
+        esns = data.get("rsuEsns") or [data.get("rsuEsn")]
+        if id_ is not None:
+            for esn in esns:
+                if esn is not None:
+                    crud.edge_node_rsu.remove_by_node_id_esn(db, edge_node_id=id_, rsu_esn=esn)
             LOG.info(f"{topic} => Edge RSU updated")
@@ -0,0 +1,64 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import json
+from logging import LoggerAdapter
+from typing import Any, Dict
+
+import paho.mqtt.client as mqtt
+from oslo_log import log
+from sqlalchemy.orm import Session
+
+from dandelion import crud
+from dandelion.mqtt.service import RouterHandler
+from dandelion.mqtt.service.cloud.edge_rsu import rsu_values
+from dandelion.mqtt.topic.v2x_edge import v2x_edge_rsu_sync_down
+
+LOG: LoggerAdapter = log.getLogger(__name__)
+
+
+class EdgeRSUDeltaRouterHandler(RouterHandler):
+    def handler(
+        self, db: Session, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]
+    ) -> None:
+        id_ = data.get("id")
+        since_version = data.get("sinceVersion")
+        version = data.get("version")
+        LOG.info(f"{topic} => Edge RSU delta {id_}: {since_version} => {version}")
+        if not id_:
+            return None
+        edge_node = crud.edge_node.get(db, id_)
+        if edge_node is None:
+            LOG.warn(f"{topic} => Edge node [id: {id_}] not found")
+            return None
+        if edge_node.rsu_version != since_version:
+            # A delta got lost or arrived out of order, ask the edge node for everything
+            LOG.warn(
+                f"{topic} => Edge node [id: {id_}] is at RSU version {edge_node.rsu_version}, "
+                f"not {since_version}, requesting a full sync"
+            )
+            client.publish(topic=v2x_edge_rsu_sync_down(id_), payload=json.dumps({}), qos=1)
+            return None
+        # Committed along with the RSUs
+        edge_node.rsu_version = version
+        result = crud.edge_node_rsu.sync(
+            db,
+            edge_node_id=id_,
+            rsus=[rsu_values(rsu) for rsu in data.get("rsus") or []],
+            removed_esns=data.get("removedEsns") or [],
+        )
+        LOG.info(f"{topic} => Edge RSU delta applied, {result}")
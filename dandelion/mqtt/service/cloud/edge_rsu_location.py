@@ -22,16 +22,16 @@ from oslo_log import log
 from sqlalchemy.orm import Session
 
 from dandelion import crud, schemas
-from dandelion.db import session
 from dandelion.mqtt.service import RouterHandler
 
 LOG: LoggerAdapter = log.getLogger(__name__)
 
 
 class EdgeRSULocationRouterHandler(RouterHandler):
-    def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
+    def handler(
+        self, db: Session, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]
+    ) -> None:
         LOG.info(f"{topic} => Edge RSU sync {data}")
-        db: Session = session.DB_SESSION_LOCAL()
         id_ = data.get("id")
         esn = data.get("esn")
         location = data.get("location")
@@ -0,0 +1,39 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+from logging import LoggerAdapter
+from typing import Any, Dict
+
+import paho.mqtt.client as mqtt
+from oslo_log import log
+from sqlalchemy.orm import Session
+
+from dandelion.crud import utils as db_util
+from dandelion.mqtt.service import RouterHandler
+
+LOG: LoggerAdapter = log.getLogger(__name__)
+
+
+class EdgeRSUSyncRouterHandler(RouterHandler):
+    def handler(
+        self, db: Session, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]
+    ) -> None:
+        from dandelion.mqtt import outbox
+
+        LOG.info(f"{topic} => Center requested a full RSU sync")
+        db_util.refresh_cloud_rsu(db)
+        outbox.wake()
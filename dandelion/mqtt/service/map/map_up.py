@@ -23,19 +23,26 @@ from oslo_log import log
 from sqlalchemy.orm import Session
 
 from dandelion import crud
-from dandelion.db import session
+from dandelion.db import rsu_identity
 from dandelion.mqtt.service import RouterHandler
 
 LOG: LoggerAdapter = log.getLogger(__name__)
 
 
 class MapRouterHandler(RouterHandler):
-    def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        db: Session = session.DB_SESSION_LOCAL()
+    def handler(
+        self, db: Session, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]
+    ) -> None:
         rsu_esn = re.findall("V2X/RSU/(.*)/MAP/UP", topic)[0]
-        rsu = crud.rsu.get_by_rsu_esn(db, rsu_esn=rsu_esn)
-        rsu.intersection.map_data = data
-        db.add(rsu.intersection)
+        rsu = rsu_identity.get(db, rsu_esn)
+        intersection = (
+            crud.intersection.get_by_code(db, code=rsu.intersection_code) if rsu else None
+        )
+        if rsu is None or intersection is None:
+            LOG.info(f"{topic} => RSU [rsu_esn: {rsu_esn}] not found")
+            return None
+        intersection.map_data = data
+        db.add(intersection)
         db.commit()
-        db.refresh(rsu.intersection)
+        db.refresh(intersection)
         LOG.info(f"{topic} =>Intersection map [code: {rsu.intersection_code}] updated")
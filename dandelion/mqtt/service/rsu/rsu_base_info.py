@@ -22,14 +22,16 @@ from oslo_log import log
 from sqlalchemy.orm import Session
 
 from dandelion import crud, schemas
-from dandelion.db import session
+from dandelion.db import rsu_identity
 from dandelion.mqtt.service import RouterHandler
 
 LOG: LoggerAdapter = log.getLogger(__name__)
 
 
 class RSUBaseINFORouterHandler(RouterHandler):
-    def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
+    def handler(
+        self, db: Session, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]
+    ) -> None:
         esn = data.get("rsuEsn")
         if not esn:
             return
@@ -49,8 +51,8 @@ class RSUBaseINFORouterHandler(RouterHandler):
         base_info.software_version = data.get("SoftwareVersion")
         base_info.hardware_version = data.get("hardwareVersion")
         base_info.depart = data.get("depart")
-        db: Session = session.DB_SESSION_LOCAL()
-        rsu = crud.rsu.get_by_rsu_esn(db, rsu_esn=esn)
+        identity = rsu_identity.get(db, esn)
+        rsu = crud.rsu.get(db, id=identity.id) if identity else None
         if rsu:
             crud.rsu.update_with_base_info(db, db_obj=rsu, obj_in=base_info)
         LOG.info(f"{topic} => Processed RSU Base Info successfully")
@@ -23,7 +23,6 @@ from oslo_log import log
 from sqlalchemy.orm import Session
 
 from dandelion import crud
-from dandelion.db import session
 from dandelion.mqtt import server
 from dandelion.mqtt.service import RouterHandler
 from dandelion.mqtt.topic.v2x_rsu import V2X_RSU_CONFIG_DOWN, v2x_rsu_config_down
@@ -41,9 +40,9 @@ def config_down(data: Dict[str, Any], rsu_esn: Optional[str] = None) -> None:
 
 
 class RSUConfigDownACKRouterHandler(RouterHandler):
-    def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        db: Session = session.DB_SESSION_LOCAL()
-
+    def handler(
+        self, db: Session, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]
+    ) -> None:
         _id = int(data.get("seqNum", 0))
         if _id > 0:
             config_rsu = crud.rsu_config_rsu.get(db, id=_id)
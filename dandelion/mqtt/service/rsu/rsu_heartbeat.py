@@ -12,38 +12,70 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+
 from __future__ import annotations
 
+import time
 from logging import LoggerAdapter
 from typing import Any, Dict
 
 import paho.mqtt.client as mqtt
+from oslo_config import cfg
 from oslo_log import log
 from sqlalchemy.orm import Session
 
-from dandelion import crud, schemas
+from dandelion import conf, crud, schemas
 from dandelion.api.deps import get_redis_conn
-from dandelion.db import session
+from dandelion.db import rsu_identity
 from dandelion.mqtt.service import RouterHandler
 
 LOG: LoggerAdapter = log.getLogger(__name__)
+CONF: cfg = conf.CONF
+
+RSU_ONLINE_EXPIRE = 15
 
 
 class RSUHeartbeatRouterHandler(RouterHandler):
-    def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        db: Session = session.DB_SESSION_LOCAL()
+    def __init__(self):
+        # rsu_esn => time the online status was checked in database
+        self._checked: Dict[str, float] = {}
+
+    def handler(
+        self, db: Session, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]
+    ) -> None:
         redis_conn = get_redis_conn()
 
         rsu_esn = data.get("rsuEsn")
         if not rsu_esn:
             LOG.warn(f"{topic} => rsu_esn is None")
             return None
-        rsu = crud.rsu.get_by_rsu_esn(db, rsu_esn=rsu_esn)
+
+        # Unknown RSUs get no online flag, its expiry would wake the offline listener
+        identity = rsu_identity.get(db, rsu_esn)
+        if identity is None:
+            LOG.debug(f"{topic} => RSU [rsu_esn: {rsu_esn}] not found")
+            return None
+
+        # Refresh the online flag and learn whether the RSU was online before,
+        # a missing flag means it may have been marked offline in database.
+        pipe = redis_conn.pipeline(transaction=False)
+        pipe.get(f"RSU_ONLINE_{rsu_esn}")
+        pipe.set(f"RSU_ONLINE_{rsu_esn}", 1, ex=RSU_ONLINE_EXPIRE)
+        was_online, _ = pipe.execute()
+
+        now = time.monotonic()
+        checked = self._checked.get(rsu_esn)
+        if was_online and checked is not None and now - checked < CONF.ingest.heartbeat_cache_ttl:
+            LOG.debug(f"{topic} => RSU [rsu_esn: {rsu_esn}] still online")
+            return None
+
+        rsu = crud.rsu.get(db, id=identity.id)
         if not rsu:
             LOG.info(f"{topic} => RSU [rsu_esn: {rsu_esn}] not found")
             return None
-        crud.rsu.update_online_status(
-            db, db_obj=rsu, obj_in=schemas.RSUUpdateWithStatus(onlineStatus=True)
-        )
-        redis_conn.set(f"RSU_ONLINE_{rsu_esn}", 1, ex=15)
-        LOG.info(f"{topic} => RSU [rsu_esn: {rsu_esn}] onlineStatus updated")
+        if not rsu.online_status:
+            crud.rsu.update_online_status(
+                db, db_obj=rsu, obj_in=schemas.RSUUpdateWithStatus(onlineStatus=True)
+            )
+            LOG.info(f"{topic} => RSU [rsu_esn: {rsu_esn}] onlineStatus updated")
+        self._checked[rsu_esn] = now
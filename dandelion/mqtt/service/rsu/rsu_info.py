@@ -22,23 +22,23 @@ from oslo_log import log
 from sqlalchemy.orm import Session
 
 from dandelion import crud, schemas
-from dandelion.crud import utils as db_util
-from dandelion.db import session
+from dandelion.db import rsu_identity
 from dandelion.mqtt.service import RouterHandler
 
 LOG: LoggerAdapter = log.getLogger(__name__)
 
 
 class RSUInfoRouterHandler(RouterHandler):
-    def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        db: Session = session.DB_SESSION_LOCAL()
-
+    def handler(
+        self, db: Session, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]
+    ) -> None:
         rsu_esn = data.get("rsuEsn")
         if not rsu_esn:
             LOG.warn(f"{topic} => rsu_esn is None")
             return None
 
-        rsu = crud.rsu.get_by_rsu_esn(db, rsu_esn=rsu_esn)
+        identity = rsu_identity.get(db, rsu_esn)
+        rsu = crud.rsu.get(db, id=identity.id) if identity else None
         if not rsu:
             LOG.info(f"{topic} => RSU not found: {rsu_esn}")
             total, _ = crud.rsu_tmp.get_multi_with_total(db, rsu_esn=rsu_esn)
@@ -60,5 +60,4 @@ class RSUInfoRouterHandler(RouterHandler):
                 config=data.get("config"),
             )
             crud.rsu.update_with_version(db, db_obj=rsu, obj_in=rsu_in)
-            db_util.refresh_cloud_rsu(db)
             LOG.info(f"{topic} => RSU [rsu_esn: {rsu_esn}] updated")
@@ -20,6 +20,7 @@ from typing import Any, Dict
 
 import paho.mqtt.client as mqtt
 from oslo_log import log
+from sqlalchemy.orm import Session
 
 from dandelion.api.deps import get_redis_conn
 from dandelion.mqtt.service import RouterHandler
@@ -28,7 +29,9 @@ LOG: LoggerAdapter = log.getLogger(__name__)
 
 
 class RSURunningInfoRouterHandler(RouterHandler):
-    def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
+    def handler(
+        self, db: Session, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]
+    ) -> None:
         LOG.info(f"{topic} => Not implemented yet")
         redis_conn = get_redis_conn()
         rsu_esn = data.get("rsuEsn")
@@ -25,7 +25,6 @@ from oslo_log import log
 from sqlalchemy.orm import Session
 
 from dandelion import crud
-from dandelion.db import session
 from dandelion.mqtt import server as mqtt_server
 from dandelion.mqtt.service import RouterHandler
 from dandelion.mqtt.topic import v2x_rsu
@@ -64,8 +63,9 @@ def spat_publish(spat_in_db):
 
 
 class RSUSpatHandler(RouterHandler):
-    def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        db: Session = session.DB_SESSION_LOCAL()
+    def handler(
+        self, db: Session, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]
+    ) -> None:
         intersections_list: list = data["intersections"]
         for intersections in intersections_list:
             intersection_id = intersections.get("intersectionId")
@@ -18,6 +18,7 @@ V2X_EDGE_RSU_UP = "V2X/EDGE/RSU/UP"
 V2X_EDGE_RSU_ADD_UP = "V2X/EDGE/RSU/ADD/UP"
 V2X_EDGE_RSU_UPDATE_UP = "V2X/EDGE/RSU/UPDATE/UP"
 V2X_EDGE_RSU_DELETE_UP = "V2X/EDGE/RSU/DELETE/UP"
+V2X_EDGE_RSU_DELTA_UP = "V2X/EDGE/RSU/DELTA/UP"
 V2X_EDGE_RSU_LOCATION_UP = "V2X/EDGE/RSU_LOCATION/UP"
 V2X_EDGE_INFO_UP = "V2X/EDGE/INFO/UP"
 V2X_EDGE_HB_UP = "V2X/EDGE/HB/UP"
@@ -30,3 +31,7 @@ def edge_forward(topic, edge_id):
 
 def v2x_edge_key_info_up_ack(key):
     return f"V2X/EDGE/{key}/INFO/UP/ACK"
+
+
+def v2x_edge_rsu_sync_down(edge_id):
+    return f"V2X/EDGE/{edge_id}/RSU/SYNC/DOWN"
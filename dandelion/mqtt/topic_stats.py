@@ -0,0 +1,87 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict
+
+from dandelion import metrics
+
+
+class TopicStats(object):
+    def __init__(self) -> None:
+        self.messages = 0
+        self.decode_failures = 0
+        self.handler_failures = 0
+        self.latency = metrics.Histogram()
+        # Handlers of a topic run on several dispatch workers at once
+        self._lock = threading.Lock()
+
+    def message(self) -> None:
+        with self._lock:
+            self.messages += 1
+
+    def decode_failure(self) -> None:
+        with self._lock:
+            self.decode_failures += 1
+
+    def handler_failure(self) -> None:
+        with self._lock:
+            self.handler_failures += 1
+
+    def stats(self) -> Dict[str, Any]:
+        _, count, sum_ = self.latency.snapshot()
+        with self._lock:
+            return dict(
+                messages=self.messages,
+                decodeFailures=self.decode_failures,
+                handlerFailures=self.handler_failures,
+                handlerSeconds=sum_,
+                avgHandlerSeconds=sum_ / count if count else 0.0,
+            )
+
+
+TOPICS: Dict[str, TopicStats] = {}
+_TOPICS_LOCK = threading.Lock()
+
+
+def topic_route(topic: str) -> str:
+    """
+    The subscribed route of a topic, the RSU ESN level of RSU specific topics,
+    e.g. V2X/RSU/{esn}/MAP/UP, is replaced by the `+` wildcard.
+    """
+    levels = topic.split("/")
+    if len(levels) > 4 and levels[0] == "V2X" and levels[1] == "RSU":
+        levels[2] = "+"
+        return "/".join(levels)
+    return topic
+
+
+def get(topic: str) -> TopicStats:
+    route = topic_route(topic)
+    stats = TOPICS.get(route)
+    if stats is None:
+        with _TOPICS_LOCK:
+            stats = TOPICS.setdefault(route, TopicStats())
+    return stats
+
+
+def get_topics() -> Dict[str, TopicStats]:
+    with _TOPICS_LOCK:
+        return dict(TOPICS)
+
+
+def get_stats() -> Dict[str, Any]:
+    return {route: stats.stats() for route, stats in get_topics().items()}
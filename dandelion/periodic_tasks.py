@@ -16,55 +16,122 @@ from __future__ import annotations
 
 import json
 import os
-import time
 from logging import LoggerAdapter
+from typing import Any, Dict
 
 import redis
+from oslo_config import cfg
 from oslo_log import log
-from sqlalchemy.orm import Session
 
-from dandelion import constants, crud, schemas
-from dandelion.db import redis_pool, session
+from dandelion import conf, constants, crud, scheduler
+from dandelion.db import redis_pool, retention, rsu_running, session
 from dandelion.mqtt import cloud_server as mqtt_cloud_server
 from dandelion.mqtt.topic import v2x_edge
-from dandelion.util import Optional
 
+CONF: cfg = conf.CONF
 LOG: LoggerAdapter = log.getLogger(__name__)
 
 
+RSU_ONLINE_PREFIX = "RSU_ONLINE_"
+
+RSU_OFFLINE_LISTENER: Any = None
+
+
 def update_rsu_online_status() -> None:
     LOG.info("Updating RSU online status...")
-    db: Session = session.DB_SESSION_LOCAL()
     redis_conn: redis.Redis = redis_pool.REDIS_CONN
-
-    _, online_rsus = crud.rsu.get_multi_with_total(db, online_status=True)
-    LOG.debug(f"Found {len(online_rsus)} online RSUs")
-    for rsu in online_rsus:
-        if redis_conn.get(f"RSU_ONLINE_{rsu.rsu_esn}"):
-            continue
-        try:
-            crud.rsu.update_online_status(
-                db, db_obj=rsu, obj_in=schemas.RSUUpdateWithStatus(onlineStatus=False)
+    batch_size: int = CONF.ingest.rsu_offline_batch_size
+
+    with session.session_scope() as db:
+        rsu_esns = crud.rsu.get_esns_by_online_status(db, online_status=True)
+        LOG.debug(f"Found {len(rsu_esns)} online RSUs")
+        offline_count = 0
+        for i in range(0, len(rsu_esns), batch_size):
+            batch = rsu_esns[i : i + batch_size]
+            flags = redis_conn.mget([f"{RSU_ONLINE_PREFIX}{rsu_esn}" for rsu_esn in batch])
+            offline_esns = [rsu_esn for rsu_esn, flag in zip(batch, flags) if flag is None]
+            if not offline_esns:
+                continue
+            scheduler.fence()
+            try:
+                offline_count += crud.rsu.update_online_status_by_esns(
+                    db, rsu_esns=offline_esns, online_status=False
+                )
+            except Exception as ex:
+                db.rollback()
+                LOG.warn(f"Failed to update online status of {len(offline_esns)} RSUs: {ex}")
+        if offline_count:
+            LOG.info(f"Marked {offline_count} RSUs offline")
+
+
+def _on_rsu_online_expired(message: Dict[str, Any]) -> None:
+    key = message["data"]
+    if isinstance(key, bytes):
+        key = key.decode("utf-8")
+    if not key.startswith(RSU_ONLINE_PREFIX):
+        return
+    # A heartbeat may have arrived between the expiry and this notification
+    if redis_pool.REDIS_CONN.exists(key):
+        return
+    rsu_esn = key[len(RSU_ONLINE_PREFIX) :]
+    try:
+        with session.session_scope() as db:
+            crud.rsu.update_online_status_by_esns(db, rsu_esns=[rsu_esn], online_status=False)
+    except Exception as ex:
+        LOG.warn(f"Failed to update RSU [rsu_esn: {rsu_esn}] online status: {ex}")
+
+
+def start_rsu_offline_listener() -> None:
+    """Mark RSUs offline from redis expired key events.
+
+    The periodic sweep stays in place, keyspace notifications are fire and
+    forget and are lost while the listener is disconnected.
+    """
+    global RSU_OFFLINE_LISTENER
+    if not CONF.ingest.rsu_offline_notify or RSU_OFFLINE_LISTENER is not None:
+        return
+    redis_conn: redis.Redis = redis_pool.REDIS_CONN
+    try:
+        events = redis_conn.config_get("notify-keyspace-events").get("notify-keyspace-events", "")
+        if not ("E" in events and ("x" in events or "A" in events)):
+            LOG.warn(
+                "Redis notify-keyspace-events does not contain 'Ex', "
+                "RSU offline notifications will not be received"
             )
-        except Exception as ex:
-            LOG.warn(f"Failed to update RSU [rsu_esn: {rsu.rsu_esn}] online status: {ex}")
+    except redis.RedisError as ex:
+        LOG.warn(f"Failed to read redis notify-keyspace-events: {ex}")
+
+    redis_db = redis_conn.connection_pool.connection_kwargs.get("db", 0)
+    pubsub = redis_conn.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(**{f"__keyevent@{redis_db}__:expired": _on_rsu_online_expired})
+    RSU_OFFLINE_LISTENER = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+    LOG.info(f"Listening for expired RSU online flags on redis db {redis_db}")
+
+
+def stop_rsu_offline_listener() -> None:
+    global RSU_OFFLINE_LISTENER
+    if RSU_OFFLINE_LISTENER is None:
+        return
+    RSU_OFFLINE_LISTENER.stop()
+    RSU_OFFLINE_LISTENER = None
 
 
 def delete_offline_edge() -> None:
     LOG.info("Deleting offline Edge...")
-    db: Session = session.DB_SESSION_LOCAL()
     redis_conn: redis.Redis = redis_pool.REDIS_CONN
 
-    _, edges = crud.edge_node.get_multi_with_total(db)
-    LOG.debug(f"Found {len(edges)} online Edges")
-    for edge in edges:
-        if redis_conn.get(f"EDGE_ONLINE_{edge.id}"):
-            continue
-        try:
-            crud.edge_node_rsu.remove_by_node_id(db, edge_node_id=edge.id)
-            crud.edge_node.remove(db, id=edge.id)
-        except Exception as ex:
-            LOG.warn(f"Failed to delete Edge [id: {edge.id}]: {ex}")
+    with session.session_scope() as db:
+        _, edges = crud.edge_node.get_multi_with_total(db)
+        LOG.debug(f"Found {len(edges)} online Edges")
+        for edge in edges:
+            if redis_conn.get(f"EDGE_ONLINE_{edge.id}"):
+                continue
+            scheduler.fence()
+            try:
+                crud.edge_node_rsu.remove_by_node_id(db, edge_node_id=edge.id)
+                crud.edge_node.remove(db, id=edge.id)
+            except Exception as ex:
+                LOG.warn(f"Failed to delete Edge [id: {edge.id}]: {ex}")
 
 
 def edge_heartbeat() -> None:
@@ -78,8 +145,8 @@ def edge_heartbeat() -> None:
 
 def edge_delete() -> None:
     LOG.info("Edge Delete...")
-    db: Session = session.DB_SESSION_LOCAL()
-    system_config = crud.system_config.get(db, id=1)
+    with session.session_scope() as db:
+        system_config = crud.system_config.get(db, id=1)
     if system_config:
         if system_config.node_id is not None and system_config.node_id > 0:
             mqtt_cloud_server.MQTT_CLIENT.publish(
@@ -91,50 +158,31 @@ def edge_delete() -> None:
 
 def rsu_info():
     LOG.info("RSU Running Info...")
-    db: Session = session.DB_SESSION_LOCAL()
     redis_conn: redis.Redis = redis_pool.REDIS_CONN
-    _, rsus = crud.rsu.get_multi_with_total(db, limit=-1)
-    for rsu in rsus:
-        get_key = f"RSU_RUNNING_INFO_{rsu.rsu_esn}"
-        c_time = int(time.time())
-        cpu_data = json.loads(Optional.none(redis_conn.hget(get_key, "cpu")).orElse("{}"))
-        cpu = dict(
-            time=c_time,
-            uti=Optional.none(cpu_data.get("uti")).map(lambda s: len(s.split(","))).orElse(0),
-            load=cpu_data.get("load", 0),
-        )
-        mem_data = json.loads(Optional.none(redis_conn.hget(get_key, "mem")).orElse("{}"))
-        mem = dict(time=c_time, total=mem_data.get("total", 0), used=mem_data.get("used", 0))
-        net_data = json.loads(Optional.none(redis_conn.hget(get_key, "net")).orElse("{}"))
-        net = dict(time=c_time, rxByte=net_data.get("rxByte", 0), wxByte=net_data.get("wxByte", 0))
-        disk_data = json.loads(Optional.none(redis_conn.hget(get_key, "disk")).orElse("{}"))
-        disk = dict(time=c_time, read=disk_data.get("read", 0), write=disk_data.get("write", 0))
-
-        cpu_key = f"RSU_RUNNING_CPU_{rsu.rsu_esn}"
-        redis_conn.zadd(cpu_key, {json.dumps(cpu): c_time})
-        mem_key = f"RSU_RUNNING_MEM_{rsu.rsu_esn}"
-        redis_conn.zadd(mem_key, {json.dumps(mem): c_time})
-        disk_key = f"RSU_RUNNING_DISK_{rsu.rsu_esn}"
-        redis_conn.zadd(disk_key, {json.dumps(disk): c_time})
-        net_key = f"RSU_RUNNING_NET_{rsu.rsu_esn}"
-        redis_conn.zadd(net_key, {json.dumps(net): c_time})
-
-        if redis_conn.zcard(cpu_key) > 1000:
-            redis_conn.zremrangebyrank(cpu_key, min=1, max=1)
-        if redis_conn.zcard(mem_key) > 1000:
-            redis_conn.zremrangebyrank(mem_key, min=1, max=1)
-        if redis_conn.zcard(disk_key) > 1000:
-            redis_conn.zremrangebyrank(disk_key, min=1, max=1)
-        if redis_conn.zcard(net_key) > 1000:
-            redis_conn.zremrangebyrank(net_key, min=1, max=1)
+    with session.session_scope() as db:
+        _, rsus = crud.rsu.get_multi_with_total(db, limit=-1)
+        rsu_esns = [rsu.rsu_esn for rsu in rsus]
+    scheduler.fence()
+    rsu_running.rollup(redis_conn, rsu_esns)
+
+
+def log_db_pool_status() -> None:
+    LOG.info(f"DB pool status: {session.get_pool_status()}")
 
 
 def delete_unused_bitmap() -> None:
     LOG.info("Bitmap delete...")
-    db: Session = session.DB_SESSION_LOCAL()
-    bitmaps = crud.intersection.get_list_bitmap(db)
+    with session.session_scope() as db:
+        bitmaps = crud.intersection.get_list_bitmap(db)
     bitmaps_set = {bitmap.bitmap_filename for bitmap in bitmaps}
+    scheduler.fence()
     for filename in os.listdir(constants.BITMAP_FILE_PATH):
         if filename != "map_bg.jpg" and filename not in bitmaps_set:
             os.remove(f"{constants.BITMAP_FILE_PATH}/{filename}")
             LOG.info(f"removed bitmap file {filename}")
+
+
+def purge_expired_rows() -> None:
+    LOG.info("Retention purge...")
+    scheduler.fence()
+    retention.purge_all()
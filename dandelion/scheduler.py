@@ -0,0 +1,296 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import os
+import socket
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from logging import LoggerAdapter
+from typing import Any, Callable, Dict, Optional
+
+import redis
+from oslo_config import cfg
+from oslo_log import log
+
+from dandelion.db import redis_pool
+
+CONF: cfg = cfg.CONF
+LOG: LoggerAdapter = log.getLogger(__name__)
+
+LEADER_KEY = "DANDELION_SCHEDULER_LEADER"
+FENCING_KEY = "DANDELION_SCHEDULER_FENCING"
+LAST_RUN_KEY_PREFIX = "DANDELION_JOB_LAST_RUN_"
+
+LEADER: Optional[LeaderElection] = None
+JOBS: Dict[str, JobStats] = {}
+_JOBS_LOCK = threading.Lock()
+# Fencing token of the lease the running job was started under
+_FENCING_TOKEN: ContextVar[Optional[int]] = ContextVar("fencing_token", default=None)
+
+
+class StaleLeaderError(Exception):
+    """Another leader was elected since the job was started."""
+
+
+class LeaderElection(object):
+    def __init__(self, *, lease_ttl: int, renew_interval: int):
+        """
+        Redis lease based leader election.
+
+        Every process tries to SET the leader key NX with a lease. The winner
+        renews the lease while the key still holds its value, and considers
+        itself leader only until its local lease deadline, which expires
+        before the key does, so two processes never lead at the same time.
+        Each lease carries a fencing token that increases with every election,
+        jobs check it with fence() before they write.
+        """
+        if renew_interval >= lease_ttl:
+            raise ValueError(
+                f"Scheduler renew_interval ({renew_interval}) must be less than "
+                f"lease_ttl ({lease_ttl})"
+            )
+        self.node_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.lease_ttl = lease_ttl
+        self.renew_interval = renew_interval
+        self.fencing_token: Optional[int] = None
+        self.elections = 0
+        self._value: Optional[bytes] = None
+        self._deadline = 0.0
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        # Settle the first election now, so the tasks scheduled at startup
+        # already run on the leader.
+        try:
+            self._tick()
+        except redis.RedisError as ex:
+            LOG.warn(f"Scheduler leader election failed: {ex}")
+        self._thread = threading.Thread(
+            target=self._run, name="scheduler-leader-election", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._value is not None:
+            try:
+                self._if_leader(lambda pipe: pipe.delete(LEADER_KEY))
+            except redis.RedisError as ex:
+                LOG.warn(f"Failed to release scheduler leader lease: {ex}")
+            self._lose("stopped")
+
+    def is_leader(self) -> bool:
+        return self._value is not None and time.monotonic() < self._deadline
+
+    def check_leader(self) -> bool:
+        """Check with redis that the lease is still ours, before a job runs."""
+        return self.is_leader() and redis_pool.REDIS_CONN.get(LEADER_KEY) == self._value
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(
+            nodeId=self.node_id,
+            leader=self.is_leader(),
+            fencingToken=self.fencing_token,
+            elections=self.elections,
+        )
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.renew_interval):
+            try:
+                self._tick()
+            except redis.RedisError as ex:
+                LOG.warn(f"Scheduler leader election failed: {ex}")
+                if self._value is not None and time.monotonic() >= self._deadline:
+                    self._lose("lease expired")
+
+    def _tick(self) -> None:
+        # Leave a renew interval of margin so the local deadline always
+        # passes before the key expires in redis.
+        deadline = time.monotonic() + self.lease_ttl - self.renew_interval
+        if self._value is not None:
+            if self._if_leader(lambda pipe: pipe.pexpire(LEADER_KEY, self.lease_ttl * 1000)):
+                self._deadline = deadline
+            else:
+                self._lose("lease lost")
+            return
+
+        redis_conn: redis.Redis = redis_pool.REDIS_CONN
+        value = self.node_id.encode("utf-8")
+        if not redis_conn.set(LEADER_KEY, value, nx=True, px=self.lease_ttl * 1000):
+            return
+        # Only the winner takes a token, so it increases once per election
+        token = redis_conn.incr(FENCING_KEY)
+        self._value = value
+        self._deadline = deadline
+        self.fencing_token = token
+        self.elections += 1
+        LOG.info(f"Scheduler leader elected: {self.node_id}, fencing token: {token}")
+
+    def _if_leader(self, action: Callable[[Any], Any]) -> bool:
+        with redis_pool.REDIS_CONN.pipeline() as pipe:
+            try:
+                pipe.watch(LEADER_KEY)
+                if pipe.get(LEADER_KEY) != self._value:
+                    pipe.unwatch()
+                    return False
+                pipe.multi()
+                action(pipe)
+                pipe.execute()
+                return True
+            except redis.WatchError:
+                return False
+
+    def _lose(self, reason: str) -> None:
+        LOG.info(f"Scheduler leader {self.node_id} stepped down: {reason}")
+        self._value = None
+        self.fencing_token = None
+        self._deadline = 0.0
+
+
+class JobStats(object):
+    def __init__(self, name: str):
+        self.name = name
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.fenced = 0
+        self.last_started = 0.0
+        self.last_success = 0.0
+        self.last_seconds = 0.0
+        self.max_seconds = 0.0
+        self.total_seconds = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(
+            runs=self.runs,
+            failures=self.failures,
+            skipped=self.skipped,
+            fenced=self.fenced,
+            lastStarted=self.last_started,
+            lastSuccess=self.last_success,
+            lastSeconds=round(self.last_seconds, 6),
+            maxSeconds=round(self.max_seconds, 6),
+            totalSeconds=round(self.total_seconds, 6),
+        )
+
+
+def _job_stats(name: str) -> JobStats:
+    job = JOBS.get(name)
+    if job is None:
+        with _JOBS_LOCK:
+            job = JOBS.setdefault(name, JobStats(name))
+    return job
+
+
+def _should_run(name: str, interval: Optional[int], fencing_token: Optional[int]) -> bool:
+    if LEADER is None:
+        return True
+    if fencing_token is None or not LEADER.check_leader():
+        return False
+    if interval is None:
+        return True
+    # A new leader may take over in the middle of an interval, skip the run
+    # if the previous leader already ran the job recently.
+    redis_conn: redis.Redis = redis_pool.REDIS_CONN
+    last_run = redis_conn.get(f"{LAST_RUN_KEY_PREFIX}{name}")
+    if last_run is not None and time.time() - float(last_run) < interval / 2:
+        return False
+    redis_conn.set(f"{LAST_RUN_KEY_PREFIX}{name}", time.time(), ex=interval * 2)
+    return True
+
+
+def run_job(name: str, func: Callable[[], Any], *, interval: Optional[int] = None) -> None:
+    """Run a cluster wide periodic task, if this process is the leader."""
+    job = _job_stats(name)
+    fencing_token = None if LEADER is None else LEADER.fencing_token
+    try:
+        should_run = _should_run(name, interval, fencing_token)
+    except redis.RedisError as ex:
+        LOG.warn(f"Failed to check scheduler leader for job {name}: {ex}")
+        should_run = False
+    if not should_run:
+        job.skipped += 1
+        return
+
+    job.last_started = time.time()
+    start = time.monotonic()
+    context_token = _FENCING_TOKEN.set(fencing_token)
+    try:
+        func()
+        job.last_success = time.time()
+    except StaleLeaderError as ex:
+        job.fenced += 1
+        LOG.warn(f"Periodic task {name} stopped: {ex}")
+    except Exception as ex:
+        job.failures += 1
+        LOG.error(f"Periodic task {name} failed: {ex}")
+    finally:
+        _FENCING_TOKEN.reset(context_token)
+        elapsed = time.monotonic() - start
+        job.runs += 1
+        job.last_seconds = elapsed
+        job.max_seconds = max(job.max_seconds, elapsed)
+        job.total_seconds += elapsed
+    LOG.debug(f"Periodic task {name} finished in {elapsed:.3f}s")
+
+
+def fence() -> None:
+    """
+    Raise StaleLeaderError if another leader was elected since the running job
+    was started. Jobs call it before they write, so a leader that was paused
+    past its lease does not write over the new leader.
+    """
+    token = _FENCING_TOKEN.get()
+    if token is None:
+        return
+    current = redis_pool.REDIS_CONN.get(FENCING_KEY)
+    current_token = None if current is None else int(current)
+    if current_token != token:
+        raise StaleLeaderError(f"fencing token {token} is stale, current: {current_token}")
+
+
+def setup() -> None:
+    global LEADER
+    if not CONF.scheduler.leader_election or LEADER is not None:
+        return
+    LEADER = LeaderElection(
+        lease_ttl=CONF.scheduler.lease_ttl, renew_interval=CONF.scheduler.renew_interval
+    )
+    LEADER.start()
+
+
+def stop(timeout: Optional[float] = None) -> None:
+    global LEADER
+    if LEADER is None:
+        return
+    LEADER.stop(timeout)
+    LEADER = None
+
+
+def get_stats() -> Dict[str, Any]:
+    return dict(
+        leader=None if LEADER is None else LEADER.stats(),
+        jobs={name: job.stats() for name, job in JOBS.items()},
+    )
@@ -36,7 +36,13 @@ from .area import Area, AreaCreate, AreaUpdate
 from .camera import Camera, CameraCreate, Cameras, CameraUpdate
 from .cgw import CGW, CGWCreate, CGWs, CGWUpdate
 from .city import City, CityCreate, CityUpdate
-from .cloud_home import OnlineRate, RouteInfo, RouteInfoCreate
+from .cloud_home import (
+    OnlineRate,
+    RouteInfo,
+    RouteInfoBatch,
+    RouteInfoBatchCreate,
+    RouteInfoCreate,
+)
 from .country import Country, CountryCreate, CountryUpdate
 from .edge_node import EdgeNode, EdgeNodeCreate, EdgeNodes, EdgeNodeUpdate
 from .edge_node_rsu import (
@@ -81,6 +87,7 @@ from .rsu import (
     RunningDisk,
     RunningMEM,
     RunningNet,
+    RunningTier,
 )
 from .rsu_config import RSUConfig, RSUConfigCreate, RSUConfigs, RSUConfigUpdate, RSUConfigWithRSUs
 from .rsu_config_rsu import RSUConfigRSU, RSUConfigRSUCreate, RSUConfigRSUs, RSUConfigRSUUpdate
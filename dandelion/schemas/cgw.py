@@ -57,5 +57,10 @@ class CGW(CGWInDBBase):
 
 
 class CGWs(BaseModel):
-    total: int = Field(..., alias="total", description="Total")
+    total: Optional[int] = Field(
+        None, alias="total", description="Total, not counted when paging by cursor"
+    )
     data: List[CGW] = Field(..., alias="data", description="Data")
+    next_cursor: Optional[int] = Field(
+        None, alias="nextCursor", description="Cursor of the next page, if there may be one"
+    )
@@ -14,7 +14,7 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -68,3 +68,11 @@ class RouteInfoCreate(BaseModel):
         0, alias="pedestrianTotal", description="Pedestrian Total"
     )
     congestion: Optional[str] = Field("free flow", alias="congestion", description="Congestion")
+
+
+class RouteInfoBatchCreate(BaseModel):
+    data: List[RouteInfoCreate] = Field(..., alias="data", description="Route Info of RSUs")
+
+
+class RouteInfoBatch(BaseModel):
+    total: int = Field(..., alias="total", description="Number of RSUs pushed")
@@ -56,5 +56,10 @@ class OSW(OSWInDBBase):
 
 
 class OSWs(BaseModel):
-    total: int = Field(..., alias="total", description="Total")
+    total: Optional[int] = Field(
+        None, alias="total", description="Total, not counted when paging by cursor"
+    )
     data: List[OSW] = Field(..., alias="data", description="Data")
+    next_cursor: Optional[int] = Field(
+        None, alias="nextCursor", description="Cursor of the next page, if there may be one"
+    )
@@ -56,5 +56,10 @@ class RDW(RDWInDBBase):
 
 
 class RDWs(BaseModel):
-    total: int = Field(..., alias="total", description="Total")
+    total: Optional[int] = Field(
+        None, alias="total", description="Total, not counted when paging by cursor"
+    )
     data: List[RDW] = Field(..., alias="data", description="Data")
+    next_cursor: Optional[int] = Field(
+        None, alias="nextCursor", description="Cursor of the next page, if there may be one"
+    )
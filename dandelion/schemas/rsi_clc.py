@@ -60,5 +60,10 @@ class RSICLC(RSICLCInDBBase):
 
 
 class RSICLCs(BaseModel):
-    total: int = Field(..., alias="total", description="Total")
+    total: Optional[int] = Field(
+        None, alias="total", description="Total, not counted when paging by cursor"
+    )
     data: List[RSICLC] = Field(..., alias="data", description="Data")
+    next_cursor: Optional[int] = Field(
+        None, alias="nextCursor", description="Cursor of the next page, if there may be one"
+    )
@@ -15,6 +15,7 @@
 from __future__ import annotations
 
 from datetime import datetime
+from enum import Enum
 from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
@@ -172,6 +173,12 @@ class RSUDetail(RSUInDBBase):
     )
 
 
+class RunningTier(str, Enum):
+    raw = "raw"
+    hourly = "hourly"
+    daily = "daily"
+
+
 class RunningCPU(BaseModel):
     time: Optional[str] = Field(None, alias="time", description="time")
     uti: Optional[int] = Field(None, alias="uti", description="CPU UTI")
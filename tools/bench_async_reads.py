@@ -0,0 +1,183 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, List
+
+import click
+from oslo_config import cfg
+from starlette.concurrency import run_in_threadpool
+
+from dandelion import conf, crud, models, schemas  # noqa: F401
+from dandelion.api.api_v1.endpoints import rsus
+from dandelion.db import session
+from dandelion.db.base import Base
+
+CONF: cfg = cfg.CONF
+
+
+def _seed(rows: int) -> bool:
+    """Add `rows` bench RSUs unless there are enough RSUs already, returns if it did."""
+    with session.session_scope() as db:
+        if db.query(models.RSU).count() >= rows:
+            return False
+        db.add(models.Country(code="bench", name="bench"))
+        db.add(models.Province(code="bench", name="bench", country_code="bench"))
+        db.add(models.City(code="bench", name="bench", province_code="bench"))
+        db.add(models.Area(code="bench", name="bench", city_code="bench"))
+        db.add(
+            models.Intersection(
+                code="bench",
+                name="bench",
+                lng="0",
+                lat="0",
+                area_code="bench",
+                map_data={},
+                bitmap_filename="",
+            )
+        )
+        for i in range(rows):
+            db.add(
+                models.RSU(
+                    rsu_id=str(i),
+                    rsu_esn=f"bench{i}",
+                    rsu_ip="127.0.0.1",
+                    rsu_name=f"bench{i}",
+                    version="v1",
+                    rsu_status="Normal",
+                    location={"lat": 0, "lon": 0},
+                    config={},
+                    intersection_code="bench",
+                )
+            )
+        db.commit()
+    return True
+
+
+def _unseed() -> None:
+    with session.session_scope() as db:
+        db.query(models.RSU).filter(models.RSU.intersection_code == "bench").delete()
+        for model in [
+            models.Intersection,
+            models.Area,
+            models.City,
+            models.Province,
+            models.Country,
+        ]:
+            db.query(model).filter(model.code == "bench").delete()
+        db.commit()
+
+
+def _list_rsus_sync(page_size: int) -> schemas.RSUs:
+    # The handler as it was before, a sync def served from the threadpool
+    db = session.DB_SESSION_LOCAL()
+    try:
+        total, data = crud.rsu.get_multi_with_total(db, skip=0, limit=page_size, is_default=False)
+        return schemas.RSUs(total=total, data=[rsu.to_all_dict() for rsu in data])
+    finally:
+        db.close()
+
+
+async def _list_rsus(page_size: int) -> schemas.RSUs:
+    db = session.async_session()
+    try:
+        return await rsus.get_all(
+            rsu_name=None,
+            rsu_esn=None,
+            intersection_code=None,
+            online_status=None,
+            enabled=None,
+            rsu_status=None,
+            is_default=False,
+            page_num=1,
+            page_size=page_size,
+            db=db,
+            current_user=None,
+        )
+    finally:
+        await db.close()
+
+
+async def _run(call: Callable[[], Awaitable[Any]], requests: int, concurrency: int) -> List[float]:
+    latencies: List[float] = []
+
+    async def worker(count: int) -> None:
+        for _ in range(count):
+            start = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*[worker(requests // concurrency) for _ in range(concurrency)])
+    return sorted(latencies)
+
+
+def _percentile(latencies: List[float], percent: float) -> float:
+    return latencies[min(len(latencies) - 1, int(len(latencies) * percent / 100))] * 1000
+
+
+@click.command(help="Benchmark the RSU list endpoint on the threadpool against async sessions.")
+@click.option(
+    "-c",
+    "--connection",
+    default="sqlite:////tmp/dandelion_bench.db",
+    help="SQLAlchemy connection string. (Default value: sqlite:////tmp/dandelion_bench.db)",
+)
+@click.option("-r", "--rows", default=200, help="Number of RSUs to seed. (Default value: 200)")
+@click.option("-p", "--page-size", default=10, help="Page size. (Default value: 10)")
+@click.option("-n", "--requests", default=2000, help="Number of requests. (Default value: 2000)")
+@click.option("-C", "--concurrency", default=200, help="Concurrent requests. (Default value: 200)")
+def main(connection: str, rows: int, page_size: int, requests: int, concurrency: int) -> None:
+    CONF([], project="dandelion")
+    CONF.set_override("connection", connection, group="database")
+    session.setup_db()
+    Base.metadata.create_all(session.ENGINE)
+    seeded = _seed(rows)
+
+    async def bench() -> None:
+        click.echo(
+            f"{session.ENGINE.dialect.name}: {requests} requests x {concurrency} concurrent"
+        )
+        await _report("sync", lambda: run_in_threadpool(_list_rsus_sync, page_size))
+        # Without the async engine the async endpoint falls back to the threadpool
+        await _report("threaded", lambda: _list_rsus(page_size))
+        session.setup_async_db()
+        if session.ASYNC_ENGINE is None:
+            return
+        await _report("async", lambda: _list_rsus(page_size))
+        await session.ASYNC_ENGINE.dispose()
+
+    async def _report(name: str, call: Callable[[], Awaitable[Any]]) -> None:
+        await call()
+        start = time.perf_counter()
+        latencies = await _run(call, requests, concurrency)
+        seconds = time.perf_counter() - start
+        click.echo(
+            f"{name + ':':10} {len(latencies) / seconds:8.0f} req/s"
+            f"  p50 {_percentile(latencies, 50):8.1f} ms"
+            f"  p99 {_percentile(latencies, 99):8.1f} ms"
+        )
+
+    try:
+        asyncio.run(bench())
+    finally:
+        if seeded:
+            _unseed()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import time
+from typing import List
+
+import click
+from sqlalchemy import MetaData, create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from dandelion import schemas
+from dandelion.crud.crud_cgw import CRUDCGW
+from dandelion.models import CGW
+
+
+class BenchCGW(declarative_base()):  # type: ignore
+    # A scratch copy of the cgw table, the benchmark never touches real rows
+    __table__ = CGW.__table__.to_metadata(MetaData(), name="bench_cgw")
+
+
+bench_cgw = CRUDCGW(BenchCGW)
+
+
+def _cgws(count: int) -> List[schemas.CGWCreate]:
+    cgws = []
+    for i in range(count):
+        cgw = schemas.CGWCreate()
+        cgw.cgw_level = i % 4
+        cgw.lane_id = i
+        cgw.average_speed = 30
+        cgw.sensor_pos = {"lat": 319348466, "lon": 1188213963}
+        cgw.start_point = {"lat": 319348466, "lon": 1188213963}
+        cgw.end_point = {"lat": 319349466, "lon": 1188214963}
+        cgw.sec_mark = i
+        cgws.append(cgw)
+    return cgws
+
+
+@click.command(help="Benchmark per row create against create_many on a scratch bench_cgw table.")
+@click.option(
+    "-c",
+    "--connection",
+    default="sqlite:////tmp/dandelion_bench.db",
+    help="SQLAlchemy connection string. (Default value: sqlite:////tmp/dandelion_bench.db)",
+)
+@click.option("-f", "--frames", default=200, help="Number of frames. (Default value: 200)")
+@click.option("-r", "--rows", default=30, help="Number of rows in each frame. (Default value: 30)")
+def main(connection: str, frames: int, rows: int) -> None:
+    engine = create_engine(connection)
+    BenchCGW.__table__.drop(engine, checkfirst=True)
+    BenchCGW.__table__.create(engine)
+    session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    frame = _cgws(rows)
+
+    try:
+        with session_local() as db:
+            start = time.perf_counter()
+            for _ in range(frames):
+                for cgw in frame:
+                    bench_cgw.create(db, obj_in=cgw)
+            create_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(frames):
+                bench_cgw.create_many(db, objs_in=frame)
+            create_many_seconds = time.perf_counter() - start
+    finally:
+        BenchCGW.__table__.drop(engine, checkfirst=True)
+
+    total = frames * rows
+    click.echo(f"{engine.dialect.name}: {frames} frames x {rows} rows")
+    click.echo(f"create:      {total / create_seconds:10.0f} rows/s")
+    click.echo(f"create_many: {total / create_many_seconds:10.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
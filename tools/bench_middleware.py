@@ -0,0 +1,161 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import click
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from oslo_config import cfg
+
+from dandelion import conf  # noqa: F401
+from dandelion.api import middleware, route_stats
+from dandelion.db import session as db_session
+
+CONF: cfg = cfg.CONF
+
+STREAM_CHUNKS = 5
+STREAM_INTERVAL = 0.05
+
+
+def _app(stack: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping() -> Dict[str, Any]:
+        return {"ping": "pong"}
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def chunks() -> AsyncIterator[bytes]:
+            for _ in range(STREAM_CHUNKS):
+                yield b"chunk\n"
+                await asyncio.sleep(STREAM_INTERVAL)
+
+        return StreamingResponse(chunks())
+
+    if stack == "base_http":
+        # The two middlewares main.py had before the RequestMiddleware
+        @app.middleware("http")
+        async def add_process_time_header(request: Request, call_next: Any) -> Any:
+            start_time = time.time()
+            with db_session.track_queries() as query_stats:
+                response = await call_next(request)
+            process_time = time.time() - start_time
+            response.headers["X-Process-Time"] = str(process_time)
+            response.headers["Server-Timing"] = route_stats.server_timing(
+                process_time, query_stats
+            )
+            route_stats.record(request.scope, process_time, query_stats)
+            return response
+
+        @app.middleware("http")
+        async def add_request_id_header(request: Request, call_next: Any) -> Any:
+            request_id = uuid.uuid4().hex
+            response = await call_next(request)
+            response.headers["OpenV2X-Request-ID"] = request_id
+            return response
+
+    elif stack == "asgi":
+        app.add_middleware(middleware.RequestMiddleware)
+    return app
+
+
+async def _request(app: FastAPI, path: str) -> Optional[float]:
+    """Send a GET request to the app, returns the seconds until the first body chunk."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 0),
+        "server": ("bench", 80),
+    }
+    start = time.perf_counter()
+    first_chunk: Optional[float] = None
+    request_sent = False
+    response_complete = asyncio.Event()
+
+    async def receive() -> Dict[str, Any]:
+        # Like a server, the body is received once, then only the disconnect
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await response_complete.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal first_chunk
+        if message["type"] != "http.response.body":
+            return
+        if first_chunk is None:
+            first_chunk = time.perf_counter() - start
+        if not message.get("more_body", False):
+            response_complete.set()
+
+    await app(scope, receive, send)
+    return first_chunk
+
+
+@click.command(help="Benchmark the RequestMiddleware against the former BaseHTTPMiddleware stack.")
+@click.option(
+    "-n", "--requests", default=5000, help="Number of requests per stack. (Default value: 5000)"
+)
+@click.option(
+    "-s",
+    "--sample-rate",
+    default=0.01,
+    help="Access log sample rate of the RequestMiddleware. (Default value: 0.01)",
+)
+def main(requests: int, sample_rate: float) -> None:
+    CONF([], project="dandelion")
+    CONF.set_override("sample_rate", sample_rate, group="access_log")
+
+    async def bench() -> None:
+        click.echo(f"{requests} requests per stack")
+        for stack in ["none", "base_http", "asgi"]:
+            app = _app(stack)
+            await _request(app, "/ping")
+            await _request(app, "/stream")
+            latencies: List[float] = []
+            for _ in range(requests):
+                start = time.perf_counter()
+                await _request(app, "/ping")
+                latencies.append(time.perf_counter() - start)
+            latencies.sort()
+            first_chunk = await _request(app, "/stream") or 0.0
+            click.echo(
+                f"{stack + ':':11} mean {sum(latencies) / len(latencies) * 1e6:7.1f} us"
+                f"  p99 {latencies[int(len(latencies) * 0.99)] * 1e6:7.1f} us"
+                f"  stream first chunk {first_chunk * 1000:6.1f} ms"
+            )
+
+    asyncio.run(bench())
+
+
+if __name__ == "__main__":
+    main()